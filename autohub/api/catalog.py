@@ -1,28 +1,101 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy.exc import IntegrityError
 
+from autohub.api.http_cache import CacheValidators, cache_validated
+from autohub.api.serialization import FastJSONResponse, schema_columns
+from autohub.automation.db_writer.bulk_writer import write_bulk_catalog
+from autohub.automation.export import stream_catalog_ndjson
+from autohub.automation.normalizer.common import spec_numeric_fields, variant_numeric_fields
+from autohub.core import config
+from autohub.core.cache import catalog_snapshot
 from autohub.database import model
-from autohub.database.connection import get_db
+from autohub.database.routing import get_async_read_db, get_read_db, get_write_db, read_session
+from autohub.database.search_index import index_entities
+from autohub.database.versioning import (BRANDS, MODELS, VARIANTS, SPECS, IMAGES,
+                                         CATALOG_ENTITIES, bump_versions)
 from autohub.model.schemas import (BrandCreate, BrandRead, BrandNested,
                                       ModelCreate, ModelRead,
                                       VariantCreate, VariantRead,
                                       SpecCreate, SpecRead,
-                                      ImageCreate, ImageRead)
+                                      ImageCreate, ImageRead, Page,
+                                      BulkCatalog, BulkResult,
+                                      CompareResponse)
 
 router = APIRouter(
     prefix="/catalog",
     tags=["catalog"]
 )
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+catalog_adapter = TypeAdapter(list[BrandNested])
+
+
+async def paginate(
+    db: AsyncSession,
+    stmt: Select,
+    id_column,
+    cursor: int | None,
+    limit: int,
+    mappings: bool = False,
+) -> dict:
+    """
+    Keyset pagination on the primary key.
+    `cursor` is the last id of the previous page; fetches one extra row
+    to know whether another page exists.
+    """
+    if cursor is not None:
+        stmt = stmt.where(id_column > cursor)
+
+    result = await db.execute(stmt.order_by(id_column).limit(limit + 1))
+    rows = [dict(row) for row in result.mappings()] if mappings else list(result.scalars())
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = rows[-1]["id"] if mappings else rows[-1].id
+
+    return {"items": rows, "next_cursor": next_cursor}
+
+
+async def list_page(
+    db: AsyncSession,
+    entity,
+    schema,
+    stmt: Select,
+    cursor: int | None,
+    limit: int,
+    validators: CacheValidators,
+):
+    """
+    One page of `entity` rows. With FAST_JSON_RESPONSES the page is read
+    as plain column mappings and encoded directly, bypassing ORM
+    hydration and response_model validation.
+    """
+    if not config.FAST_JSON_RESPONSES:
+        return await paginate(db, stmt, entity.id, cursor, limit)
+
+    stmt = stmt.with_only_columns(*schema_columns(entity, schema))
+    page = await paginate(db, stmt, entity.id, cursor, limit, mappings=True)
+    return FastJSONResponse(page, headers=validators.headers)
+
 # Brands
 
 @router.post("/brands",  response_model=BrandRead, status_code=status.HTTP_201_CREATED)
-def create_brand(request: BrandCreate, db: Session = Depends(get_db)):
+def create_brand(request: BrandCreate, db: Session = Depends(get_write_db)):
     brand = model.CarBrand(name=request.name)
 
     try:
         db.add(brand)
+        db.flush()
+        index_entities(db, brand)
+        bump_versions(db, BRANDS)
         db.commit()
         db.refresh(brand)
         return brand
@@ -31,14 +104,14 @@ def create_brand(request: BrandCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail="Brand already exists")
     
 
-@router.get("/brands", response_model=list[BrandRead])
-def get_brands(db: Session = Depends(get_db)):
-    return db.query(model.CarBrand).all()
+@router.get("/brands", response_model=list[BrandRead], dependencies=[Depends(cache_validated(BRANDS))])
+async def get_brands(db: AsyncSession = Depends(get_async_read_db)):
+    return (await db.scalars(select(model.CarBrand))).all()
 
 # Models
 
 @router.post("/models", response_model=ModelRead, status_code=status.HTTP_201_CREATED)
-def create_model(request: ModelCreate, db: Session = Depends(get_db)):
+def create_model(request: ModelCreate, db: Session = Depends(get_write_db)):
     
     brand = db.query(model.CarBrand).filter_by(id=request.brand_id).first()
     if not brand:
@@ -48,6 +121,9 @@ def create_model(request: ModelCreate, db: Session = Depends(get_db)):
 
     try:
         db.add(car_model)
+        db.flush()
+        index_entities(db, car_model)
+        bump_versions(db, MODELS)
         db.commit()
         db.refresh(car_model)
         return car_model
@@ -55,23 +131,40 @@ def create_model(request: ModelCreate, db: Session = Depends(get_db)):
         db.rollback()
         raise HTTPException(status_code=400, detail="Model already exists for this brand")
     
-@router.get("/models", response_model=list[ModelRead])
-def get_models(db: Session = Depends(get_db)):
-    return db.query(model.CarModel).all()
+@router.get("/models", response_model=Page[ModelRead])
+async def get_models(
+    brand_id: int | None = None,
+    cursor: int | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    validators: CacheValidators = Depends(cache_validated(MODELS)),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    stmt = select(model.CarModel)
+
+    if brand_id is not None:
+        stmt = stmt.where(model.CarModel.brand_id == brand_id)
+
+    return await list_page(db, model.CarModel, ModelRead, stmt, cursor, limit, validators)
 
 # Variants
 
 @router.post("/variants", response_model=VariantRead, status_code=status.HTTP_201_CREATED)
-def create_variant(request: VariantCreate, db: Session = Depends(get_db)):
+def create_variant(request: VariantCreate, db: Session = Depends(get_write_db)):
     
     model_obj = db.query(model.CarModel).filter_by(id=request.model_id).first()
     if not model_obj:
         raise HTTPException(status_code=404, detail="Model not found")
     
-    variant = model.CarVariant(**request.model_dump())
+    variant = model.CarVariant(
+        **request.model_dump(),
+        **variant_numeric_fields(request.price),
+    )
 
     try:
         db.add(variant)
+        db.flush()
+        index_entities(db, variant)
+        bump_versions(db, VARIANTS)
         db.commit()
         db.refresh(variant)
         return variant
@@ -79,23 +172,44 @@ def create_variant(request: VariantCreate, db: Session = Depends(get_db)):
         db.rollback()
         raise HTTPException(status_code=400, detail="Variant already exists for this model")
     
-@router.get("/variants", response_model=list[VariantRead])
-def get_variants(db: Session = Depends(get_db)):
-    return db.query(model.CarVariant).all()
+@router.get("/variants", response_model=Page[VariantRead])
+async def get_variants(
+    model_id: int | None = None,
+    brand_id: int | None = None,
+    fuel_type: str | None = None,
+    cursor: int | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    validators: CacheValidators = Depends(cache_validated(VARIANTS, MODELS)),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    stmt = select(model.CarVariant)
+
+    if model_id is not None:
+        stmt = stmt.where(model.CarVariant.model_id == model_id)
+    if brand_id is not None:
+        stmt = stmt.join(model.CarModel).where(model.CarModel.brand_id == brand_id)
+    if fuel_type is not None:
+        stmt = stmt.where(model.CarVariant.fuel_type == fuel_type)
+
+    return await list_page(db, model.CarVariant, VariantRead, stmt, cursor, limit, validators)
 
 # Specs
 
 @router.post("/specs", response_model=SpecRead, status_code=status.HTTP_201_CREATED)
-def create_spec(request: SpecCreate, db: Session = Depends(get_db)):
+def create_spec(request: SpecCreate, db: Session = Depends(get_write_db)):
 
     variant = db.query(model.CarVariant).filter_by(id=request.variant_id).first()
     if not variant:
         raise HTTPException(status_code=404, detail="Variant not found")
 
-    spec = model.CarSpec(**request.model_dump())
+    spec = model.CarSpec(
+        **request.model_dump(),
+        **spec_numeric_fields(request.power, request.torque),
+    )
 
     try:
         db.add(spec)
+        bump_versions(db, SPECS)
         db.commit()
         db.refresh(spec)
         return spec
@@ -103,14 +217,28 @@ def create_spec(request: SpecCreate, db: Session = Depends(get_db)):
         db.rollback()
         raise HTTPException(status_code=400, detail="Spec already exists for this variant")
 
-@router.get("/specs", response_model=list[SpecRead])
-def get_specs(db: Session = Depends(get_db)):
-    return db.query(model.CarSpec).all()
+@router.get("/specs", response_model=Page[SpecRead])
+async def get_specs(
+    variant_id: int | None = None,
+    model_id: int | None = None,
+    cursor: int | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    validators: CacheValidators = Depends(cache_validated(SPECS, VARIANTS)),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    stmt = select(model.CarSpec)
+
+    if variant_id is not None:
+        stmt = stmt.where(model.CarSpec.variant_id == variant_id)
+    if model_id is not None:
+        stmt = stmt.join(model.CarVariant).where(model.CarVariant.model_id == model_id)
+
+    return await list_page(db, model.CarSpec, SpecRead, stmt, cursor, limit, validators)
 
 # Image
 
 @router.post("/images", response_model=ImageRead, status_code=status.HTTP_201_CREATED)
-def add_image(request: ImageCreate, db: Session = Depends(get_db)):
+def add_image(request: ImageCreate, db: Session = Depends(get_write_db)):
 
     model_obj = db.query(model.CarModel).filter_by(id=request.model_id).first()
     if not model_obj:
@@ -118,32 +246,170 @@ def add_image(request: ImageCreate, db: Session = Depends(get_db)):
 
     image = model.CarImage(**request.model_dump())
 
-    db.add(image)
-    db.commit()
-    db.refresh(image)
+    try:
+        db.add(image)
+        bump_versions(db, IMAGES)
+        db.commit()
+        db.refresh(image)
+        return image
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Image already exists for this model")
+
+
+@router.get("/images", response_model=Page[ImageRead])
+async def get_images(
+    model_id: int | None = None,
+    image_type: str | None = None,
+    cursor: int | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    validators: CacheValidators = Depends(cache_validated(IMAGES)),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    stmt = select(model.CarImage)
+
+    if model_id is not None:
+        stmt = stmt.where(model.CarImage.model_id == model_id)
+    if image_type is not None:
+        stmt = stmt.where(model.CarImage.image_type == image_type)
+
+    return await list_page(db, model.CarImage, ImageRead, stmt, cursor, limit, validators)
+
+# Comparison
+
+MAX_COMPARE = 4
 
-    return image
+# (field, unit, column); numeric fields get deltas
+COMPARE_FIELDS = [
+    ("price", "INR", model.CarVariant.price_inr),
+    ("engine_capacity", None, model.CarSpec.engine_capacity),
+    ("power_kw", "kW", model.CarSpec.power_kw),
+    ("power_rpm", "rpm", model.CarSpec.power_rpm),
+    ("torque_nm", "Nm", model.CarSpec.torque_nm),
+    ("torque_rpm_min", "rpm", model.CarSpec.torque_rpm_min),
+    ("torque_rpm_max", "rpm", model.CarSpec.torque_rpm_max),
+    ("mileage", "kmpl", model.CarSpec.mileage),
+    ("engine", None, model.CarSpec.engine),
+    ("power", None, model.CarSpec.power),
+    ("torque", None, model.CarSpec.torque),
+]
+NUMERIC_COMPARE_FIELDS = {"price", "engine_capacity", "power_kw", "torque_nm", "mileage"}
 
 
-@router.get("/images", response_model=list[ImageRead])
-def get_images(db: Session = Depends(get_db)):
-    return db.query(model.CarImage).all()
+@router.get("/compare", response_model=CompareResponse)
+async def compare_variants(
+    variant_ids: list[int] = Query(..., min_length=2, max_length=MAX_COMPARE),
+    db: AsyncSession = Depends(get_async_read_db),
+    _: CacheValidators = Depends(cache_validated(BRANDS, MODELS, VARIANTS, SPECS)),
+):
+    variant_ids = list(dict.fromkeys(variant_ids))
+
+    stmt = (
+        select(
+            model.CarVariant.id,
+            model.CarVariant.variant_name,
+            model.CarVariant.fuel_type,
+            model.CarVariant.transmission,
+            model.CarModel.name.label("model_name"),
+            model.CarBrand.name.label("brand_name"),
+            *[column.label(field) for field, _, column in COMPARE_FIELDS],
+        )
+        .join(model.CarModel, model.CarVariant.model_id == model.CarModel.id)
+        .join(model.CarBrand, model.CarModel.brand_id == model.CarBrand.id)
+        .outerjoin(model.CarSpec, model.CarSpec.variant_id == model.CarVariant.id)
+        .where(model.CarVariant.id.in_(variant_ids))
+    )
+    found = {row["id"]: row for row in (await db.execute(stmt)).mappings()}
+
+    missing = [variant_id for variant_id in variant_ids if variant_id not in found]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Variants not found: {missing}")
+
+    ordered = [found[variant_id] for variant_id in variant_ids]
+
+    rows = []
+    for field, unit, _ in COMPARE_FIELDS:
+        values = [row[field] for row in ordered]
+        deltas = None
+
+        if field in NUMERIC_COMPARE_FIELDS:
+            base = values[0]
+            deltas = [
+                round(value - base, 2) if value is not None and base is not None else None
+                for value in values
+            ]
+
+        rows.append({"field": field, "unit": unit, "values": values, "deltas": deltas})
+
+    return {"variants": ordered, "rows": rows}
+
+# Bulk Ingestion
+
+@router.post("/bulk", response_model=BulkResult)
+def bulk_ingest(request: BulkCatalog, db: Session = Depends(get_write_db)):
+    try:
+        result = write_bulk_catalog(request, db)
+        db.commit()
+        return result
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Bulk payload conflicts with existing data")
 
 # Nested Catalog
 
-@router.get("", response_model=list[BrandNested])
-def get_catalog(db: Session = Depends(get_db)):
-    brands = (
+def load_catalog(db: Session) -> list[model.CarBrand]:
+    """
+    Load the full brand -> model -> variant/spec/image tree.
+    selectinload keeps each level to one query instead of a
+    variants x images cartesian product per model.
+    """
+    return (
         db.query(model.CarBrand)
         .options(
-            joinedload(model.CarBrand.models)
-            .joinedload(model.CarModel.variants)
-            .joinedload(model.CarVariant.specs),
-            joinedload(model.CarBrand.models)
-            .joinedload(model.CarModel.images)
+            selectinload(model.CarBrand.models)
+            .selectinload(model.CarModel.variants)
+            .selectinload(model.CarVariant.specs),
+            selectinload(model.CarBrand.models)
+            .selectinload(model.CarModel.images)
         )
+        .order_by(model.CarBrand.id)
         .all()
     )
 
-    return brands
-    
\ No newline at end of file
+
+def build_catalog_json(db: Session) -> bytes:
+    brands = load_catalog(db)
+    return catalog_adapter.dump_json(catalog_adapter.validate_python(brands))
+
+
+@router.get("", response_model=list[BrandNested])
+def get_catalog(
+    request: Request,
+    db: Session = Depends(get_read_db),
+    validators: CacheValidators = Depends(cache_validated(*CATALOG_ENTITIES, encoded=True)),
+):
+    # Keyed on the data versions, not the ETag: unused query strings must not rebuild the tree
+    snapshot = catalog_snapshot.get(validators.data_key, lambda: build_catalog_json(db))
+
+    # validators.headers carry the ETag of this encoding and Vary: Accept-Encoding
+    headers = dict(validators.headers)
+
+    body, encoding = snapshot.encoded(request.headers.get("accept-encoding", ""))
+    if encoding:
+        headers["Content-Encoding"] = encoding
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# NDJSON Export
+
+@router.get("/export.ndjson")
+def export_catalog(
+    request: Request,
+    validators: CacheValidators = Depends(cache_validated(*CATALOG_ENTITIES)),
+):
+    return StreamingResponse(
+        stream_catalog_ndjson(session_factory=lambda: read_session(request)),
+        media_type="application/x-ndjson",
+        headers={**validators.headers, "Content-Disposition": 'attachment; filename="catalog.ndjson"'},
+    )
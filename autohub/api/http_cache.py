@@ -0,0 +1,116 @@
+"""
+HTTP caching for read endpoints.
+
+Validators come from the per-entity data versions, so checking freshness
+costs one primary-key lookup instead of running the query. A matching
+If-None-Match / If-Modified-Since short-circuits to 304 before the route
+body runs.
+
+Routes serving precompressed bodies (cache_validated(..., encoded=True))
+get an ETag per content coding ("...-gzip", "...-br") and Vary:
+Accept-Encoding on every response, 304s included, so a validator never
+confirms a body in another encoding.
+"""
+
+import hashlib
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from autohub.core import config
+from autohub.core.cache import preferred_encoding
+from autohub.database.routing import get_async_read_db
+from autohub.database.versioning import get_versions_async
+
+
+@dataclass(frozen=True)
+class CacheValidators:
+    etag: str
+    last_modified: datetime | None
+    headers: dict[str, str] = field(default_factory=dict)
+    # Identifies the data versions alone (no route or query), for server-side snapshots
+    data_key: str = ""
+
+    def for_encoding(self, encoding: str | None) -> "CacheValidators":
+        """Validators for the body served in `encoding` (None: identity)."""
+        etag = f'{self.etag[:-1]}-{encoding}"' if encoding else self.etag
+        headers = {**self.headers, "ETag": etag, "Vary": "Accept-Encoding"}
+        return replace(self, etag=etag, headers=headers)
+
+    def not_modified(self, request: Request) -> bool:
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            # If-None-Match takes precedence over If-Modified-Since
+            for tag in if_none_match.split(","):
+                tag = tag.strip()
+                if tag == "*" or tag.removeprefix("W/") == self.etag:
+                    return True
+            return False
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since and self.last_modified is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=timezone.utc)
+            return self.last_modified <= since
+
+        return False
+
+
+def build_validators(request: Request, versions: list[tuple[str, int, datetime]]) -> CacheValidators:
+    """
+    The ETag covers the route, its query string and the versions it reads,
+    so every distinct listing page has its own validator. data_key covers
+    only the versions, so a snapshot is shared by every query string.
+    """
+    version_parts = [f"{entity}:{version}:{updated_at.isoformat()}" for entity, version, updated_at in versions]
+    data_key = hashlib.sha256("|".join(version_parts).encode()).hexdigest()[:32]
+
+    query = "&".join(sorted(f"{key}={value}" for key, value in request.query_params.multi_items()))
+    seed = "|".join([request.url.path, query] + version_parts)
+    etag = f'"{hashlib.sha256(seed.encode()).hexdigest()[:32]}"'
+
+    last_modified = None
+    if versions:
+        last_modified = max(updated_at for _, _, updated_at in versions).replace(tzinfo=timezone.utc)
+
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={config.HTTP_CACHE_MAX_AGE}",
+    }
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+    return CacheValidators(etag=etag, last_modified=last_modified, headers=headers, data_key=data_key)
+
+
+def cache_validated(*entities: str, encoded: bool = False):
+    """
+    Dependency that answers 304 for fresh client copies of data built from
+    `entities`, and otherwise sets the validator headers on the response.
+    Routes returning a Response directly must copy `validators.headers`.
+    With `encoded`, the validators are those of the content coding the
+    request negotiates (see preferred_encoding).
+    """
+    async def dependency(
+        request: Request,
+        response: Response,
+        db: AsyncSession = Depends(get_async_read_db),
+    ) -> CacheValidators:
+        validators = build_validators(request, await get_versions_async(db, entities))
+        if encoded:
+            validators = validators.for_encoding(preferred_encoding(request.headers.get("accept-encoding", "")))
+
+        if validators.not_modified(request):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=validators.headers)
+
+        response.headers.update(validators.headers)
+        return validators
+
+    return dependency
@@ -0,0 +1,76 @@
+"""
+Request instrumentation and the Prometheus scrape endpoint.
+
+MetricsMiddleware times each request, binds a RequestStats for the SQL
+hooks, and records per-route latency, statement counts, SQL time and
+suspected N+1 patterns. Routes are labelled by their path template
+(`/news/{news_id}`), never the raw URL. N+1 reports are WARNING records
+on the `autohub.api.metrics` logger.
+"""
+
+import logging
+import time
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from autohub.core import config, metrics
+from autohub.database.instrumentation import RequestStats, current_stats
+
+router = APIRouter(tags=["metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+logger = logging.getLogger(__name__)
+
+
+@router.get("/metrics", include_in_schema=False)
+def get_metrics():
+    return PlainTextResponse(metrics.registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware, so streaming responses are timed to the last byte."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_stats.set(stats)
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_stats.reset(token)
+            self._record(scope, stats, status_code, time.perf_counter() - start)
+
+    @staticmethod
+    def _record(scope, stats: RequestStats, status_code: int, elapsed: float) -> None:
+        route = scope.get("route")
+        # Unmatched paths share one label to keep cardinality bounded
+        path = getattr(route, "path", None) or "unmatched"
+        method = scope["method"]
+
+        metrics.http_requests.inc(method, path, str(status_code))
+        metrics.http_duration.observe(elapsed, method, path)
+        metrics.db_statements.observe(stats.statements, method, path)
+        metrics.db_duration.observe(stats.seconds, method, path)
+
+        repeated = stats.repeated(config.N_PLUS_ONE_THRESHOLD)
+        if repeated:
+            metrics.db_n_plus_one.inc(method, path)
+            shape, count = repeated[0]
+            logger.warning("Possible N+1 on %s %s: %dx %s", method, path, count, shape[:200])
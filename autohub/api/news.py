@@ -1,9 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy.exc import IntegrityError
 
+from autohub.api.http_cache import CacheValidators, cache_validated
+from autohub.core import config
 from autohub.database import model
-from autohub.database.connection import get_db
+from autohub.database.routing import get_async_read_db, get_write_db
+from autohub.database.versioning import NEWS, bump_versions
 from autohub.model.schemas import NewsCreate, NewsRead, NewsUpdate
 
 router = APIRouter(
@@ -11,9 +17,11 @@ router = APIRouter(
     tags=["news"],
 )
 
+news_adapter = TypeAdapter(list[NewsRead])
+
 # CREATE NEWS
 @router.post("/", response_model=NewsRead, status_code=status.HTTP_201_CREATED)
-def create_news(request: NewsCreate, db: Session = Depends(get_db)):
+def create_news(request: NewsCreate, db: Session = Depends(get_write_db)):
 
     data = request.model_dump()
     image_data = data.pop("news_images", [])
@@ -27,6 +35,7 @@ def create_news(request: NewsCreate, db: Session = Depends(get_db)):
 
     try:
         db.add(new_news)
+        bump_versions(db, NEWS)
         db.commit()
         db.refresh(new_news)
         return new_news
@@ -41,12 +50,24 @@ def create_news(request: NewsCreate, db: Session = Depends(get_db)):
     
 # GET ALL NEWS
 @router.get("/", response_model=list[NewsRead])
-def get_news(db: Session = Depends(get_db)):
-    return db.query(model.News).all()
+async def get_news(
+    db: AsyncSession = Depends(get_async_read_db),
+    validators: CacheValidators = Depends(cache_validated(NEWS)),
+):
+    result = await db.scalars(
+        select(model.News).options(selectinload(model.News.news_images))
+    )
+    news = result.all()
+
+    if config.FAST_JSON_RESPONSES:
+        body = news_adapter.dump_json(news_adapter.validate_python(news))
+        return Response(content=body, media_type="application/json", headers=validators.headers)
+
+    return news
 
 # UPDATE NEWS
 @router.put("/{news_id}", response_model=NewsRead)
-def update_news(news_id: int, request: NewsUpdate, db: Session = Depends(get_db)):
+def update_news(news_id: int, request: NewsUpdate, db: Session = Depends(get_write_db)):
 
     news_item = db.query(model.News).filter(model.News.id == news_id).first()
 
@@ -67,6 +88,7 @@ def update_news(news_id: int, request: NewsUpdate, db: Session = Depends(get_db)
             news_item.news_images.append(image_obj)
 
     try:
+        bump_versions(db, NEWS)
         db.commit()
         db.refresh(news_item)
         return news_item
@@ -81,7 +103,7 @@ def update_news(news_id: int, request: NewsUpdate, db: Session = Depends(get_db)
     
 # DELETE NEWS
 @router.delete("/{news_id}", status_code=status.HTTP_200_OK)
-def delete_news(news_id: int, db: Session = Depends(get_db)):
+def delete_news(news_id: int, db: Session = Depends(get_write_db)):
 
     news_item = db.query(model.News).filter(model.News.id == news_id).first()
 
@@ -90,6 +112,7 @@ def delete_news(news_id: int, db: Session = Depends(get_db)):
 
     try:
         db.delete(news_item)
+        bump_versions(db, NEWS)
         db.commit()
         return {"message": f"News with id {news_id} deleted successfully"}
 
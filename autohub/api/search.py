@@ -0,0 +1,158 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from autohub.api.http_cache import cache_validated
+from autohub.database import model
+from autohub.database.routing import get_async_read_db, get_read_db
+from autohub.database.search_index import search_catalog
+from autohub.database.versioning import BRANDS, MODELS, SPECS, VARIANTS
+from autohub.model.schemas import SearchResponse, TextSearchHit
+
+router = APIRouter(
+    prefix="/catalog",
+    tags=["catalog"]
+)
+
+MAX_SEARCH_LIMIT = 100
+
+SORT_COLUMNS = {
+    "price": model.CarVariant.price_inr,
+    "mileage": model.CarSpec.mileage,
+    "power_kw": model.CarSpec.power_kw,
+    "torque_nm": model.CarSpec.torque_nm,
+}
+
+
+def _base_query(columns):
+    return (
+        select(*columns)
+        .select_from(model.CarVariant)
+        .outerjoin(model.CarSpec, model.CarSpec.variant_id == model.CarVariant.id)
+    )
+
+
+def _range_filter(column, low: float | None, high: float | None) -> list:
+    clauses = []
+    if low is not None:
+        clauses.append(column >= low)
+    if high is not None:
+        clauses.append(column <= high)
+    return clauses
+
+
+# Faceted Variant Search
+
+@router.get("/search", response_model=SearchResponse, dependencies=[Depends(cache_validated(VARIANTS, SPECS))])
+async def search_variants(
+    fuel_type: list[str] | None = Query(None),
+    transmission: list[str] | None = Query(None),
+    price_min: float | None = Query(None, ge=0),
+    price_max: float | None = Query(None, ge=0),
+    engine_capacity_min: float | None = Query(None, ge=0),
+    engine_capacity_max: float | None = Query(None, ge=0),
+    mileage_min: float | None = Query(None, ge=0),
+    mileage_max: float | None = Query(None, ge=0),
+    power_kw_min: float | None = Query(None, ge=0),
+    power_kw_max: float | None = Query(None, ge=0),
+    torque_nm_min: float | None = Query(None, ge=0),
+    torque_nm_max: float | None = Query(None, ge=0),
+    sort: Literal[
+        "price", "-price", "mileage", "-mileage", "power_kw", "-power_kw", "torque_nm", "-torque_nm"
+    ] = "price",
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_LIMIT),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    # One clause list per dimension so each facet can be counted
+    # with every filter applied except its own.
+    filters = {
+        "fuel_type": [model.CarVariant.fuel_type.in_(fuel_type)] if fuel_type else [],
+        "transmission": [model.CarVariant.transmission.in_(transmission)] if transmission else [],
+        "price": _range_filter(model.CarVariant.price_inr, price_min, price_max),
+        "engine_capacity": _range_filter(model.CarSpec.engine_capacity, engine_capacity_min, engine_capacity_max),
+        "mileage": _range_filter(model.CarSpec.mileage, mileage_min, mileage_max),
+        "power_kw": _range_filter(model.CarSpec.power_kw, power_kw_min, power_kw_max),
+        "torque_nm": _range_filter(model.CarSpec.torque_nm, torque_nm_min, torque_nm_max),
+    }
+
+    def applied(exclude: str | None = None) -> list:
+        return [
+            clause
+            for name, clauses in filters.items()
+            if name != exclude
+            for clause in clauses
+        ]
+
+    sort_column = SORT_COLUMNS[sort.lstrip("-")]
+    order = sort_column.desc() if sort.startswith("-") else sort_column.asc()
+
+    rows = (await db.execute(
+        _base_query([
+            model.CarVariant.id,
+            model.CarVariant.model_id,
+            model.CarVariant.variant_name,
+            model.CarVariant.fuel_type,
+            model.CarVariant.transmission,
+            model.CarVariant.price,
+            model.CarVariant.price_inr,
+            model.CarSpec.engine_capacity,
+            model.CarSpec.mileage,
+            model.CarSpec.power_kw,
+            model.CarSpec.torque_nm,
+        ])
+        .where(*applied())
+        .order_by(order.nulls_last(), model.CarVariant.id)
+        .limit(limit)
+        .offset(offset)
+    )).mappings().all()
+
+    total = (await db.execute(_base_query([func.count()]).where(*applied()))).scalar_one()
+
+    async def value_counts(name: str, column) -> list[dict]:
+        counts = (await db.execute(
+            _base_query([column, func.count()])
+            .where(*applied(exclude=name))
+            .group_by(column)
+            .order_by(func.count().desc(), column)
+        )).all()
+        return [{"value": value, "count": count} for value, count in counts]
+
+    async def range_stats(name: str, column) -> dict:
+        low, high, count = (await db.execute(
+            _base_query([func.min(column), func.max(column), func.count(column)])
+            .where(*applied(exclude=name))
+        )).one()
+        return {"min": low, "max": high, "count": count}
+
+    return {
+        "total": total,
+        "items": rows,
+        "facets": {
+            "fuel_type": await value_counts("fuel_type", model.CarVariant.fuel_type),
+            "transmission": await value_counts("transmission", model.CarVariant.transmission),
+            "price": await range_stats("price", model.CarVariant.price_inr),
+            "engine_capacity": await range_stats("engine_capacity", model.CarSpec.engine_capacity),
+            "mileage": await range_stats("mileage", model.CarSpec.mileage),
+            "power_kw": await range_stats("power_kw", model.CarSpec.power_kw),
+            "torque_nm": await range_stats("torque_nm", model.CarSpec.torque_nm),
+        },
+    }
+
+
+# Full-Text Search
+
+@router.get(
+    "/search/text",
+    response_model=list[TextSearchHit],
+    dependencies=[Depends(cache_validated(BRANDS, MODELS, VARIANTS))],
+)
+def search_text(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_LIMIT),
+    db: Session = Depends(get_read_db),
+):
+    return search_catalog(db, q, limit)
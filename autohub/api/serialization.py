@@ -0,0 +1,33 @@
+"""
+Fast serialization path for large read responses.
+
+Rows are fetched as column mappings instead of ORM instances and encoded
+straight to bytes, skipping per-object hydration and response_model
+re-validation. Enabled with FAST_JSON_RESPONSES=true.
+"""
+
+from typing import Any
+
+import pydantic_core
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson, or pydantic-core when orjson is missing."""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content)
+        return pydantic_core.to_json(content)
+
+
+def schema_columns(entity, schema: type[BaseModel]) -> list:
+    """Table columns backing a Read schema's fields, in schema order."""
+    table = entity.__table__
+    return [table.c[name] for name in schema.model_fields]
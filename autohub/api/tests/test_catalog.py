@@ -0,0 +1,433 @@
+import json
+import tempfile
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from autohub.api import catalog, search
+from autohub.automation.export import iter_catalog_lines
+from autohub.automation.images.image_writer import write_car_images
+from autohub.automation.normalizer.common import spec_numeric_fields, variant_numeric_fields
+from autohub.core import config
+from autohub.core.cache import catalog_snapshot
+from autohub.database import model
+from autohub.database.connection import Base, apply_sqlite_pragmas
+from autohub.database.routing import get_async_read_db, get_read_db, get_write_db
+from autohub.database.search_index import FTS_TABLE, ensure_search_index
+
+DB_PATH = Path(tempfile.mkdtemp()) / "test_catalog.db"
+
+engine = create_engine(f"sqlite:///{DB_PATH}", connect_args={"check_same_thread": False})
+TestingSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# NullPool: TestClient may run each request on a fresh event loop
+async_engine = create_async_engine(f"sqlite+aiosqlite:///{DB_PATH}", poolclass=NullPool)
+AsyncTestingSession = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+apply_sqlite_pragmas(engine)
+apply_sqlite_pragmas(async_engine.sync_engine)
+
+
+def override_get_db():
+    db = TestingSession()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def override_get_async_db():
+    async with AsyncTestingSession() as db:
+        yield db
+
+
+app = FastAPI()
+app.include_router(catalog.router)
+app.include_router(search.router)
+app.dependency_overrides[get_read_db] = override_get_db
+app.dependency_overrides[get_write_db] = override_get_db
+app.dependency_overrides[get_async_read_db] = override_get_async_db
+
+client = TestClient(app)
+
+
+def setup_function():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
+
+    db = TestingSession()
+    brand = model.CarBrand(name="Mahindra")
+    db.add(brand)
+    db.flush()
+
+    for name in ("Thar Roxx", "XUV 3XO"):
+        car_model = model.CarModel(name=name, brand_id=brand.id, body_type="SUV")
+        db.add(car_model)
+        db.flush()
+
+        for i in range(3):
+            fuel = "Diesel" if i % 2 else "Petrol"
+            variant = model.CarVariant(
+                model_id=car_model.id,
+                variant_name=f"MX{i}",
+                fuel_type=fuel,
+                transmission="6-Speed Manual",
+                price=1000000 + i * 100000,
+                **variant_numeric_fields(1000000 + i * 100000),
+            )
+            db.add(variant)
+            db.flush()
+            db.add(model.CarSpec(
+                variant_id=variant.id,
+                engine_capacity=2.2,
+                mileage=15,
+                power=f"{100 + i * 10} kW @ 3500 rpm",
+                torque="400 Nm @ 1750-2750 rpm",
+                **spec_numeric_fields(f"{100 + i * 10} kW @ 3500 rpm", "400 Nm @ 1750-2750 rpm"),
+            ))
+
+        db.add(model.CarImage(model_id=car_model.id, image_url=f"https://img/{name}.jpg", image_type="exterior"))
+
+    db.commit()
+    ensure_search_index(db)
+    db.commit()
+    db.close()
+
+    catalog_snapshot.invalidate()
+
+
+# Keyset pagination
+
+def test_variants_keyset_pagination():
+    seen = []
+    cursor = None
+
+    while True:
+        params = {"limit": 4}
+        if cursor is not None:
+            params["cursor"] = cursor
+
+        page = client.get("/catalog/variants", params=params).json()
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+
+        if cursor is None:
+            break
+
+    assert seen == sorted(seen)
+    assert len(seen) == 6
+
+
+def test_variants_filters():
+    page = client.get("/catalog/variants", params={"fuel_type": "Diesel"}).json()
+    assert len(page["items"]) == 2
+    assert all(item["fuel_type"] == "Diesel" for item in page["items"])
+
+    page = client.get("/catalog/variants", params={"model_id": 1}).json()
+    assert {item["model_id"] for item in page["items"]} == {1}
+
+    page = client.get("/catalog/variants", params={"brand_id": 99}).json()
+    assert page == {"items": [], "next_cursor": None}
+
+
+def test_limit_is_bounded():
+    response = client.get("/catalog/specs", params={"limit": catalog.MAX_PAGE_SIZE + 1})
+    assert response.status_code == 422
+
+
+def test_images_filter_by_type():
+    page = client.get("/catalog/images", params={"image_type": "interior"}).json()
+    assert page["items"] == []
+
+    page = client.get("/catalog/images", params={"model_id": 2, "image_type": "exterior"}).json()
+    assert len(page["items"]) == 1
+
+
+def test_duplicate_image_is_rejected():
+    image = {"model_id": 1, "image_url": "https://img/Thar Roxx.jpg", "image_type": "exterior"}
+    response = client.post("/catalog/images", json=image)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Image already exists for this model"
+
+    assert client.post("/catalog/images", json={**image, "model_id": 2}).status_code == 201
+
+
+# Nested catalog snapshot
+
+def test_catalog_etag_and_not_modified():
+    first = client.get("/catalog")
+    assert first.status_code == 200
+    assert len(first.json()[0]["models"]) == 2
+
+    etag = first.headers["etag"]
+    second = client.get("/catalog", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
+
+
+def test_catalog_precompressed():
+    response = client.get("/catalog", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json()[0]["name"] == "Mahindra"
+
+
+def test_catalog_etag_per_encoding():
+    plain = client.get("/catalog", headers={"Accept-Encoding": "identity"})
+    gzipped = client.get("/catalog", headers={"Accept-Encoding": "gzip"})
+    etag = gzipped.headers["etag"]
+    assert etag == plain.headers["etag"][:-1] + '-gzip"'
+
+    # A gzip validator does not confirm the identity body
+    assert client.get("/catalog", headers={"Accept-Encoding": "identity", "If-None-Match": etag}).status_code == 200
+
+    not_modified = client.get("/catalog", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["vary"] == "Accept-Encoding"
+
+
+def test_catalog_snapshot_shared_across_query_strings(monkeypatch):
+    from autohub.api import catalog
+
+    builds = []
+    build = catalog.build_catalog_json
+
+    def counting_build(db):
+        builds.append(1)
+        return build(db)
+
+    monkeypatch.setattr(catalog, "build_catalog_json", counting_build)
+    catalog_snapshot.invalidate()
+
+    plain, extra = client.get("/catalog"), client.get("/catalog", params={"x": 1})
+    client.get("/catalog")
+    assert plain.headers["etag"] != extra.headers["etag"]
+    assert len(builds) == 1
+
+
+def test_catalog_invalidated_by_post():
+    etag = client.get("/catalog").headers["etag"]
+
+    response = client.post("/catalog/brands", json={"name": "Tata"})
+    assert response.status_code == 201
+
+    refreshed = client.get("/catalog", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] != etag
+    assert [brand["name"] for brand in refreshed.json()] == ["Mahindra", "Tata"]
+
+
+# HTTP caching on list endpoints
+
+def test_list_revalidation_tracks_data_version():
+    first = client.get("/catalog/images", params={"model_id": 1})
+    assert first.headers["cache-control"].startswith("public, max-age=")
+
+    etag = first.headers["etag"]
+    assert client.get("/catalog/images", params={"model_id": 1}, headers={"If-None-Match": etag}).status_code == 304
+
+    # Other query strings are separate representations
+    assert client.get("/catalog/images", params={"model_id": 2}, headers={"If-None-Match": etag}).status_code == 200
+
+    # Pipeline writes bump the version too
+    db = TestingSession()
+    write_car_images(1, {"interior": ["https://img/cabin.jpg"]}, db)
+    db.commit()
+    db.close()
+
+    refreshed = client.get("/catalog/images", params={"model_id": 1}, headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert len(refreshed.json()["items"]) == 2
+
+    last_modified = refreshed.headers["last-modified"]
+    not_modified = client.get("/catalog/images", params={"model_id": 1}, headers={"If-Modified-Since": last_modified})
+    assert not_modified.status_code == 304
+
+
+# NDJSON export
+
+def test_export_one_document_per_model():
+    db = TestingSession()
+    try:
+        lines = list(iter_catalog_lines(db, batch_size=1))
+    finally:
+        db.close()
+
+    docs = [json.loads(line) for line in lines]
+    assert [doc["name"] for doc in docs] == ["Thar Roxx", "XUV 3XO"]
+    assert docs[0]["brand"]["name"] == "Mahindra"
+    assert len(docs[0]["variants"]) == 3
+    assert docs[0]["variants"][0]["specs"]["mileage"] == 15
+    assert len(docs[1]["images"]) == 1
+
+
+# Faceted search
+
+def test_search_filters_and_sort():
+    result = client.get(
+        "/catalog/search",
+        params={"fuel_type": "Petrol", "price_min": 1100000, "sort": "-price"},
+    ).json()
+
+    assert result["total"] == 2
+    assert [item["price"] for item in result["items"]] == [1200000, 1200000]
+    assert all(item["fuel_type"] == "Petrol" for item in result["items"])
+
+
+def test_search_facets_exclude_own_dimension():
+    result = client.get("/catalog/search", params={"fuel_type": "Diesel"}).json()
+
+    assert result["total"] == 2
+    # The fuel facet ignores the fuel filter so other choices stay visible
+    assert {f["value"]: f["count"] for f in result["facets"]["fuel_type"]} == {"Petrol": 4, "Diesel": 2}
+    assert result["facets"]["transmission"] == [{"value": "6-Speed Manual", "count": 2}]
+    assert result["facets"]["price"] == {"min": 1100000, "max": 1100000, "count": 2}
+    assert result["facets"]["mileage"]["count"] == 2
+
+
+
+def test_search_power_range_and_sort():
+    result = client.get("/catalog/search", params={"power_kw_min": 110, "sort": "-power_kw"}).json()
+
+    assert [item["power_kw"] for item in result["items"]] == [120, 120, 110, 110]
+    assert result["items"][0]["price_inr"] == 1200000
+    assert result["facets"]["power_kw"] == {"min": 100, "max": 120, "count": 6}
+
+
+# Full-text search
+
+def test_text_search_tolerates_typos():
+    hits = client.get("/catalog/search/text", params={"q": "thra rox"}).json()
+    assert hits[0]["kind"] == "model"
+    assert hits[0]["name"] == "Thar Roxx"
+
+
+def test_text_search_sees_new_entities():
+    client.post("/catalog/models", json={"name": "Scorpio N", "brand_id": 1})
+
+    hits = client.get("/catalog/search/text", params={"q": "scorpoi"}).json()
+    assert [(hit["kind"], hit["name"]) for hit in hits] == [("model", "Scorpio N")]
+
+
+def test_text_search_never_creates_the_index():
+    # Like a replica opened read-only before the migration created the FTS table
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE {FTS_TABLE}"))
+
+    read_only = create_engine(f"sqlite:///file:{DB_PATH}?mode=ro&uri=true")
+    with sessionmaker(bind=read_only)() as db:
+        hits = search.search_catalog(db, "Thar")
+    read_only.dispose()
+
+    assert ("model", "Thar Roxx") in [(hit["kind"], hit["name"]) for hit in hits]
+
+
+# Bulk ingestion
+
+def test_bulk_upsert_single_request():
+    payload = {
+        "brands": [
+            {
+                "name": "Mahindra",
+                "models": [
+                    {
+                        "name": "Thar Roxx",
+                        "description": "Five-door Thar",
+                        "variants": [
+                            {"variant_name": "MX0", "price": 999999},
+                            {"variant_name": "AX7L", "fuel_type": "Diesel", "specs": {"power": "128.6 kW @ 3500 rpm"}},
+                        ],
+                        "images": [
+                            {"image_url": "https://img/Thar Roxx.jpg", "image_type": "exterior"},
+                            {"image_url": "https://img/roxx-cabin.jpg", "image_type": "interior"},
+                        ],
+                    }
+                ],
+            },
+            {"name": "Tata", "models": [{"name": "Nexon", "variants": [{"variant_name": "Smart"}]}]},
+        ]
+    }
+
+    result = client.post("/catalog/bulk", json=payload).json()
+    statuses = {(item["kind"], item["key"]): item["status"] for item in result["items"]}
+
+    assert statuses[("brand", "Mahindra")] == "updated"
+    assert statuses[("brand", "Tata")] == "created"
+    assert statuses[("variant", "Mahindra / Thar Roxx / MX0")] == "updated"
+    assert statuses[("variant", "Mahindra / Thar Roxx / AX7L")] == "created"
+    assert statuses[("spec", "Mahindra / Thar Roxx / AX7L")] == "created"
+    assert statuses[("image", "https://img/Thar Roxx.jpg")] == "skipped"
+    assert result["skipped"] == 1
+
+    variants = client.get("/catalog/variants", params={"model_id": 1}).json()["items"]
+    by_name = {variant["variant_name"]: variant for variant in variants}
+    assert by_name["MX0"]["price"] == 999999
+    assert by_name["MX0"]["fuel_type"] == "Petrol"  # null in payload keeps stored value
+
+    hits = client.get("/catalog/search/text", params={"q": "nexon"}).json()
+    assert hits[0]["name"] == "Nexon"
+
+    # Re-running the same payload only updates
+    again = client.post("/catalog/bulk", json=payload).json()
+    assert again["created"] == 0
+
+
+
+def test_bulk_rejects_duplicate_brands_and_keeps_brand_versions():
+    duplicate = {"brands": [
+        {"name": "Tata", "models": [{"name": "Nexon"}]},
+        {"name": "Tata", "models": [{"name": "Punch"}]},
+    ]}
+    response = client.post("/catalog/bulk", json=duplicate)
+    assert response.status_code == 422
+    assert "Duplicate brand in payload: Tata" in response.text
+
+    # Only existing brands: brand validators stay valid
+    etag = client.get("/catalog/brands").headers["etag"]
+    payload = {"brands": [{"name": "Mahindra", "models": [{"name": "Scorpio N"}]}]}
+    assert client.post("/catalog/bulk", json=payload).status_code == 200
+    assert client.get("/catalog/brands", headers={"If-None-Match": etag}).status_code == 304
+
+
+# Fast serialization path
+
+def test_fast_json_matches_default(monkeypatch):
+    params = {"brand_id": 1, "limit": 4}
+    default = client.get("/catalog/variants", params=params).json()
+
+    monkeypatch.setattr(config, "FAST_JSON_RESPONSES", True)
+    fast = client.get("/catalog/variants", params=params).json()
+
+    assert fast == default
+    assert fast["next_cursor"] == 4
+
+    fast_images = client.get("/catalog/images", params={"image_type": "exterior"}).json()
+    assert [image["model_id"] for image in fast_images["items"]] == [1, 2]
+
+
+# Variant comparison
+
+def test_compare_aligned_rows_with_deltas():
+    result = client.get("/catalog/compare", params={"variant_ids": [3, 1]}).json()
+
+    assert [variant["id"] for variant in result["variants"]] == [3, 1]
+    rows = {row["field"]: row for row in result["rows"]}
+
+    assert rows["power_kw"]["values"] == [120, 100]
+    assert rows["power_kw"]["deltas"] == [0, -20]
+    assert rows["price"]["deltas"] == [0, -200000]
+    assert rows["torque"]["deltas"] is None
+
+
+def test_compare_rejects_unknown_and_too_many():
+    assert client.get("/catalog/compare", params={"variant_ids": [1, 999]}).status_code == 404
+
+    too_many = list(range(1, catalog.MAX_COMPARE + 2))
+    assert client.get("/catalog/compare", params={"variant_ids": too_many}).status_code == 422
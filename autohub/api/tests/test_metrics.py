@@ -0,0 +1,96 @@
+import tempfile
+from pathlib import Path
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from autohub.api import metrics as metrics_api, news
+from autohub.api.metrics import MetricsMiddleware
+from autohub.core import metrics
+from autohub.database import model
+from autohub.database.connection import Base
+from autohub.database.instrumentation import install_sql_instrumentation, statement_shape
+from autohub.database.routing import get_async_read_db, get_read_db
+
+DB_PATH = Path(tempfile.mkdtemp()) / "test_metrics.db"
+
+engine = create_engine(f"sqlite:///{DB_PATH}", connect_args={"check_same_thread": False})
+TestingSession = sessionmaker(autoflush=False, bind=engine)
+async_engine = create_async_engine(f"sqlite+aiosqlite:///{DB_PATH}", poolclass=NullPool)
+AsyncTestingSession = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+
+def override_get_db():
+    with TestingSession() as db:
+        yield db
+
+
+async def override_get_async_db():
+    async with AsyncTestingSession() as db:
+        yield db
+
+
+app = FastAPI()
+app.add_middleware(MetricsMiddleware)
+app.include_router(news.router)
+app.include_router(metrics_api.router)
+app.dependency_overrides[get_read_db] = override_get_db
+app.dependency_overrides[get_async_read_db] = override_get_async_db
+
+
+# Lazy news_images loads: one query per article
+@app.get("/news/lazy")
+def lazy_news(db: Session = Depends(get_read_db)):
+    return [len(item.news_images) for item in db.query(model.News).all()]
+
+
+client = TestClient(app)
+
+
+def setup_module():
+    install_sql_instrumentation()
+    Base.metadata.create_all(bind=engine)
+
+    with TestingSession() as db:
+        for i in range(6):
+            item = model.News(title=f"News {i}", content="...", published_at="2026-10-18T00:00:00Z")
+            item.news_images.append(model.NewsImage(image_url=f"https://img/{i}.jpg"))
+            db.add(item)
+        db.commit()
+
+
+def test_statement_shape_collapses_in_lists():
+    assert statement_shape("SELECT *\n FROM t WHERE id IN (?, ?, ?)") == "SELECT * FROM t WHERE id IN (?)"
+
+
+def test_n_plus_one_flagged_per_route(caplog):
+    before_lazy = metrics.db_n_plus_one.value("GET", "/news/lazy")
+    before_eager = metrics.db_n_plus_one.value("GET", "/news/")
+
+    with caplog.at_level("WARNING", logger="autohub.api.metrics"):
+        assert client.get("/news/lazy").json() == [1] * 6
+        assert client.get("/news/").status_code == 200
+
+    assert metrics.db_n_plus_one.value("GET", "/news/lazy") == before_lazy + 1
+    assert [record.getMessage().split(":")[0] for record in caplog.records] == ["Possible N+1 on GET /news/lazy"]
+    # selectinload keeps the async route at a constant query count
+    assert metrics.db_n_plus_one.value("GET", "/news/") == before_eager
+    assert metrics.db_statements.count("GET", "/news/") >= 1
+
+
+def test_metrics_exposition():
+    client.get("/news/", headers={"If-None-Match": "*"})
+    client.get("/missing")
+
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+
+    body = response.text
+    assert '# TYPE autohub_http_request_duration_seconds histogram' in body
+    assert 'autohub_http_requests_total{method="GET",route="/news/",status="304"}' in body
+    assert 'autohub_http_requests_total{method="GET",route="unmatched",status="404"}' in body
+    assert 'autohub_db_statements_per_request_bucket{method="GET",route="/news/",le="+Inf"}' in body
@@ -1,8 +1,10 @@
 from fastapi import APIRouter, HTTPException, Depends, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from autohub.database import model
-from autohub.database.connection import get_db
+from autohub.database.connection import get_async_db, get_db
 from autohub.model.schemas import User
 from autohub.api.login import get_current_user
 from passlib.context import CryptContext
@@ -45,11 +47,11 @@ def sign_up(request: User, db: Session = Depends(get_db)):
 
 # Get All User
 @router.get("/users")
-def get_users(
-    db: Session = Depends(get_db),
+async def get_users(
+    db: AsyncSession = Depends(get_async_db),
     _: model.User = Depends(get_current_user),
 ):
-    return db.query(model.User).all()
+    return (await db.scalars(select(model.User))).all()
 
 # Delete User
 @router.delete("/users/{user_id}")
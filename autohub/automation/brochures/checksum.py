@@ -1,32 +1,59 @@
+"""
+Per-brochure checksum records, keyed by the PDF path relative to the
+download folder. Stored one row per brochure in the pipeline state store
+(automation/state.py); a legacy checksums.json is imported on first use.
+
+File hashes are cached by (size, mtime_ns, inode): while a PDF's stat
+tuple is unchanged its stored SHA-256 is trusted, so a run over unchanged
+brochures costs one stat() per file instead of reading every byte.
+"""
+
 import hashlib
-import json
 from pathlib import Path
 from datetime import datetime, timezone
+from typing import Any, Optional
+
+from autohub.automation import state
 
+# Legacy location, imported into the state store once
 CHECKSUM_FILE = Path(__file__).parent / "checksums.json"
 
+# HTTP validators stored with each downloaded brochure for conditional requests
+VALIDATOR_FIELDS = ("etag", "last_modified", "content_length")
+
 
 def calculate_checksum(data: bytes) -> str:
     return hashlib.sha256(data).hexdigest()
 
 
+def hash_file(path: Path) -> str:
+    """SHA-256 of a file, streamed so a large PDF is never held in memory."""
+    with path.open("rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def fingerprint(path: Path) -> list[int]:
+    st = path.stat()
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+
+def _store() -> state.PipelineState:
+    store = state.shared_state()
+    store.import_json(state.CHECKSUMS, CHECKSUM_FILE, lambda data: data or {})
+    return store
+
+
 def load_checksums() -> dict:
-    if not CHECKSUM_FILE.exists():
-        return {}
+    return _store().records(state.CHECKSUMS)
+
 
-    try:
-        content = CHECKSUM_FILE.read_text(encoding="utf-8").strip()
-        if not content:
-            return {}
-        return json.loads(content)
-    except Exception:
-        return {}
+def get_record(file_key: str) -> Any:
+    return _store().get_record(state.CHECKSUMS, file_key)
 
 
 def save_checksums(checksums: dict) -> None:
-    CHECKSUM_FILE.write_text(
-        json.dumps(checksums, indent=2, sort_keys=True)
-    )
+    """Upsert every record in `checksums` in one transaction."""
+    _store().put_records(state.CHECKSUMS, checksums)
 
 
 def update_record(
@@ -35,10 +62,63 @@ def update_record(
     checksum: str,
     extracted: bool,
     model_version: str,
+    **validators,
 ):
+    """
+    Write one brochure's record through to the store and into `checksums`
+    (the caller's loaded records, may be empty); no save_checksums needed.
+
+    `validators` are the HTTP cache validators of the downloaded file
+    (etag, last_modified, content_length). Omitted ones are kept from the
+    previous record as long as the checksum is unchanged.
+    """
+    previous = checksums[file_key] if file_key in checksums else get_record(file_key)
+    kept = {}
+    if isinstance(previous, dict) and previous.get("checksum") == checksum:
+        kept = {field: previous[field] for field in VALIDATOR_FIELDS if previous.get(field) is not None}
+
     checksums[file_key] = {
         "checksum": checksum,
         "extracted": extracted,
         "model_version": model_version,
         "timestamp": datetime.now(timezone.utc).isoformat(),
+        **kept,
+        **{field: value for field, value in validators.items() if field in VALIDATOR_FIELDS},
     }
+    _store().put_record(state.CHECKSUMS, file_key, checksums[file_key])
+
+
+# FILE FINGERPRINT CACHE
+def load_fingerprints() -> dict:
+    return _store().records(state.FINGERPRINTS)
+
+
+def remember_checksum(path: Path, checksum: str, fingerprints: Optional[dict] = None) -> None:
+    """Cache `checksum` as the hash of `path` in its current on-disk state."""
+    key = str(path.absolute())
+    record = {"fingerprint": fingerprint(path), "checksum": checksum}
+    if fingerprints is not None:
+        fingerprints[key] = record
+    _store().put_record(state.FINGERPRINTS, key, record)
+
+
+def file_checksum(path: Path, fingerprints: Optional[dict] = None) -> str:
+    """
+    SHA-256 of `path`, from the fingerprint cache when its size, mtime and
+    inode still match; otherwise hashed from disk and cached.
+
+    `fingerprints` is the result of load_fingerprints(), so a loop over many
+    files does one query up front instead of one per file.
+    """
+    key = str(path.absolute())
+    if fingerprints is None:
+        cached = _store().get_record(state.FINGERPRINTS, key)
+    else:
+        cached = fingerprints.get(key)
+
+    if isinstance(cached, dict) and cached.get("fingerprint") == fingerprint(path):
+        return cached["checksum"]
+
+    checksum = hash_file(path)
+    remember_checksum(path, checksum, fingerprints)
+    return checksum
@@ -1,16 +1,35 @@
 """
 Download brochures from discovery JSON and store them locally
 with checksum validation and metadata tracking.
+
+Bodies are streamed in chunks to `<file>.part` while being hashed, so
+memory stays constant whatever the brochure size. An interrupted transfer
+resumes from the partial file with Range + If-Range, and only a complete,
+verified file is moved over the final path (atomic os.replace).
+
+iter_downloads() runs DOWNLOAD_WORKERS transfers at once, at most
+DOWNLOAD_PER_HOST per host, over one keep-alive session per worker thread.
 """
 
+import hashlib
 import json
+import os
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import List, Dict
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+
+from autohub.core.config import DOWNLOAD_PER_HOST, DOWNLOAD_WORKERS
 
 from .retry import with_retry, RetryError
-from ..checksum import calculate_checksum, load_checksums, save_checksums, update_record
+from autohub.automation import state
+from ..checksum import get_record, remember_checksum, update_record
 
 
 # PATH CONFIGURATION
@@ -22,21 +41,74 @@ PDF_BASE_DIR = BASE_DIR / "brochures/data/pdfs"
 METADATA_FILE = BASE_DIR / "brochures/data/metadata/brochure_download_metadata.json"
 
 REQUEST_TIMEOUT = 15  # seconds
+CHUNK_SIZE = 1024 * 1024  # bytes per streamed read
 
-# LOAD DISCOVERY FILE
-def load_discovery_file(file_path: Path) -> List[Dict]:
-    if not file_path.exists():
-        raise FileNotFoundError(f"Discovery file not found: {file_path}")
+# CONNECTION POOLING + CONCURRENCY LIMITS
+_local = threading.local()
 
-    with file_path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
 
-    if isinstance(data, list):
-        return data
+def get_session() -> requests.Session:
+    """Keep-alive session for the current thread (Session is not thread-safe to share)."""
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=DOWNLOAD_PER_HOST)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _local.session = session
+    return session
 
-    raise ValueError(
-        f"Invalid discovery file format. Expected list[dict], got {type(data)}"
-    )
+
+class KeyedLimiter:
+    """At most `limit` threads inside hold(key) at once, per key."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def hold(self, key: str):
+        with self._lock:
+            semaphore = self._semaphores.get(key)
+            if semaphore is None:
+                semaphore = self._semaphores[key] = threading.BoundedSemaphore(self.limit)
+        with semaphore:
+            yield
+
+
+host_limiter = KeyedLimiter(DOWNLOAD_PER_HOST)
+# Two discovery entries can map to the same file; never write it from two threads
+path_limiter = KeyedLimiter(1)
+
+
+# DISCOVERY RESULTS (state store; DISCOVERY_FILE is the legacy JSON, imported once)
+def _discovery_records(data: List[Dict]) -> Dict:
+    return {item["brochure_url"]: item for item in data if item.get("brochure_url")}
+
+
+def _discovery_store(legacy_file: Optional[Path] = None) -> state.PipelineState:
+    store = state.shared_state()
+    store.import_json(state.DISCOVERY, legacy_file or DISCOVERY_FILE, _discovery_records)
+    return store
+
+
+def has_discovery() -> bool:
+    return bool(_discovery_store().records(state.DISCOVERY))
+
+
+def load_discovery_file(file_path: Optional[Path] = None) -> List[Dict]:
+    file_path = file_path or DISCOVERY_FILE
+    brochures = list(_discovery_store(file_path).records(state.DISCOVERY).values())
+    if not brochures:
+        raise FileNotFoundError(f"No discovery results stored (legacy file: {file_path})")
+
+    return brochures
+
+
+def save_discovery_results(data: List[Dict]) -> None:
+    """Replace the stored discovery results with this run's."""
+    _discovery_store().put_records(state.DISCOVERY, _discovery_records(data), replace=True)
 
 # BUILD DOWNLOAD PATH
 def build_download_path(item: Dict) -> Path:
@@ -49,22 +121,178 @@ def build_download_path(item: Dict) -> Path:
 
     return folder / "brochure.pdf"
 
+
+def parse_download_path(path: Path) -> Optional[Tuple[str, str]]:
+    """(brand, model) from a path built by build_download_path, or None for other paths."""
+    try:
+        parts = Path(path).relative_to(PDF_BASE_DIR).parts
+    except ValueError:
+        return None
+    if len(parts) != 4:
+        return None
+    return parts[0], parts[1].replace("_", " ")
+
+# HTTP VALIDATORS
+def response_validators(response: requests.Response) -> Dict:
+    content_length = response.headers.get("Content-Length")
+    return {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "content_length": int(content_length) if content_length and content_length.isdigit() else None,
+    }
+
+
+def conditional_headers(stored: Dict) -> Dict:
+    headers = {}
+    if stored.get("etag"):
+        headers["If-None-Match"] = stored["etag"]
+    if stored.get("last_modified"):
+        headers["If-Modified-Since"] = stored["last_modified"]
+    return headers
+
+
+def unchanged_by_head(url: str, stored: Dict) -> bool:
+    """
+    Pre-check for servers that send no ETag / Last-Modified: a HEAD whose
+    Content-Length matches the stored one is taken as unchanged.
+    """
+    if not stored.get("content_length"):
+        return False
+
+    try:
+        with host_limiter.hold(urlsplit(url).netloc):
+            head = get_session().head(url, timeout=REQUEST_TIMEOUT, allow_redirects=True)
+    except requests.exceptions.RequestException:
+        return False
+
+    if not head.ok:
+        return False
+
+    return response_validators(head)["content_length"] == stored["content_length"]
+
+
+# PARTIAL DOWNLOADS
+def part_paths(save_path: Path) -> Tuple[Path, Path]:
+    """The in-progress body, and the validators it was fetched under."""
+    return (
+        save_path.with_name(save_path.name + ".part"),
+        save_path.with_name(save_path.name + ".part.json"),
+    )
+
+
+def load_part_meta(meta_path: Path) -> Dict:
+    try:
+        return json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def discard_part(save_path: Path) -> None:
+    for path in part_paths(save_path):
+        path.unlink(missing_ok=True)
+
+
+def hash_file_into(hasher, path: Path) -> None:
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            hasher.update(chunk)
+
+
+def is_pdf_response(url: str, response: requests.Response) -> bool:
+    content_type = response.headers.get("Content-Type", "").lower()
+    return "pdf" in content_type or url.lower().endswith(".pdf")
+
+
+def fetch_to_part(url: str, save_path: Path, headers: Dict) -> Tuple[requests.Response, str, int]:
+    """
+    Stream `url` into the .part file with a running SHA-256. Resumes an
+    earlier partial body when its validator is known; If-Range makes the
+    server send the whole body instead if the brochure changed meanwhile.
+    Returns the response, the hash and the size of the complete body;
+    non-2xx and non-PDF responses come back unread.
+    """
+    part_path, meta_path = part_paths(save_path)
+    meta = load_part_meta(meta_path)
+    validator = meta.get("etag") or meta.get("last_modified")
+    offset = part_path.stat().st_size if part_path.exists() else 0
+
+    if offset and validator and meta.get("url") == url:
+        headers = {"Range": f"bytes={offset}-", "If-Range": validator}
+    else:
+        offset = 0
+
+    with host_limiter.hold(urlsplit(url).netloc):
+        with get_session().get(url, headers=headers, timeout=REQUEST_TIMEOUT, stream=True) as response:
+            if response.status_code == 416:
+                # The partial body no longer fits the remote file: start over
+                discard_part(save_path)
+                raise requests.HTTPError("Range not satisfiable, restarting download")
+
+            if response.status_code not in (200, 206) or not is_pdf_response(url, response):
+                return response, "", 0
+
+            if response.status_code == 200:
+                offset = 0
+
+            validators = response_validators(response)
+            meta_path.write_text(json.dumps({
+                "url": url,
+                "etag": validators["etag"],
+                "last_modified": validators["last_modified"],
+            }))
+
+            hasher = hashlib.sha256()
+            if offset:
+                hash_file_into(hasher, part_path)
+
+            received = 0
+            with part_path.open("r+b" if offset else "wb") as f:
+                f.seek(offset)
+                f.truncate()
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    f.write(chunk)
+                    hasher.update(chunk)
+                    received += len(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+
+            # Content-Length counts encoded bytes; only compare for identity bodies
+            expected = validators["content_length"]
+            encoded = response.headers.get("Content-Encoding", "identity") != "identity"
+            if expected is not None and not encoded and received != expected:
+                # Keep the partial body; the retry resumes from here
+                raise requests.exceptions.ChunkedEncodingError(
+                    f"Incomplete transfer: {received} of {expected} bytes"
+                )
+
+            return response, hasher.hexdigest(), offset + received
+
+
 # DOWNLOAD PDF
 def download_pdf(url: str, save_path: Path) -> Dict:
-    checksums = load_checksums()
-
     # Use relative path as checksum key (fixes collision bug)
     file_key = str(save_path.relative_to(PDF_BASE_DIR))
 
-    if save_path.exists() and file_key in checksums:
-        return {
-            "status": "skipped",
-            "reason": "File already exists with checksum"
-        }
+    stored_record = get_record(file_key)
+    stored = stored_record if isinstance(stored_record, dict) else {}
+
+    # Revalidate the local copy instead of transferring it again
+    headers = {}
+    if save_path.exists() and stored:
+        headers = conditional_headers(stored)
+
+        if not headers and unchanged_by_head(url, stored):
+            return {
+                "status": "skipped",
+                "reason": "Unchanged (HEAD Content-Length match)"
+            }
 
     try:
+        body = {}
+
         def _request():
-            return requests.get(url, timeout=REQUEST_TIMEOUT)
+            response, body["checksum"], body["size"] = fetch_to_part(url, save_path, headers)
+            return response
 
         response = with_retry(
             _request,
@@ -72,43 +300,63 @@ def download_pdf(url: str, save_path: Path) -> Dict:
             base_delay=1,
         )
 
-        response.raise_for_status()
+        if response.status_code == 304:
+            return {
+                "status": "skipped",
+                "reason": "Not modified (304)"
+            }
 
-        content_type = response.headers.get("Content-Type", "").lower()
+        response.raise_for_status()
 
         # Safer PDF validation
-        if "pdf" not in content_type and not url.lower().endswith(".pdf"):
+        if not is_pdf_response(url, response):
+            content_type = response.headers.get("Content-Type", "").lower()
             return {
                 "status": "failed",
                 "reason": f"Unexpected content type: {content_type}"
             }
 
-        pdf_bytes = response.content
-        checksum = calculate_checksum(pdf_bytes)
-
-        stored = checksums.get(file_key)
-        stored_hash = stored.get("checksum") if isinstance(stored, dict) else stored
-
-        if stored_hash == checksum:
+        checksum = body["checksum"]
+        validators = response_validators(response)
+        if response.status_code == 206 or validators["content_length"] is None:
+            validators["content_length"] = body["size"]
+
+        stored_hash = stored.get("checksum") if stored else stored_record
+
+        if stored_hash == checksum and save_path.exists():
+            # Same bytes: keep the extraction status, refresh the validators
+            discard_part(save_path)
+            update_record(
+                checksums={},
+                file_key=file_key,
+                checksum=checksum,
+                extracted=stored.get("extracted", False),
+                model_version=stored.get("model_version", ""),
+                **validators,
+            )
             return {
                 "status": "skipped",
                 "reason": "Checksum match (duplicate file)"
             }
 
-        save_path.write_bytes(pdf_bytes)
+        part_path, meta_path = part_paths(save_path)
+        os.replace(part_path, save_path)
+        meta_path.unlink(missing_ok=True)
+        # The hash is already known; extraction need not read the file again
+        remember_checksum(save_path, checksum)
 
         update_record(
-            checksums=checksums,
+            checksums={},
             file_key=file_key,
             checksum=checksum,
             extracted=False,
             model_version="",
+            **validators,
         )
-        save_checksums(checksums)
 
         return {
             "status": "success",
-            "file_size_kb": round(len(pdf_bytes) / 1024, 2),
+            "file_size_kb": round(body["size"] / 1024, 2),
             "checksum": checksum
         }
 
@@ -124,35 +372,80 @@ def download_pdf(url: str, save_path: Path) -> Dict:
             "reason": str(exc)
         }
 
-# RUN DOWNLOADER
-def run_brochure_downloader():
-    brochures = load_discovery_file(DISCOVERY_FILE)
-    results = []
+# DOWNLOAD ONE DISCOVERY ITEM
+def download_record(item: Dict, save_path: Path, result: Dict) -> Dict:
+    return {
+        "brand": item.get("brand"),
+        "model": item.get("model"),
+        "year": item.get("year"),
+        "brochure_url": item["brochure_url"],
+        "file_path": str(save_path),
+        "status": result["status"],
+        "reason": result.get("reason"),
+        "timestamp_utc": datetime.now(timezone.utc).isoformat()
+    }
+
+
+def download_item(item: Dict) -> Dict:
+    url = item["brochure_url"]
+    save_path = build_download_path(item)
+
+    with path_limiter.hold(str(save_path)):
+        result = download_pdf(url, save_path)
 
-    for item in brochures:
-        url = item.get("brochure_url")
-        if not url:
-            continue
+    return download_record(item, save_path, result)
+
+# DOWNLOAD MANY, CONCURRENTLY
+def iter_downloads(items: Iterable[Dict], workers: int = DOWNLOAD_WORKERS) -> Iterator[Tuple[Dict, Dict]]:
+    """
+    Download every item with up to `workers` threads and yield
+    (item, record) pairs to the caller as each one finishes.
+    """
+    items = [item for item in items if item.get("brochure_url")]
+    if not items:
+        return
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(items))), thread_name_prefix="download") as pool:
+        futures = {pool.submit(download_item, item): item for item in items}
+
+        for future in as_completed(futures):
+            item = futures[future]
+            try:
+                record = future.result()
+            except Exception as exc:
+                record = download_record(item, build_download_path(item), {"status": "failed", "reason": str(exc)})
+            yield item, record
+
+# DOWNLOAD METADATA (state store; METADATA_FILE is the legacy JSON, imported once)
+def _metadata_store() -> state.PipelineState:
+    store = state.shared_state()
+    store.import_json(
+        state.DOWNLOADS,
+        METADATA_FILE,
+        lambda data: {record["brochure_url"]: record for record in data},
+    )
+    return store
 
-        save_path = build_download_path(item)
-        result = download_pdf(url, save_path)
 
-        results.append({
-            "brand": item.get("brand"),
-            "model": item.get("model"),
-            "year": item.get("year"),
-            "brochure_url": url,
-            "file_path": str(save_path),
-            "status": result["status"],
-            "reason": result.get("reason"),
-            "timestamp_utc": datetime.now(timezone.utc).isoformat()
-        })
+def load_download_metadata() -> List[Dict]:
+    return list(_metadata_store().records(state.DOWNLOADS).values())
 
-    METADATA_FILE.parent.mkdir(parents=True, exist_ok=True)
 
-    with METADATA_FILE.open("w", encoding="utf-8") as f:
-        json.dump(results, f, indent=2)
+def save_download_metadata(results: List[Dict]) -> None:
+    """Replace the stored download records with this run's, in one transaction."""
+    _metadata_store().put_records(
+        state.DOWNLOADS,
+        {record["brochure_url"]: record for record in results},
+        replace=True,
+    )
+
+# RUN DOWNLOADER
+def run_brochure_downloader():
+    brochures = load_discovery_file()
+    results = [record for _, record in iter_downloads(brochures)]
+
+    save_download_metadata(results)
 
     print("Download process completed.")
-    print("Metadata saved to:", METADATA_FILE)
+    print("Metadata saved to:", state.STATE_FILE)
 
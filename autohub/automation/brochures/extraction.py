@@ -0,0 +1,350 @@
+"""
+Concurrent brochure extraction with a single database writer.
+
+A pool of EXTRACTION_WORKERS threads runs the extraction sources in
+parallel: Docling's local spec tables first, then, only when those cover
+too little, the Gemini round trip (upload → generate → delete, throttled
+by the shared token bucket in the extractor). Each result comes back to the calling thread, which
+normalizes and writes it, so SQLite never sees concurrent writers and the
+checksum records are only touched from one thread.
+
+Both steps are tracked in the pipeline state (EXTRACT, WRITE) per file and
+checksum. The raw result is kept with the extract item, so a brochure that
+was extracted but not written is written on the next run without another
+Gemini call, and failures wait out their backoff.
+
+Every raw result also goes into the content-addressed result cache
+(result_cache.py) under the model version of the source that produced it.
+A PDF with a cached result that extract_pdf() would settle on (see
+find_cached) is written from it instead of being extracted again, and
+replay_extraction() rewrites everything from the cache with no network.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from autohub.automation.brochures.checksum import (
+    file_checksum,
+    load_fingerprints,
+    update_record,
+)
+from autohub.automation.brochures.downloader.brochure_downloader import PDF_BASE_DIR
+from autohub.automation.brochures.extractor.car_extractor import CarExtractor
+from autohub.automation.brochures.extractor.sources.docling_tables import DoclingTableExtractor
+from autohub.automation.brochures.extractor.sources.pdf_text_llm import PDFTextLLMExtractor
+from autohub.automation.brochures.result_cache import get_cached, put_cached
+from autohub.automation.db_writer.car_writer import write_car_payload
+from autohub.automation.normalizer.car_normalizer import normalize_variant
+from autohub.automation.state import DONE, EXTRACT, WRITE, PipelineState, StageItem
+from autohub.core.config import EXTRACTION_WORKERS
+
+# Tried in priority order (lowest first) until one is sufficient
+EXTRACTION_SOURCES = [DoclingTableExtractor, PDFTextLLMExtractor]
+
+# Stored extractions from before sources were recorded all came from Gemini
+LEGACY_MODEL_VERSION = PDFTextLLMExtractor.model_version
+
+# A raw result and the model version of the source that produced it
+Extraction = Tuple[Dict[str, Any], str]
+
+
+@dataclass(frozen=True)
+class BrochureJob:
+    pdf_path: Path
+    file_key: str
+    checksum: str
+    # Set when extraction already succeeded and only the write is outstanding
+    raw_result: Optional[Dict[str, Any]] = None
+    model_version: str = ""
+
+
+def _sources() -> list:
+    return sorted(EXTRACTION_SOURCES, key=lambda cls: cls.priority)
+
+
+def extract_pdf(pdf_path: str) -> Extraction:
+    """The first sufficient result of EXTRACTION_SOURCES, else the last source's result."""
+    result: Dict[str, Any] = {"variants": []}
+    model_version = ""
+    sources = _sources()
+    for source_cls in sources:
+        source = source_cls(pdf_path)
+        result = CarExtractor(source).extract()
+        model_version = source_cls.model_version
+        if source.is_sufficient(result):
+            break
+        if source_cls is not sources[-1]:
+            print(f"[Brochure] {source_cls.__name__} not sufficient, falling back: {Path(pdf_path).name}")
+    return result, model_version
+
+
+def find_cached(pdf_path: Path, checksum: str) -> Optional[Extraction]:
+    """
+    The cached result extract_pdf() would settle on: the first hit its
+    source still finds sufficient, in priority order, else a hit from the
+    last source. A Docling hit below the current DOCLING_MIN_COVERAGE is
+    passed over, so raising the threshold sends those brochures to Gemini.
+    """
+    sources = _sources()
+    for source_cls in sources:
+        cached = get_cached(checksum, source_cls.model_version)
+        if cached is None:
+            continue
+        if source_cls is sources[-1] or source_cls(str(pdf_path)).is_sufficient(cached):
+            return cached, source_cls.model_version
+    return None
+
+
+def empty_counts() -> dict:
+    return {"success": 0, "skipped": 0, "deferred": 0, "failed": 0, "cache_hit": 0, "cache_miss": 0}
+
+
+def _backing_off(pdf_path: Path, item: StageItem, counts: dict) -> None:
+    print(f"[Brochure] Backing off — {item.stage} failed {item.attempts}x "
+          f"({item.last_error}): {pdf_path.name}")
+    counts["deferred"] += 1
+
+
+def plan_jobs(
+    metas: Iterable[Dict[str, Any]],
+    checksums: dict,
+    state: PipelineState,
+    counts: dict,
+    force: bool = False,
+    base_dir: Path = PDF_BASE_DIR,
+) -> list[BrochureJob]:
+    """Hash every downloaded PDF and keep the ones that still need extraction or writing."""
+    jobs = []
+    # Unchanged files (same size, mtime and inode) reuse their cached hash
+    fingerprints = load_fingerprints()
+
+    for meta in metas:
+        pdf_path = Path(meta["file_path"])
+
+        if not pdf_path.exists():
+            print(f"PDF missing on disk: {pdf_path}")
+            counts["failed"] += 1
+            continue
+
+        checksum = file_checksum(pdf_path, fingerprints)
+        file_key = str(pdf_path.relative_to(base_dir))
+
+        stored = checksums.get(file_key)
+        stored_hash = stored.get("checksum") if isinstance(stored, dict) else None
+        already_extracted = stored.get("extracted", False) if isinstance(stored, dict) else False
+
+        # Skip if already successfully extracted
+        if not force and stored_hash == checksum and already_extracted:
+            print(f"[Brochure] Skipping — already extracted: {pdf_path.name}")
+            counts["skipped"] += 1
+            continue
+
+        # New or changed content starts both steps afresh
+        extract_item = state.get(EXTRACT, file_key)
+        if force or extract_item is None or (extract_item.payload or {}).get("checksum") != checksum:
+            state.reset(EXTRACT, file_key, {"checksum": checksum})
+            state.reset(WRITE, file_key, {"checksum": checksum})
+            extract_item = state.get(EXTRACT, file_key)
+
+        assert extract_item is not None
+
+        if extract_item.status == DONE:
+            write_item = state.get(WRITE, file_key)
+            if write_item is not None and write_item.status == DONE:
+                print(f"[Brochure] Skipping — already written: {pdf_path.name}")
+                counts["skipped"] += 1
+            elif write_item is None or state.is_due(write_item):
+                payload = extract_item.payload
+                model_version = payload.get("model_version", LEGACY_MODEL_VERSION)
+                jobs.append(BrochureJob(pdf_path, file_key, checksum, payload["result"], model_version))
+            else:
+                _backing_off(pdf_path, write_item, counts)
+            continue
+
+        # Same bytes, source, prompt and schema as an earlier extraction: no Gemini call
+        cached = None if force else find_cached(pdf_path, checksum)
+        if cached is not None:
+            result, model_version = cached
+            print(f"[Brochure] Using cached {model_version} extraction: {pdf_path.name}")
+            state.mark_done(EXTRACT, file_key, {"checksum": checksum, "result": result, "model_version": model_version})
+            counts["cache_hit"] += 1
+            jobs.append(BrochureJob(pdf_path, file_key, checksum, result, model_version))
+        elif state.is_due(extract_item):
+            jobs.append(BrochureJob(pdf_path, file_key, checksum))
+        else:
+            _backing_off(pdf_path, extract_item, counts)
+
+    return jobs
+
+
+def write_result(
+    job: BrochureJob,
+    raw_result: Dict[str, Any],
+    model_version: str,
+    db: Session,
+    checksums: dict,
+    state: PipelineState,
+    overwrite: bool = False,
+) -> bool:
+    """
+    Record the extraction, then normalize and store its variants. Runs on
+    the writer thread only. `overwrite` replaces stored variant and spec
+    fields instead of only filling gaps (see write_car_payload).
+    """
+    variants = raw_result.get("variants", [])
+    car_brand = raw_result.get("car_brand")
+    car_model = raw_result.get("car_model")
+
+    if not variants:
+        print(f"[Brochure] No variants found: {job.pdf_path.name}")
+        state.mark_failed(EXTRACT, job.file_key, "No variants found")
+        extracted = False
+    else:
+        if job.raw_result is None:
+            put_cached(job.checksum, raw_result, model_version, job.file_key)
+            state.mark_done(EXTRACT, job.file_key,
+                            {"checksum": job.checksum, "result": raw_result, "model_version": model_version})
+
+        try:
+            for variant in variants:
+                normalized = normalize_variant(
+                    variant=variant,
+                    car_brand=car_brand,
+                    car_model=car_model,
+                )
+                if normalized:
+                    write_car_payload(normalized, db, overwrite=overwrite)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            state.mark_failed(WRITE, job.file_key, str(e))
+            raise
+
+        state.mark_done(WRITE, job.file_key, {"checksum": job.checksum})
+        extracted = True
+
+    update_record(
+        checksums=checksums,
+        file_key=job.file_key,
+        checksum=job.checksum,
+        extracted=extracted,
+        model_version=model_version,
+    )
+    return extracted
+
+
+def _write_counted(job: BrochureJob, raw_result: Dict[str, Any], model_version: str, db: Session,
+                   checksums: dict, state: PipelineState, counts: dict, overwrite: bool = False) -> None:
+    try:
+        if write_result(job, raw_result, model_version, db, checksums, state, overwrite):
+            counts["success"] += 1
+            print(f"[Brochure] Completed: {job.pdf_path.name}")
+        else:
+            counts["failed"] += 1
+    except Exception as e:
+        db.rollback()
+        counts["failed"] += 1
+        print(f"[Brochure] Failed: {job.pdf_path.name}: {e}")
+
+
+def run_extraction(
+    metas: Iterable[Dict[str, Any]],
+    db: Session,
+    checksums: dict,
+    state: PipelineState,
+    *,
+    extract: Callable[[str], Extraction] = extract_pdf,
+    workers: int = EXTRACTION_WORKERS,
+    force: bool = False,
+    base_dir: Path = PDF_BASE_DIR,
+) -> dict:
+    """
+    Extract every pending brochure with `workers` threads and write the
+    results as they finish. Returns success / skipped / deferred / failed
+    counts, plus result cache hits and misses (misses are Gemini calls).
+    """
+    counts = empty_counts()
+    jobs = plan_jobs(metas, checksums, state, counts, force=force, base_dir=base_dir)
+
+    if not jobs:
+        return counts
+
+    to_extract = [job for job in jobs if job.raw_result is None]
+    to_write = [job for job in jobs if job.raw_result is not None]
+    counts["cache_miss"] = len(to_extract)
+    workers = max(1, min(workers, len(to_extract) or 1))
+    print(f"[Brochure] Extracting {len(to_extract)} PDFs with {workers} workers, "
+          f"writing {len(to_write)} from earlier extractions")
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="extract") as pool:
+        futures: dict[Future, BrochureJob] = {}
+        for job in to_extract:
+            print(f"[Brochure] Processing: {job.pdf_path.name}")
+            futures[pool.submit(extract, str(job.pdf_path))] = job
+
+        # Stored and cached results are written while the workers run
+        for job in to_write:
+            print(f"[Brochure] Writing stored extraction: {job.pdf_path.name}")
+            _write_counted(job, job.raw_result, job.model_version, db, checksums, state, counts)
+
+        # The calling thread is the only writer; results queue up in completion order
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                raw_result, model_version = future.result()
+            except Exception as e:
+                state.mark_failed(EXTRACT, job.file_key, str(e))
+                counts["failed"] += 1
+                print(f"[Brochure] Failed: {job.pdf_path.name}: {e}")
+                continue
+            _write_counted(job, raw_result, model_version, db, checksums, state, counts)
+
+    return counts
+
+
+def replay_extraction(
+    metas: Iterable[Dict[str, Any]],
+    db: Session,
+    checksums: dict,
+    state: PipelineState,
+    *,
+    base_dir: Path = PDF_BASE_DIR,
+) -> dict:
+    """
+    Normalize and write every downloaded brochure from the result cache,
+    whether or not it was written before. Stored variant and spec fields
+    are overwritten, so a normalizer fix reaches existing rows. Nothing is
+    sent to Gemini; PDFs without a cached result are counted as misses and
+    left alone.
+    """
+    counts = empty_counts()
+    fingerprints = load_fingerprints()
+
+    for meta in metas:
+        pdf_path = Path(meta["file_path"])
+
+        if not pdf_path.exists():
+            print(f"PDF missing on disk: {pdf_path}")
+            counts["failed"] += 1
+            continue
+
+        checksum = file_checksum(pdf_path, fingerprints)
+        file_key = str(pdf_path.relative_to(base_dir))
+
+        cached = find_cached(pdf_path, checksum)
+        if cached is None:
+            print(f"[Replay] No cached extraction: {pdf_path.name}")
+            counts["cache_miss"] += 1
+            continue
+
+        result, model_version = cached
+        counts["cache_hit"] += 1
+        state.mark_done(EXTRACT, file_key, {"checksum": checksum, "result": result, "model_version": model_version})
+        job = BrochureJob(pdf_path, file_key, checksum, result, model_version)
+        _write_counted(job, result, model_version, db, checksums, state, counts, overwrite=True)
+
+    return counts
@@ -4,8 +4,14 @@ Extract Car information from parsed documents.
 from typing import Dict, Any
 
 class ExtractionSource:
+    # Lower runs first; later sources are fallbacks (see extraction.extract_pdf)
     priority: int = 100
+    # Recorded with each result and part of its cache key (see result_cache.py)
+    model_version: str = ""
 
     def extract(self) -> Dict[str, Any]:
         raise NotImplementedError
-    
\ No newline at end of file
+
+    def is_sufficient(self, result: Dict[str, Any]) -> bool:
+        """Whether `result` is good enough to skip the lower-priority sources."""
+        return bool(result.get("variants"))
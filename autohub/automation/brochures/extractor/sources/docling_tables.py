@@ -0,0 +1,201 @@
+"""
+Deterministic spec extraction from Docling's parsed tables.
+
+Most brochures print their variants in clean spec tables. Docling finds
+those tables locally (on the spec-page subset, see spec_pages.py), and
+this source maps their row or column labels onto the BrochureData fields
+without any network call. With priority 0 it runs before
+PDFTextLLMExtractor, which is only asked when these tables cover too few
+fields (coverage() < DOCLING_MIN_COVERAGE).
+"""
+
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from autohub.automation.brochures.downloader.brochure_downloader import parse_download_path
+from autohub.automation.brochures.extractor.base import ExtractionSource
+from autohub.automation.brochures.extractor.sources.pdf_text_llm import VariantSpec
+from autohub.automation.brochures.spec_pages import spec_subset
+from autohub.core.config import DOCLING_MIN_COVERAGE
+
+try:
+    from autohub.automation.brochures.parser.selector import get_parser
+except ImportError:  # optional dependency (docling)
+    get_parser = None
+
+SPEC_FIELDS = [name for name in VariantSpec.model_fields if name != "variant_name"]
+
+# Values of these fields must contain a digit ("Power windows: Yes" is not a power rating)
+NUMERIC_FIELDS = {"engine_capacity", "power", "torque", "mileage", "price"}
+
+# Labels that look like spec fields but are not ("Fuel tank capacity")
+IGNORED_LABELS = re.compile(r"\b(?:tank|boot|luggage|seating|steering|windows?)\b")
+
+# Checked in order: "Engine capacity" is a capacity and "Fuel efficiency" is mileage, not engine / fuel
+FIELD_PATTERNS = [
+    ("variant_name", re.compile(r"\b(?:variants?|trims?|grades?)\b")),
+    ("engine_capacity", re.compile(r"\b(?:displacement|capacity|cubic)\b")),
+    ("mileage", re.compile(r"\b(?:mileage|fuel efficiency|fuel economy|kmpl|km/l)\b")),
+    ("fuel_type", re.compile(r"\bfuel\b")),
+    ("transmission", re.compile(r"\b(?:transmission|gear ?box)\b")),
+    ("power", re.compile(r"\b(?:power|output)\b")),
+    ("torque", re.compile(r"\btorque\b")),
+    ("price", re.compile(r"\b(?:price|ex-showroom)\b")),
+    ("engine", re.compile(r"\b(?:engine|motor)\b")),
+]
+
+EMPTY_VALUES = {"", "-", "–", "—", "na", "n/a", "not applicable"}
+
+# Key for specs of a two-column key/value table, shared by every variant
+SHARED = ""
+
+
+def match_field(label: str) -> Optional[str]:
+    label = label.lower()
+    if IGNORED_LABELS.search(label):
+        return None
+    for field, pattern in FIELD_PATTERNS:
+        if pattern.search(label):
+            return field
+    return None
+
+
+def clean_value(field: str, text: str) -> Optional[str]:
+    value = " ".join(text.split())
+    if value.lower() in EMPTY_VALUES:
+        return None
+    if field in NUMERIC_FIELDS and not any(ch.isdigit() for ch in value):
+        return None
+    return value
+
+
+def table_grid(table: Dict[str, Any]) -> List[List[str]]:
+    """Cell text of a Docling table (export_to_dict form); spanning cells fill every slot they cover."""
+    data = table.get("data") or {}
+    rows, cols = data.get("num_rows", 0), data.get("num_cols", 0)
+    grid = [["" for _ in range(cols)] for _ in range(rows)]
+
+    for cell in data.get("table_cells", []):
+        text = (cell.get("text") or "").strip()
+        for row in range(cell["start_row_offset_idx"], min(cell["end_row_offset_idx"], rows)):
+            for col in range(cell["start_col_offset_idx"], min(cell["end_col_offset_idx"], cols)):
+                grid[row][col] = text
+
+    return grid
+
+
+def variants_from_table(grid: List[List[str]]) -> Dict[str, Dict[str, str]]:
+    """
+    Spec fields per variant name from one table. Labels may run down the
+    first column (variants across) or along the first row (variants down).
+    Tables with fewer than two recognised labels are not spec tables.
+    """
+    if len(grid) < 2 or len(grid[0]) < 2:
+        return {}
+
+    labels_down = sum(match_field(row[0]) in SPEC_FIELDS for row in grid)
+    labels_across = sum(match_field(text) in SPEC_FIELDS for text in grid[0])
+    if max(labels_down, labels_across) < 2:
+        return {}
+    if labels_across > labels_down:
+        grid = [list(column) for column in zip(*grid)]
+
+    # Labels down the first column from here on
+    fields = [match_field(row[0]) for row in grid]
+    # Two columns and no header row: a key/value table that applies to every variant
+    key_value = len(grid[0]) == 2 and fields[0] in SPEC_FIELDS
+    names = [SHARED] if key_value else [" ".join(text.split()) for text in grid[0][1:]]
+    first_row = 0 if key_value else 1
+
+    variants: Dict[str, Dict[str, str]] = {}
+    for col, name in enumerate(names, start=1):
+        if not name and not key_value:
+            continue
+
+        spec = variants.setdefault(name, {})
+        for row, field in zip(grid[first_row:], fields[first_row:]):
+            if field not in SPEC_FIELDS or field in spec:
+                continue
+            value = clean_value(field, row[col])
+            if value:
+                spec[field] = value
+
+    return variants
+
+
+def tables_to_brochure_data(
+    tables: List[Dict[str, Any]],
+    car_brand: Optional[str] = None,
+    car_model: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Merge the spec tables of one brochure into a BrochureData-shaped dict."""
+    merged: Dict[str, Dict[str, str]] = {}
+    for table in tables:
+        for name, spec in variants_from_table(table_grid(table)).items():
+            target = merged.setdefault(name, {})
+            for field, value in spec.items():
+                target.setdefault(field, value)
+
+    shared = merged.pop(SHARED, {})
+    variants = [
+        VariantSpec(variant_name=name, **{**shared, **spec}).model_dump()
+        for name, spec in merged.items()
+    ]
+    return {"car_brand": car_brand, "car_model": car_model, "variants": variants}
+
+
+def coverage(result: Dict[str, Any]) -> float:
+    """Share of spec fields (all but variant_name) filled across the result's variants."""
+    variants = result.get("variants") or []
+    if not variants:
+        return 0.0
+    filled = sum(1 for variant in variants for field in SPEC_FIELDS if variant.get(field))
+    return filled / (len(variants) * len(SPEC_FIELDS))
+
+
+# One Docling converter per worker thread: it loads layout models on construction
+# and is not safe to share, but parses on different threads can run concurrently
+_local = threading.local()
+
+
+def get_docling_parser():
+    parser = getattr(_local, "parser", None)
+    if parser is None:
+        parser = _local.parser = get_parser()
+    return parser
+
+
+class DoclingTableExtractor(ExtractionSource):
+    priority = 0
+    # Bump when the label mapping above changes, so cached table results are re-extracted
+    model_version = "docling-tables-v1"
+
+    def __init__(self, pdf_path: str, car_brand: Optional[str] = None, car_model: Optional[str] = None):
+        self.pdf_path = pdf_path
+        # Tables rarely name the car; the download folder does (Brand/Model/Year/brochure.pdf)
+        brand, model = parse_download_path(Path(pdf_path)) or (None, None)
+        self.car_brand = car_brand or brand
+        self.car_model = car_model or model
+
+    def extract(self) -> Dict[str, Any]:
+        if get_parser is None:
+            print("[Docling] docling is not installed, skipping local table extraction")
+            return {"variants": []}
+
+        parser = get_docling_parser()
+        with spec_subset(self.pdf_path) as parse_path:
+            document = parser.parse(parse_path)
+
+        tables = [block.content for block in document.blocks if block.type == "table"]
+        result = tables_to_brochure_data(tables, self.car_brand, self.car_model)
+        print(f"[Docling] {Path(self.pdf_path).name}: {len(tables)} tables, "
+              f"{len(result['variants'])} variants, coverage {coverage(result):.0%}")
+        return result
+
+    def is_sufficient(self, result: Dict[str, Any]) -> bool:
+        # Without a brand and model the normalizer drops every variant
+        if not result.get("car_brand") or not result.get("car_model"):
+            return False
+        return coverage(result) >= DOCLING_MIN_COVERAGE
@@ -5,8 +5,13 @@ from pydantic import BaseModel
 from google import genai
 from google.genai import types
 
-from autohub.core.config import GEMINI_API_KEY
+from autohub.core.config import GEMINI_API_KEY, GEMINI_BURST, GEMINI_REQUESTS_PER_MINUTE
 from autohub.automation.brochures.extractor.base import ExtractionSource
+from autohub.automation.brochures.spec_pages import spec_subset
+from autohub.automation.rate_limit import TokenBucket
+
+# Shared by every extractor instance, so concurrent workers stay inside the quota
+gemini_limiter = TokenBucket.per_minute(GEMINI_REQUESTS_PER_MINUTE, GEMINI_BURST)
 
 # --- 1. Schema Definition (Simplified) ---
 class VariantSpec(BaseModel):
@@ -25,37 +30,13 @@ class BrochureData(BaseModel):
     car_model: Optional[str] = None
     variants: List[VariantSpec]
 
-# --- 2. Final Gemini Extractor ---
-class PDFTextLLMExtractor(ExtractionSource):
-    priority = 1 
-
-    def __init__(self, pdf_path: str):
-        self.pdf_path = pdf_path
-        self.client = genai.Client(api_key=GEMINI_API_KEY)
-
-    def extract(self) -> Dict[str, Any]:
-        return self._extract_from_file_native()
-
-    def _extract_from_file_native(self) -> Dict[str, Any]:
-        ACTIVE_MODEL = "gemini-2.5-flash" 
-
-        try:
-            print(f"Uploading {self.pdf_path} to Gemini...")
-            uploaded_file = self.client.files.upload(file=self.pdf_path)
-            assert uploaded_file.name is not None
-            file_name = uploaded_file.name
-
-            # Wait for file processing
-            while uploaded_file.state == "PROCESSING":
-                time.sleep(2)
-                uploaded_file = self.client.files.get(name=file_name)
-            
-            # Simplified Prompt focusing on the last 2-3 pages
-            prompt = """
-You are given a full car brochure PDF.
+# --- 2. Model + Prompt (both part of the extraction cache key) ---
+ACTIVE_MODEL = "gemini-2.5-flash"
 
-Focus ONLY on the last 3 pages of the brochure.
-These pages typically contain the technical specification tables.
+# Only the spec pages are uploaded (see spec_pages.py), so the prompt no longer points at page numbers
+EXTRACTION_PROMPT = """
+You are given pages from a car brochure, selected because they are the
+most likely to contain the technical specification tables.
 
 From those pages, extract structured variant-level data.
 
@@ -82,9 +63,45 @@ Return ONLY valid JSON matching the provided schema.
 No markdown. No commentary. No extra text.
 """.strip()
 
+# --- 3. Final Gemini Extractor ---
+class PDFTextLLMExtractor(ExtractionSource):
+    priority = 1 
+    model_version = ACTIVE_MODEL
+
+    def __init__(self, pdf_path: str):
+        self.pdf_path = pdf_path
+        self.client = genai.Client(api_key=GEMINI_API_KEY)
+
+    def extract(self) -> Dict[str, Any]:
+        return self._extract_from_file_native()
+
+    @staticmethod
+    def _throttle() -> None:
+        # Files API calls count against the same quota as generate_content
+        waited = gemini_limiter.acquire()
+        if waited:
+            print(f"[Gemini] Rate limited, waited {waited:.1f}s")
+
+    def _extract_from_file_native(self) -> Dict[str, Any]:
+        try:
+            # Upload only the spec pages: fewer bytes, shorter processing wait, fewer input tokens
+            with spec_subset(self.pdf_path) as upload_path:
+                self._throttle()
+                print(f"Uploading {self.pdf_path} to Gemini...")
+                uploaded_file = self.client.files.upload(file=upload_path)
+            assert uploaded_file.name is not None
+            file_name = uploaded_file.name
+
+            # Wait for file processing
+            while uploaded_file.state == "PROCESSING":
+                time.sleep(2)
+                self._throttle()
+                uploaded_file = self.client.files.get(name=file_name)
+
+            self._throttle()
             response = self.client.models.generate_content(
                 model=ACTIVE_MODEL,
-                contents=[uploaded_file, prompt],
+                contents=[uploaded_file, EXTRACTION_PROMPT],
                 config=types.GenerateContentConfig(
                     temperature=0.0,
                     response_mime_type="application/json",
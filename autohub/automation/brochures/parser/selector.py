@@ -3,7 +3,7 @@ Selecting appropriate parsers for brochures based on their content or source.
 """
 
 from .strategies.generic import GenericDoclingParser
-from base import BaseParser
+from .base import BaseParser
 
 def get_parser(**kwargs) -> BaseParser:
     
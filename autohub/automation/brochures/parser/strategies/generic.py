@@ -1,10 +1,11 @@
+from autohub.automation.brochures.parser.base import BaseParser
 from autohub.automation.brochures.parser.contract import ParsedDocument, ParsedBlock
 from docling.document_converter import DocumentConverter, PdfFormatOption, FormatOption
 from docling.datamodel.pipeline_options import PdfPipelineOptions
 from docling.datamodel.base_models import InputFormat
 
 
-class GenericDoclingParser:
+class GenericDoclingParser(BaseParser):
     def __init__(self):
         pdf_pipeline_options = PdfPipelineOptions(
             do_ocr=False
@@ -43,7 +44,7 @@ class GenericDoclingParser:
                             )
                         )
 
-        # ✅ FALLBACK: tables (optional, future use)
+        # ✅ TABLES (read by the docling_tables extraction source)
         tables = data.get("tables", [])
         if isinstance(tables, list):
             for table in tables:
@@ -1,4 +1,4 @@
-from generic import GenericDoclingParser
+from .generic import GenericDoclingParser
 
 
 class MahindraParser(GenericDoclingParser):
@@ -0,0 +1,74 @@
+"""
+Content-addressed cache of raw extraction results.
+
+A result is keyed by (PDF SHA-256, model version of the source that
+produced it, prompt hash, BrochureData schema hash, spec-page selection
+hash), so it is only reused for the same bytes and the same selected
+pages, read by the same source, asked the same question, for the same
+output shape. Docling table results ("docling-tables-v1") and Gemini
+results ("gemini-2.5-flash") never share a key, and Docling keys carry
+no prompt hash because Docling never sees the prompt. A prompt change
+misses Gemini entries only; a schema or page-selection change
+(SPEC_PAGES_* settings or the scorer in spec_pages.py) misses every
+entry and re-extracts; a normalizer fix or a database
+rebuild replays from the cache (`python -m autohub.automation.pipeline
+--replay`) without calling Gemini.
+
+Stored in the pipeline state store (automation/state.py), one row per key.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from autohub.automation import state
+from autohub.automation.brochures.extractor.sources.pdf_text_llm import (
+    EXTRACTION_PROMPT,
+    BrochureData,
+    PDFTextLLMExtractor,
+)
+from autohub.automation.brochures.spec_pages import SELECTION_HASH
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+
+PROMPT_HASH = _digest(EXTRACTION_PROMPT)
+SCHEMA_HASH = _digest(json.dumps(BrochureData.model_json_schema(), sort_keys=True))
+
+# Prompt of each source that is sent one; other sources (Docling tables) have none
+PROMPT_HASHES = {PDFTextLLMExtractor.model_version: PROMPT_HASH}
+
+
+def cache_key(
+    pdf_sha256: str,
+    model_version: str,
+    schema_hash: str = SCHEMA_HASH,
+    selection_hash: str = SELECTION_HASH,
+) -> str:
+    prompt_hash = PROMPT_HASHES.get(model_version)
+    parts = [pdf_sha256, model_version, *([prompt_hash] if prompt_hash else []), schema_hash, selection_hash]
+    return ":".join(parts)
+
+
+def get_cached(pdf_sha256: str, model_version: str) -> Optional[Dict[str, Any]]:
+    """Raw result for this PDF from `model_version` under the current prompt, schema and page selection, if any."""
+    record = state.shared_state().get_record(state.EXTRACTIONS, cache_key(pdf_sha256, model_version))
+    return record["result"] if isinstance(record, dict) else None
+
+
+def put_cached(pdf_sha256: str, result: Dict[str, Any], model_version: str, file_key: str = "") -> None:
+    state.shared_state().put_record(
+        state.EXTRACTIONS,
+        cache_key(pdf_sha256, model_version),
+        {
+            "pdf_sha256": pdf_sha256,
+            "model": model_version,
+            "prompt_hash": PROMPT_HASHES.get(model_version),
+            "schema_hash": SCHEMA_HASH,
+            "selection_hash": SELECTION_HASH,
+            "file_key": file_key,
+            "result": result,
+        },
+    )
@@ -0,0 +1,130 @@
+"""
+Spec-page subsets of brochure PDFs.
+
+Brochures are mostly full-page photography; the variant tables Gemini
+needs sit on a few pages, usually near the end. Each page's text layer is
+scored by spec density (unit-bearing numbers such as "128.6 kW" or
+"300 Nm", spec headings, bare numbers). The best-scoring pages, or the
+last few when nothing scores (scanned or image-only tables), are written
+to a small temporary PDF, and only that is uploaded.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+import pymupdf
+
+from autohub.core.config import SPEC_PAGE_MIN_SCORE, SPEC_PAGES_FALLBACK, SPEC_PAGES_MAX
+
+UNIT_PATTERN = re.compile(r"\d[\d,.]*\s*(?:kw|nm|rpm|bhp|ps|cc|kmpl|km/l|mm|kg)\b")
+KEYWORD_PATTERN = re.compile(
+    r"\b(?:specifications?|technical|engine|displacement|transmission|torque|power|"
+    r"mileage|fuel|dimensions|wheelbase|kerb|variants?)\b"
+)
+NUMBER_PATTERN = re.compile(r"\d+(?:\.\d+)?")
+
+UNIT_WEIGHT = 3
+KEYWORD_WEIGHT = 2
+NUMBERS_PER_POINT = 10
+
+# Part of the extraction cache key: other settings or patterns select other pages
+SELECTION_HASH = hashlib.sha256(repr((
+    SPEC_PAGES_MAX, SPEC_PAGES_FALLBACK, SPEC_PAGE_MIN_SCORE,
+    UNIT_PATTERN.pattern, KEYWORD_PATTERN.pattern, NUMBER_PATTERN.pattern,
+    UNIT_WEIGHT, KEYWORD_WEIGHT, NUMBERS_PER_POINT,
+)).encode()).hexdigest()[:16]
+
+
+def score_page(text: str) -> float:
+    text = text.lower()
+    return (
+        UNIT_WEIGHT * len(UNIT_PATTERN.findall(text))
+        + KEYWORD_WEIGHT * len(KEYWORD_PATTERN.findall(text))
+        + len(NUMBER_PATTERN.findall(text)) / NUMBERS_PER_POINT
+    )
+
+
+def select_spec_pages(
+    doc: pymupdf.Document,
+    max_pages: int = SPEC_PAGES_MAX,
+    fallback: int = SPEC_PAGES_FALLBACK,
+    min_score: float = SPEC_PAGE_MIN_SCORE,
+) -> List[int]:
+    """Zero-based indexes of the pages to upload, in document order."""
+    scores = [score_page(page.get_text()) for page in doc]
+    ranked = sorted(
+        (index for index, score in enumerate(scores) if score >= min_score),
+        key=lambda index: scores[index],
+        reverse=True,
+    )
+    if ranked:
+        return sorted(ranked[:max_pages])
+
+    return list(range(max(0, len(scores) - fallback), len(scores)))
+
+
+def write_subset(doc: pymupdf.Document, pages: List[int], out_path: str) -> None:
+    # Dropping pages leaves their images unreferenced; garbage=4 removes them from the output
+    doc.select(pages)
+    doc.save(out_path, garbage=4, deflate=True)
+
+
+# PyMuPDF does not support multithreading; extraction workers take turns building subsets
+_pymupdf_lock = threading.Lock()
+
+
+def _build_subset(pdf_path: str) -> Optional[str]:
+    """Write the spec-page subset of `pdf_path` to a temporary PDF; None when it would be the whole file."""
+    try:
+        doc = pymupdf.open(pdf_path)
+    except Exception as e:
+        print(f"[SpecPages] Cannot read {pdf_path}, uploading it whole: {e}")
+        return None
+
+    with doc:
+        total = doc.page_count
+        pages = select_spec_pages(doc)
+        if len(pages) == total:
+            return None
+
+        fd, subset_path = tempfile.mkstemp(prefix="spec-", suffix=".pdf")
+        os.close(fd)
+        try:
+            write_subset(doc, pages, subset_path)
+        except BaseException:
+            os.unlink(subset_path)
+            raise
+
+    print(
+        f"[SpecPages] {Path(pdf_path).name}: pages {', '.join(str(p + 1) for p in pages)} of {total} "
+        f"({os.path.getsize(subset_path) // 1024} KB of {os.path.getsize(pdf_path) // 1024} KB)"
+    )
+    return subset_path
+
+
+@contextmanager
+def spec_subset(pdf_path: str) -> Iterator[str]:
+    """
+    Yield the path to upload for `pdf_path`: a temporary PDF holding only
+    its spec pages, or `pdf_path` itself when every page was selected or
+    the PDF cannot be parsed. The temporary file is removed on exit. Only
+    building the subset is serialised; the caller's parse or upload of it
+    runs unlocked.
+    """
+    with _pymupdf_lock:
+        subset_path = _build_subset(pdf_path)
+
+    if subset_path is None:
+        yield pdf_path
+        return
+
+    try:
+        yield subset_path
+    finally:
+        os.unlink(subset_path)
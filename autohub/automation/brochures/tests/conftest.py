@@ -0,0 +1,17 @@
+import pytest
+
+from autohub.automation import state
+from autohub.automation.brochures import checksum
+from autohub.automation.brochures.downloader import brochure_downloader
+
+
+@pytest.fixture(autouse=True)
+def isolated_state(tmp_path, monkeypatch):
+    """Point the pipeline state store and its legacy JSON files at a temp directory."""
+    monkeypatch.setattr(state, "STATE_FILE", tmp_path / "pipeline_state.db")
+    monkeypatch.setattr(state, "_shared", None)
+    monkeypatch.setattr(checksum, "CHECKSUM_FILE", tmp_path / "checksums.json")
+    monkeypatch.setattr(brochure_downloader, "DISCOVERY_FILE", tmp_path / "mahindra_brochures.json")
+    monkeypatch.setattr(brochure_downloader, "METADATA_FILE", tmp_path / "brochure_download_metadata.json")
+    yield
+    state.shared_state().close()
@@ -0,0 +1,116 @@
+import io
+from types import SimpleNamespace
+
+import requests
+
+from autohub.automation.brochures import checksum
+from autohub.automation.brochures.downloader import brochure_downloader
+from autohub.automation.brochures.downloader.brochure_downloader import download_pdf
+
+URL = "https://example.com/brochure.pdf"
+PDF = b"%PDF-1.7 brochure"
+
+
+def _response(status: int, body: bytes = b"", **headers) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.raw = io.BytesIO(body)
+    response.headers.update({"Content-Type": "application/pdf", **headers})
+    return response
+
+
+def _isolate(tmp_path, monkeypatch):
+    monkeypatch.setattr(brochure_downloader, "PDF_BASE_DIR", tmp_path)
+    return tmp_path / "brochure.pdf"
+
+
+def test_unchanged_brochure_costs_a_304(tmp_path, monkeypatch):
+    save_path = _isolate(tmp_path, monkeypatch)
+    sent = []
+
+    def fake_get(url, headers=None, timeout=None, stream=None):
+        sent.append(headers)
+        if headers.get("If-None-Match") == '"v1"':
+            return _response(304)
+        return _response(200, PDF, ETag='"v1"', **{"Last-Modified": "Tue, 01 Sep 2026 00:00:00 GMT"})
+
+    monkeypatch.setattr(brochure_downloader, "get_session", lambda: SimpleNamespace(get=fake_get))
+
+    assert download_pdf(URL, save_path)["status"] == "success"
+    record = checksum.load_checksums()["brochure.pdf"]
+    assert record["etag"] == '"v1"'
+    assert record["content_length"] == len(PDF)
+
+    result = download_pdf(URL, save_path)
+    assert result == {"status": "skipped", "reason": "Not modified (304)"}
+    assert sent[1] == {"If-None-Match": '"v1"', "If-Modified-Since": "Tue, 01 Sep 2026 00:00:00 GMT"}
+
+    # Validators survive the extraction status update
+    records = checksum.load_checksums()
+    checksum.update_record(records, "brochure.pdf", record["checksum"], extracted=True, model_version="gemini")
+    assert records["brochure.pdf"]["etag"] == '"v1"'
+
+
+def test_head_precheck_without_validators(tmp_path, monkeypatch):
+    save_path = _isolate(tmp_path, monkeypatch)
+    gets = []
+
+    def fake_get(url, headers=None, timeout=None, stream=None):
+        gets.append(headers)
+        return _response(200, PDF)
+
+    def fake_head(url, timeout=None, allow_redirects=None):
+        return _response(200, **{"Content-Length": str(len(PDF))})
+
+    session = SimpleNamespace(get=fake_get, head=fake_head)
+    monkeypatch.setattr(brochure_downloader, "get_session", lambda: session)
+
+    assert download_pdf(URL, save_path)["status"] == "success"
+    assert download_pdf(URL, save_path)["reason"] == "Unchanged (HEAD Content-Length match)"
+    assert len(gets) == 1
+
+    # A different size means a new brochure: fetch it
+    session.head = lambda url, timeout=None, allow_redirects=None: _response(200, **{"Content-Length": "99"})
+    assert download_pdf(URL, save_path)["reason"] == "Checksum match (duplicate file)"
+    assert len(gets) == 2
+
+
+class _DroppedConnection(io.BytesIO):
+    """Body that fails after `limit` bytes, like a connection reset mid-transfer."""
+
+    def __init__(self, body: bytes, limit: int):
+        super().__init__(body)
+        self.limit = limit
+
+    def read(self, size=-1):
+        if self.tell() >= self.limit:
+            raise requests.exceptions.ConnectionError("connection reset")
+        return super().read(min(size, self.limit - self.tell()))
+
+
+def test_interrupted_download_resumes_with_range(tmp_path, monkeypatch):
+    save_path = _isolate(tmp_path, monkeypatch)
+    monkeypatch.setattr(brochure_downloader, "CHUNK_SIZE", 4)
+    body = PDF * 8
+    sent = []
+
+    def fake_get(url, headers=None, timeout=None, stream=None):
+        sent.append(headers)
+        if "Range" in headers:
+            offset = int(headers["Range"].removeprefix("bytes=").rstrip("-"))
+            response = _response(206, body[offset:], ETag='"v1"', **{"Content-Length": str(len(body) - offset)})
+            return response
+        response = _response(200, ETag='"v1"', **{"Content-Length": str(len(body))})
+        response.raw = _DroppedConnection(body, 40)
+        return response
+
+    monkeypatch.setattr(brochure_downloader, "get_session", lambda: SimpleNamespace(get=fake_get))
+
+    result = download_pdf(URL, save_path)
+
+    assert result["status"] == "success"
+    assert sent[1] == {"Range": "bytes=40-", "If-Range": '"v1"'}
+    assert save_path.read_bytes() == body
+    assert result["checksum"] == checksum.calculate_checksum(body)
+    assert checksum.load_checksums()["brochure.pdf"]["content_length"] == len(body)
+    assert not list(tmp_path.glob("*.part*"))
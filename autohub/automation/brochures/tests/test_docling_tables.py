@@ -0,0 +1,173 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from autohub.automation.brochures import extraction, result_cache
+from autohub.automation.brochures.checksum import calculate_checksum
+from autohub.automation.brochures.extractor.base import ExtractionSource
+from autohub.automation.brochures.extractor.sources import docling_tables
+from autohub.automation.brochures.extractor.sources.docling_tables import (
+    DoclingTableExtractor,
+    coverage,
+    tables_to_brochure_data,
+)
+from autohub.automation.brochures.extractor.sources.pdf_text_llm import PDFTextLLMExtractor
+from autohub.automation.brochures.spec_pages import SELECTION_HASH
+from autohub.automation.state import PipelineState
+from autohub.database.connection import Base
+
+
+def docling_table(rows, spans=()):
+    """A table in Docling's export_to_dict shape; `spans` are (row, col, col_span) cells."""
+    spanned = {(row, col): span for row, col, span in spans}
+    cells = []
+    for r, row in enumerate(rows):
+        c = 0
+        for text in row:
+            span = spanned.get((r, c), 1)
+            cells.append({
+                "text": text,
+                "start_row_offset_idx": r,
+                "end_row_offset_idx": r + 1,
+                "start_col_offset_idx": c,
+                "end_col_offset_idx": c + span,
+            })
+            c += span
+    num_cols = max(sum(spanned.get((r, c), 1) for c in range(len(row))) for r, row in enumerate(rows))
+    return {"data": {"num_rows": len(rows), "num_cols": num_cols, "table_cells": cells}}
+
+
+def test_spec_tables_become_brochure_data():
+    # Variants across, labels down; the engine row spans every variant
+    engine = docling_table(
+        [
+            ["Specifications", "AX5", "AX7"],
+            ["Engine", "2.2 L mHawk Diesel"],
+            ["Displacement", "2184 cc", "2184 cc"],
+            ["Max Power", "114 kW @ 3500 rpm", "128.6 kW @ 3500 rpm"],
+            ["Max Torque", "420 Nm", "450 Nm"],
+            ["Fuel tank capacity", "60 L", "60 L"],
+            ["Power steering", "Yes", "Yes"],
+        ],
+        spans=[(1, 1, 2)],
+    )
+    # Variants down, labels across
+    prices = docling_table([
+        ["Variant", "Transmission", "Ex-showroom Price"],
+        ["AX5", "6MT", "16.9 Lakh"],
+        ["AX7", "6AT", "-"],
+    ])
+    # Key/value table shared by every variant
+    shared = docling_table([["Fuel Type", "Diesel"], ["ARAI Mileage", "16.5 kmpl"]])
+    marketing = docling_table([["Colours", "Everest White"], ["Seats", "7"]])
+
+    result = tables_to_brochure_data([engine, prices, shared, marketing], "Mahindra", "XUV700")
+
+    assert result["car_brand"] == "Mahindra"
+    assert result["variants"] == [
+        {
+            "variant_name": "AX5",
+            "engine": "2.2 L mHawk Diesel",
+            "engine_capacity": "2184 cc",
+            "fuel_type": "Diesel",
+            "transmission": "6MT",
+            "power": "114 kW @ 3500 rpm",
+            "torque": "420 Nm",
+            "mileage": "16.5 kmpl",
+            "price": "16.9 Lakh",
+        },
+        {
+            "variant_name": "AX7",
+            "engine": "2.2 L mHawk Diesel",
+            "engine_capacity": "2184 cc",
+            "fuel_type": "Diesel",
+            "transmission": "6AT",
+            "power": "128.6 kW @ 3500 rpm",
+            "torque": "450 Nm",
+            "mileage": "16.5 kmpl",
+            "price": None,
+        },
+    ]
+    assert coverage(result) == 15 / 16
+    assert coverage(tables_to_brochure_data([marketing])) == 0.0
+
+
+def test_llm_runs_only_when_tables_cover_too_little(monkeypatch):
+    calls = []
+
+    def source(name, priority, result, sufficient):
+        class Source(ExtractionSource):
+            def __init__(self, pdf_path):
+                pass
+
+            def extract(self):
+                calls.append(name)
+                return result
+
+            def is_sufficient(self, result):
+                return sufficient
+
+        Source.priority = priority
+        Source.model_version = name
+        return Source
+
+    llm = source("llm", 1, {"variants": [{"variant_name": "AX7"}]}, True)
+
+    monkeypatch.setattr(extraction, "EXTRACTION_SOURCES", [llm, source("tables", 0, {"variants": ["..."]}, True)])
+    assert extraction.extract_pdf("xuv700.pdf") == ({"variants": ["..."]}, "tables")
+    assert calls == ["tables"]
+
+    calls.clear()
+    monkeypatch.setattr(extraction, "EXTRACTION_SOURCES", [llm, source("tables", 0, {"variants": []}, False)])
+    assert extraction.extract_pdf("xuv700.pdf") == ({"variants": [{"variant_name": "AX7"}]}, "llm")
+    assert calls == ["tables", "llm"]
+
+
+def test_docling_results_are_cached_under_their_own_version(tmp_path, monkeypatch):
+    pdf = tmp_path / "xuv700.pdf"
+    pdf.write_bytes(b"%PDF xuv700")
+    metas = [{"file_path": str(pdf), "status": "success"}]
+    # Half the spec fields: enough at the default DOCLING_MIN_COVERAGE
+    tables = {
+        "car_brand": "Mahindra",
+        "car_model": "XUV700",
+        "variants": [{"variant_name": "AX7", "engine": "2.2 L", "engine_capacity": "2184 cc",
+                      "power": "128.6 kW", "torque": "450 Nm"}],
+    }
+    gemini = {**tables, "variants": [{**tables["variants"][0], "price": "21.5 Lakh"}]}
+    calls = []
+
+    def run(result, model_version, name):
+        def fake_extract(pdf_path):
+            calls.append(model_version)
+            return result, model_version
+
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        checksums = {}
+        with Session(engine) as db:
+            counts = extraction.run_extraction(metas, db, checksums, PipelineState(tmp_path / f"{name}.db"),
+                                               extract=fake_extract, base_dir=tmp_path)
+        return counts, checksums["xuv700.pdf"]["model_version"]
+
+    counts, recorded = run(tables, DoclingTableExtractor.model_version, "first")
+    assert recorded == "docling-tables-v1"
+
+    # Reused while the tables still cover enough
+    counts, recorded = run(tables, DoclingTableExtractor.model_version, "second")
+    assert (counts["cache_hit"], recorded, len(calls)) == (1, "docling-tables-v1", 1)
+
+    # A stricter threshold passes over the Docling hit; the Gemini result is cached separately
+    monkeypatch.setattr(docling_tables, "DOCLING_MIN_COVERAGE", 0.9)
+    counts, recorded = run(gemini, PDFTextLLMExtractor.model_version, "third")
+    assert (counts["cache_miss"], recorded, len(calls)) == (1, "gemini-2.5-flash", 2)
+
+    assert extraction.find_cached(pdf, calculate_checksum(pdf.read_bytes())) == (gemini, "gemini-2.5-flash")
+
+
+def test_docling_keys_ignore_the_prompt():
+    gemini = result_cache.cache_key("abc", "gemini-2.5-flash")
+    docling = result_cache.cache_key("abc", "docling-tables-v1")
+    assert result_cache.PROMPT_HASH in gemini.split(":")
+    assert result_cache.PROMPT_HASH not in docling.split(":")
+    assert docling == ":".join(["abc", "docling-tables-v1", result_cache.SCHEMA_HASH, SELECTION_HASH])
+
@@ -0,0 +1,83 @@
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from autohub.automation.brochures import extraction
+from autohub.automation.brochures.extraction import run_extraction
+from autohub.automation.rate_limit import TokenBucket
+from autohub.automation.state import PipelineState
+from autohub.database.connection import Base
+from autohub.database.model import CarVariant
+
+WORKERS = 3
+
+
+def test_extraction_runs_concurrently_with_single_writer(tmp_path, monkeypatch):
+    metas = []
+    for i in range(6):
+        pdf = tmp_path / f"model-{i}.pdf"
+        pdf.write_bytes(f"%PDF brochure {i}".encode())
+        metas.append({"file_path": str(pdf), "status": "success"})
+
+    lock = threading.Lock()
+    in_flight, peak = 0, 0
+    # Each call waits until a full pool of workers is inside; fails (BrokenBarrierError) if they never are
+    all_busy = threading.Barrier(WORKERS, timeout=10)
+
+    def fake_extract(pdf_path):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        all_busy.wait()
+        with lock:
+            in_flight -= 1
+        name = pdf_path.rsplit("-", 1)[-1].removesuffix(".pdf")
+        return {
+            "car_brand": "Mahindra",
+            "car_model": f"Model {name}",
+            "variants": [{"variant_name": "AX7", "power": "128.6 kW @ 3500 rpm", "price": "18.9 Lakh"}],
+        }, "gemini-2.5-flash"
+
+    writer_threads = set()
+    original_write = extraction.write_car_payload
+
+    def recording_write(payload, db, overwrite=False):
+        writer_threads.add(threading.get_ident())
+        original_write(payload, db, overwrite)
+
+    monkeypatch.setattr(extraction, "write_car_payload", recording_write)
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    checksums = {}
+    state = PipelineState(tmp_path / "state.db")
+
+    with Session(engine) as db:
+        counts = run_extraction(metas, db, checksums, state, extract=fake_extract, workers=WORKERS, base_dir=tmp_path)
+
+        assert counts == {"success": 6, "skipped": 0, "deferred": 0, "failed": 0, "cache_hit": 0, "cache_miss": 6}
+        assert db.query(CarVariant).count() == 6
+
+    # Calls overlap, but never more than the pool allows
+    assert peak == WORKERS
+    assert writer_threads == {threading.get_ident()}
+    assert all(record["extracted"] for record in checksums.values())
+
+    # Unchanged brochures are skipped on the next run
+    with Session(engine) as db:
+        counts = run_extraction(metas, db, checksums, state, extract=fake_extract, workers=WORKERS, base_dir=tmp_path)
+    assert counts == {"success": 0, "skipped": 6, "deferred": 0, "failed": 0, "cache_hit": 0, "cache_miss": 0}
+
+
+def test_token_bucket_throttles_after_burst():
+    bucket = TokenBucket(rate=20, burst=2)
+
+    start = time.perf_counter()
+    waits = [bucket.acquire() for _ in range(4)]
+    elapsed = time.perf_counter() - start
+
+    assert waits[:2] == [0.0, 0.0]
+    assert elapsed >= 0.09  # two tokens at 20/s
@@ -1,6 +1,11 @@
 from autohub.automation.normalizer.car_normalizer import normalize_variant
+from autohub.automation.normalizer.backfill import backfill_numeric_fields
+from autohub.automation.normalizer.common import parse_power_kw, parse_price_inr, parse_rpm_band, parse_torque_nm
 from autohub.automation.db_writer.car_writer import write_car_payload
-from autohub.database.connection import session_local
+from autohub.database.connection import Base, session_local
+from autohub.database.model import CarBrand, CarModel, CarSpec, CarVariant
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
 
 raw_result = {
     "car_brand": "Mahindra",
@@ -20,6 +25,47 @@ raw_result = {
     ]
 }
 
+def test_numeric_power_torque():
+    assert parse_power_kw("128.6 kW @ 3500 rpm") == 128.6
+    assert parse_power_kw("175 PS @ 3500 rpm") == 128.71
+    assert parse_power_kw("N/A") is None
+    assert parse_torque_nm("400 Nm @ 1750-2750 rpm") == 400.0
+    assert parse_torque_nm("40.8 kgm") == 400.11
+
+    normalized = normalize_variant(raw_result["variants"][0], "Mahindra", "Thar Roxx")
+    assert normalized["spec"]["power_kw"] == 128.6
+    assert normalized["spec"]["torque_nm"] == 400.0
+    assert normalized["spec"]["power_rpm"] == 3500
+    assert (normalized["spec"]["torque_rpm_min"], normalized["spec"]["torque_rpm_max"]) == (1750, 2750)
+    assert normalized["variant"]["price_inr"] == 1890000
+
+def test_price_and_rpm_parsing():
+    assert parse_price_inr("₹ 18.90 Lakh*") == 1890000
+    assert parse_price_inr("1.2 Cr") == 12000000
+    assert parse_price_inr("Rs. 18,90,000") == 1890000
+    assert parse_price_inr(18.9) == 1890000
+    assert parse_price_inr("N/A") is None
+    assert parse_rpm_band("300 Nm @ 1500 – 3000 r/min") == (1500, 3000)
+    assert parse_rpm_band("175 PS") == (None, None)
+
+def test_backfill_numeric_fields():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+
+    with Session(engine) as db:
+        brand = CarBrand(name="Mahindra")
+        car_model = CarModel(name="Thar Roxx", brand=brand)
+        variant = CarVariant(model=car_model, variant_name="MX5", price=18.9)
+        db.add(CarSpec(variant=variant, power="175 PS @ 3500 rpm", torque="400 Nm @ 1750-2750 rpm"))
+        db.commit()
+
+        assert backfill_numeric_fields(db) == {"specs": 1, "variants": 1}
+        assert backfill_numeric_fields(db) == {"specs": 0, "variants": 0}
+
+        spec = db.query(CarSpec).one()
+        assert (spec.power_kw, spec.power_rpm, spec.torque_rpm_max) == (128.71, 3500, 2750)
+        assert db.query(CarVariant).one().price_inr == 1890000
+
 def run_test():
     db = session_local()
 
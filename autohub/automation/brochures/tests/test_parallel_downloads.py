@@ -0,0 +1,50 @@
+import io
+import threading
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+import requests
+
+from autohub.automation.brochures import checksum
+from autohub.automation.brochures.downloader import brochure_downloader
+from autohub.automation.brochures.downloader.brochure_downloader import KeyedLimiter, iter_downloads
+
+
+def test_downloads_respect_host_limit_and_keep_every_record(tmp_path, monkeypatch):
+    monkeypatch.setattr(brochure_downloader, "PDF_BASE_DIR", tmp_path)
+    monkeypatch.setattr(brochure_downloader, "host_limiter", KeyedLimiter(2))
+
+    in_flight = Counter()
+    peak = Counter()
+    lock = threading.Lock()
+
+    def fake_get(url, headers=None, timeout=None, stream=None):
+        host = url.split("/")[2]
+        with lock:
+            in_flight[host] += 1
+            peak[host] = max(peak[host], in_flight[host])
+        time.sleep(0.05)
+        with lock:
+            in_flight[host] -= 1
+
+        response = requests.Response()
+        response.status_code = 200
+        response.raw = io.BytesIO(f"%PDF {url}".encode())
+        response.headers["Content-Type"] = "application/pdf"
+        return response
+
+    monkeypatch.setattr(brochure_downloader, "get_session", lambda: SimpleNamespace(get=fake_get))
+
+    items = [
+        {"brand": "Mahindra", "model": f"Model {i}", "year": 2026,
+         "brochure_url": f"https://cdn{i % 2}.example.com/model-{i}.pdf"}
+        for i in range(12)
+    ]
+
+    records = [record for _, record in iter_downloads(items, workers=8)]
+
+    assert [record["status"] for record in records] == ["success"] * 12
+    assert peak == {"cdn0.example.com": 2, "cdn1.example.com": 2}
+    # Concurrent workers must not lose each other's checksum updates
+    assert len(checksum.load_checksums()) == 12
@@ -0,0 +1,200 @@
+import json
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from autohub.automation.brochures import checksum, extraction, result_cache
+from autohub.automation.brochures.downloader import brochure_downloader
+from autohub.automation.brochures.utils import iter_downloaded_pdfs
+from autohub.automation.brochures.extraction import replay_extraction, run_extraction
+from autohub.automation.state import (DISCOVER, DONE, DOWNLOAD, EXTRACT, FAILED, PENDING, WRITE,
+                                      PipelineState, retry_delay)
+from autohub.core.config import PIPELINE_MAX_ATTEMPTS
+from autohub.database.connection import Base
+from autohub.database.model import CarVariant
+
+RESULT = {
+    "car_brand": "Mahindra",
+    "car_model": "XUV700",
+    "variants": [{"variant_name": "AX7", "price": "21.5 Lakh"}],
+}
+
+
+def test_runs_resume_and_failures_back_off(tmp_path):
+    state = PipelineState(tmp_path / "state.db")
+
+    run_id, resumed = state.begin_run()
+    assert not resumed
+
+    state.enqueue(DOWNLOAD, "https://example.com/a.pdf", {"model": "A"})
+    state.enqueue(DOWNLOAD, "https://example.com/b.pdf", {"model": "B"})
+    state.mark_done(DOWNLOAD, "https://example.com/a.pdf", {"model": "A", "status": "success"})
+    failed = state.mark_failed(DOWNLOAD, "https://example.com/b.pdf", "timeout")
+
+    assert failed.attempts == 1
+    assert failed.next_attempt_at is not None
+    # Done in this run, and the failure is still backing off
+    assert state.due(DOWNLOAD) == []
+
+    # The process died before finish_run: the next run resumes it
+    state.close()
+    state = PipelineState(tmp_path / "state.db")
+    assert state.begin_run() == (run_id, True)
+    assert state.get(DOWNLOAD, "https://example.com/a.pdf").status == DONE
+
+    # A new run redoes downloads but keeps the failure's backoff
+    state.finish_run(run_id)
+    new_run, resumed = state.begin_run()
+    assert new_run != run_id and not resumed
+    assert state.get(DOWNLOAD, "https://example.com/a.pdf").status == PENDING
+    assert state.get(DOWNLOAD, "https://example.com/b.pdf").status == FAILED
+    assert [item.key for item in state.due(DOWNLOAD)] == ["https://example.com/a.pdf"]
+
+    assert retry_delay(2) == 2 * retry_delay(1)
+
+
+def test_per_run_stages_never_give_up(tmp_path):
+    state = PipelineState(tmp_path / "state.db")
+
+    for _ in range(PIPELINE_MAX_ATTEMPTS + 2):
+        state.mark_failed(DISCOVER, "mahindra", "browser crashed")
+        state.mark_failed(EXTRACT, "xuv700.pdf", "No variants found")
+
+    # Backoff elapsed: discovery is retried, extraction waits for a new checksum
+    state._conn.execute("UPDATE stage_items SET next_attempt_at = 0")
+    assert state.is_due(state.get(DISCOVER, "mahindra"))
+    assert not state.is_due(state.get(EXTRACT, "xuv700.pdf"))
+
+
+def test_failed_write_is_retried_from_stored_extraction(tmp_path, monkeypatch):
+    pdf = tmp_path / "xuv700.pdf"
+    pdf.write_bytes(b"%PDF xuv700")
+    metas = [{"file_path": str(pdf), "status": "success"}]
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    state = PipelineState(tmp_path / "state.db")
+    calls = []
+
+    def fake_extract(pdf_path):
+        calls.append(pdf_path)
+        return RESULT, "gemini-2.5-flash"
+
+    def broken_write(payload, db, overwrite=False):
+        raise RuntimeError("database is locked")
+
+    original_write = extraction.write_car_payload
+    monkeypatch.setattr(extraction, "write_car_payload", broken_write)
+    with Session(engine) as db:
+        counts = run_extraction(metas, db, {}, state, extract=fake_extract, base_dir=tmp_path)
+
+    assert counts["failed"] == 1
+    assert state.get(EXTRACT, "xuv700.pdf").status == DONE
+    assert state.get(WRITE, "xuv700.pdf").last_error == "database is locked"
+
+    # Still backing off: nothing runs
+    monkeypatch.setattr(extraction, "write_car_payload", original_write)
+    with Session(engine) as db:
+        counts = run_extraction(metas, db, {}, state, extract=fake_extract, base_dir=tmp_path)
+    assert counts["deferred"] == 1
+
+    # Once due, only the write is redone — no second extraction
+    state._conn.execute("UPDATE stage_items SET next_attempt_at = 0")
+    with Session(engine) as db:
+        counts = run_extraction(metas, db, {}, state, extract=fake_extract, base_dir=tmp_path)
+        assert db.query(CarVariant).count() == 1
+
+    assert counts["success"] == 1
+    assert len(calls) == 1
+    assert state.get(WRITE, "xuv700.pdf").status == DONE
+
+
+def test_legacy_json_is_imported_into_the_store(tmp_path):
+    checksum.CHECKSUM_FILE.write_text(json.dumps({
+        "Mahindra/XUV700/2026/brochure.pdf": {"checksum": "abc", "extracted": True, "model_version": "gemini"},
+        "old.pdf": "def",
+    }))
+    brochure_downloader.METADATA_FILE.write_text(json.dumps([
+        {"brochure_url": "https://example.com/xuv700.pdf", "file_path": "/pdfs/xuv700.pdf", "status": "success"},
+        {"brochure_url": "https://example.com/thar.pdf", "file_path": "/pdfs/thar.pdf", "status": "failed"},
+    ]))
+    brochure_downloader.DISCOVERY_FILE.write_text(json.dumps([
+        {"brand": "Mahindra", "model": "XUV700", "brochure_url": "https://example.com/xuv700.pdf"},
+    ]))
+
+    records = checksum.load_checksums()
+    assert records["old.pdf"] == "def"
+    assert [meta["file_path"] for meta in iter_downloaded_pdfs()] == ["/pdfs/xuv700.pdf"]
+    assert brochure_downloader.load_discovery_file()[0]["model"] == "XUV700"
+    assert sorted(path.name for path in tmp_path.glob("*.imported")) == [
+        "brochure_download_metadata.json.imported",
+        "checksums.json.imported",
+        "mahindra_brochures.json.imported",
+    ]
+
+    # Single-record updates go straight to the store
+    checksum.update_record({}, "old.pdf", "fed", extracted=False, model_version="")
+    records = checksum.load_checksums()
+    assert records["old.pdf"]["checksum"] == "fed"
+    assert records["Mahindra/XUV700/2026/brochure.pdf"]["extracted"] is True
+
+
+def test_cached_extraction_is_reused_and_replayed(tmp_path):
+    cached_pdf = tmp_path / "xuv700.pdf"
+    cached_pdf.write_bytes(b"%PDF xuv700")
+    new_pdf = tmp_path / "thar.pdf"
+    new_pdf.write_bytes(b"%PDF thar")
+    calls = []
+
+    def fake_extract(pdf_path):
+        calls.append(pdf_path)
+        return RESULT, "gemini-2.5-flash"
+
+    def fresh_db():
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        return Session(engine)
+
+    metas = [{"file_path": str(cached_pdf), "status": "success"}]
+    with fresh_db() as db:
+        run_extraction(metas, db, {}, PipelineState(tmp_path / "first.db"), extract=fake_extract, base_dir=tmp_path)
+
+    # Same bytes in a fresh pipeline state: written from the cache, no Gemini call
+    with fresh_db() as db:
+        counts = run_extraction(metas, db, {}, PipelineState(tmp_path / "second.db"), extract=fake_extract, base_dir=tmp_path)
+        assert db.query(CarVariant).count() == 1
+    assert (counts["success"], counts["cache_hit"], counts["cache_miss"]) == (1, 1, 0)
+    assert len(calls) == 1
+
+    # Replay rebuilds from the cache only; the uncached brochure is a miss
+    metas.append({"file_path": str(new_pdf), "status": "success"})
+    with fresh_db() as db:
+        counts = replay_extraction(metas, db, {}, PipelineState(tmp_path / "replay.db"), base_dir=tmp_path)
+        assert db.query(CarVariant).count() == 1
+    assert (counts["success"], counts["cache_hit"], counts["cache_miss"]) == (1, 1, 1)
+    assert len(calls) == 1
+
+
+def test_replay_overwrites_stale_rows(tmp_path):
+    pdf = tmp_path / "xuv700.pdf"
+    pdf.write_bytes(b"%PDF xuv700")
+    metas = [{"file_path": str(pdf), "status": "success"}]
+    stale = {**RESULT, "variants": [{"variant_name": "AX7", "price": "19 Lakh", "fuel_type": "Petrol",
+                                     "mileage": "99 kmpl"}]}
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        run_extraction(metas, db, {}, PipelineState(tmp_path / "first.db"),
+                       extract=lambda pdf_path: (stale, "gemini-2.5-flash"), base_dir=tmp_path)
+
+    # The cache now holds the corrected result; replay brings the existing row in line
+    sha = checksum.calculate_checksum(pdf.read_bytes())
+    result_cache.put_cached(sha, RESULT, "gemini-2.5-flash")
+    with Session(engine) as db:
+        counts = replay_extraction(metas, db, {}, PipelineState(tmp_path / "replay.db"), base_dir=tmp_path)
+        variant = db.query(CarVariant).one()
+        assert (variant.price, variant.price_inr, variant.fuel_type) == (21.5, 2_150_000, None)
+        assert variant.specs.mileage is None
+
+    assert counts["success"] == 1
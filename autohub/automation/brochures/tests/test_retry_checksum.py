@@ -67,4 +67,29 @@ def test_checksum_duplicate():
         save_checksums(fake_checksum)
 
         loaded = load_checksums()
-        assert loaded["test.pdf"] == fake_checksum["test.pdf"]
\ No newline at end of file
+        assert loaded["test.pdf"] == fake_checksum["test.pdf"]
+
+#Stat fingerprint cache
+def test_file_checksum_trusts_unchanged_stat(tmp_path, monkeypatch):
+    from autohub.automation.brochures import checksum
+
+    pdf = tmp_path / "brochure.pdf"
+    pdf.write_bytes(b"%PDF version 1")
+    fingerprints = checksum.load_fingerprints()
+
+    first = checksum.file_checksum(pdf, fingerprints)
+    assert first == calculate_checksum(b"%PDF version 1")
+
+    # Same size, mtime and inode: no read at all
+    def no_reads(path):
+        raise AssertionError(f"rehashed {path}")
+
+    hash_file = checksum.hash_file
+    monkeypatch.setattr(checksum, "hash_file", no_reads)
+    assert checksum.file_checksum(pdf, checksum.load_fingerprints()) == first
+    assert checksum.file_checksum(pdf) == first
+
+    # New content changes the stat tuple and is hashed again
+    monkeypatch.setattr(checksum, "hash_file", hash_file)
+    pdf.write_bytes(b"%PDF version 22")
+    assert checksum.file_checksum(pdf, fingerprints) == calculate_checksum(b"%PDF version 22")
@@ -0,0 +1,104 @@
+import importlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pymupdf
+
+from autohub.automation.brochures import result_cache, spec_pages
+from autohub.automation.brochures.spec_pages import select_spec_pages, spec_subset
+from autohub.core import config
+
+MARKETING = "Command every road.\nA bold new design, crafted for the explorer in you."
+SPECS = """Technical Specifications
+Engine: 2.2 L mHawk Diesel, Displacement 2184 cc
+Power 128.6 kW @ 3500 rpm   Torque 450 Nm @ 1750-2800 rpm
+Transmission: 6MT / 6AT   Fuel: Diesel
+Wheelbase 2750 mm   Kerb weight 1850 kg
+Variants: AX3, AX5, AX7, AX7 L"""
+
+
+def make_pdf(path, pages):
+    doc = pymupdf.open()
+    for text in pages:
+        doc.new_page().insert_text((72, 72), text)
+    doc.save(path)
+    doc.close()
+
+
+def test_spec_pages_are_selected_and_written_as_subset(tmp_path):
+    pdf = tmp_path / "xuv700.pdf"
+    make_pdf(pdf, [MARKETING] * 12 + [SPECS] + [MARKETING] * 3)
+
+    with pymupdf.open(pdf) as doc:
+        assert select_spec_pages(doc) == [12]
+
+    with spec_subset(str(pdf)) as upload_path:
+        assert upload_path != str(pdf)
+        with pymupdf.open(upload_path) as subset:
+            assert subset.page_count == 1
+            assert "128.6 kW" in subset[0].get_text()
+
+    assert not os.path.exists(upload_path)
+
+
+def test_last_pages_are_the_fallback(tmp_path):
+    pdf = tmp_path / "thar.pdf"
+    make_pdf(pdf, [MARKETING] * 10)
+
+    with pymupdf.open(pdf) as doc:
+        assert select_spec_pages(doc, fallback=3) == [7, 8, 9]
+
+    # Nothing to trim: the original is uploaded
+    short = tmp_path / "short.pdf"
+    make_pdf(short, [MARKETING] * 2)
+    with spec_subset(str(short)) as upload_path:
+        assert upload_path == str(short)
+
+
+def test_page_selection_settings_are_part_of_the_cache_key(monkeypatch):
+    default = spec_pages.SELECTION_HASH
+    assert result_cache.cache_key("abc", "gemini-2.5-flash").endswith(":" + default)
+
+    monkeypatch.setattr(config, "SPEC_PAGES_MAX", config.SPEC_PAGES_MAX + 1)
+    try:
+        changed = importlib.reload(spec_pages).SELECTION_HASH
+    finally:
+        monkeypatch.setattr(config, "SPEC_PAGES_MAX", config.SPEC_PAGES_MAX - 1)
+        importlib.reload(spec_pages)
+
+    assert changed != default
+    assert result_cache.cache_key("abc", "gemini-2.5-flash", selection_hash=changed) != \
+        result_cache.cache_key("abc", "gemini-2.5-flash")
+
+
+def test_subsets_are_built_one_at_a_time(tmp_path, monkeypatch):
+    pdfs = []
+    for i in range(4):
+        pdfs.append(tmp_path / f"model-{i}.pdf")
+        make_pdf(pdfs[-1], [MARKETING] * 6 + [SPECS])
+
+    lock = threading.Lock()
+    in_flight, peak = 0, 0
+    write = spec_pages.write_subset
+
+    def counting_write(doc, pages, out_path):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.05)
+        write(doc, pages, out_path)
+        with lock:
+            in_flight -= 1
+
+    monkeypatch.setattr(spec_pages, "write_subset", counting_write)
+
+    def trimmed(pdf):
+        with spec_pages.spec_subset(str(pdf)) as upload_path:
+            return upload_path != str(pdf)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        assert all(pool.map(trimmed, pdfs))
+    assert peak == 1
@@ -1,22 +1,19 @@
 """
 Shared helper utilities for brochures layer.
 """
-import json
 from typing import Iterator, Dict, Any
 
-from autohub.automation.brochures.downloader.brochure_downloader import METADATA_FILE
+from autohub.automation.brochures.downloader.brochure_downloader import load_download_metadata
 
 def iter_downloaded_pdfs() -> Iterator[Dict[str, Any]]:
-    if not METADATA_FILE.exists():
-        print("Metadata file not found:", METADATA_FILE)
+    data = load_download_metadata()
+    if not data:
+        print("No download metadata stored yet.")
         return
 
-    with METADATA_FILE.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-
     for item in data:
         file_path = item.get("file_path")
         status = item.get("status")
 
         if status in ("success", "skipped") and file_path:
-            yield item
\ No newline at end of file
+            yield item
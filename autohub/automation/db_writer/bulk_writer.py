@@ -0,0 +1,249 @@
+"""
+Bulk catalog ingestion.
+
+Writes a nested brands -> models -> variants -> specs / images payload with
+one multi-row INSERT ... ON CONFLICT DO UPDATE per level, resolving foreign
+keys in memory from RETURNING ids. The caller owns the transaction, so the
+whole payload costs a single commit.
+"""
+
+from typing import Iterator
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, joinedload
+
+from autohub.automation.normalizer.common import spec_numeric_fields, variant_numeric_fields
+from autohub.database.model import CarBrand, CarImage, CarModel, CarSpec, CarVariant
+from autohub.database.search_index import index_entities
+from autohub.database.versioning import BRANDS, IMAGES, MODELS, SPECS, VARIANTS, bump_versions
+from autohub.model.schemas import BulkCatalog
+
+# Keeps each statement under SQLite's bound-parameter limit
+BULK_CHUNK_SIZE = 500
+
+
+def _insert(db: Session, table):
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "sqlite":
+        return sqlite.insert(table)
+    if dialect == "postgresql":
+        return postgresql.insert(table)
+
+    raise RuntimeError(f"Bulk upsert is not supported on {dialect}")
+
+
+def _chunks(rows: list, size: int = BULK_CHUNK_SIZE) -> Iterator[list]:
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def _upsert(db: Session, table, rows: list[dict], keys: list[str], returning: list) -> list:
+    """
+    Insert rows, updating non-key columns on conflict. Incoming NULLs keep
+    the stored value, matching write_car_payload's merge behaviour.
+    """
+    results = []
+
+    for chunk in _chunks(rows):
+        stmt = _insert(db, table).values(chunk)
+        update_cols = [col for col in chunk[0] if col not in keys]
+
+        set_ = {
+            col: func.coalesce(stmt.excluded[col], table.c[col])
+            for col in update_cols
+        } or {keys[0]: stmt.excluded[keys[0]]}  # no-op update so RETURNING sees existing rows
+
+        stmt = stmt.on_conflict_do_update(index_elements=keys, set_=set_).returning(*returning)
+        results.extend(db.execute(stmt).all())
+
+    return results
+
+
+def write_bulk_catalog(payload: BulkCatalog, db: Session) -> dict:
+    items: list[dict] = []
+
+    def record(kind: str, key: str, existed: bool) -> None:
+        items.append({"kind": kind, "key": key, "status": "updated" if existed else "created"})
+
+    # Brand names are unique (BulkCatalog rejects duplicates)
+    brands = {brand.name: brand for brand in payload.brands}
+    if not brands:
+        return {"created": 0, "updated": 0, "skipped": 0, "items": []}
+
+    # Brands
+    existing = set(db.scalars(select(CarBrand.name).where(CarBrand.name.in_(list(brands)))))
+    brand_ids = {
+        name: id_
+        for id_, name in _upsert(
+            db,
+            CarBrand.__table__,
+            [{"name": name} for name in brands],
+            keys=["name"],
+            returning=[CarBrand.id, CarBrand.name],
+        )
+    }
+    for name in brands:
+        record("brand", name, name in existing)
+    # Brand rows hold only a name: existing ones are unchanged
+    new_brands = set(brands) - existing
+
+    # Models
+    models = {
+        (brand_ids[brand.name], car_model.name): (brand.name, car_model)
+        for brand in brands.values()
+        for car_model in brand.models
+    }
+
+    existing = {
+        tuple(row)
+        for row in db.execute(
+            select(CarModel.brand_id, CarModel.name).where(CarModel.brand_id.in_(list(brand_ids.values())))
+        )
+    }
+    model_ids = {}
+    if models:
+        model_ids = {
+            (brand_id, name): id_
+            for id_, brand_id, name in _upsert(
+                db,
+                CarModel.__table__,
+                [
+                    {
+                        "brand_id": brand_id,
+                        "name": name,
+                        "body_type": car_model.body_type,
+                        "launch_date": car_model.launch_date,
+                        "description": car_model.description,
+                    }
+                    for (brand_id, name), (_, car_model) in models.items()
+                ],
+                keys=["name", "brand_id"],
+                returning=[CarModel.id, CarModel.brand_id, CarModel.name],
+            )
+        }
+    for key, (brand_name, car_model) in models.items():
+        record("model", f"{brand_name} / {car_model.name}", key in existing)
+
+    # Variants
+    variants = {
+        (model_ids[key], variant.variant_name): (f"{brand_name} / {car_model.name}", variant)
+        for key, (brand_name, car_model) in models.items()
+        for variant in car_model.variants
+    }
+
+    existing = {
+        tuple(row)
+        for row in db.execute(
+            select(CarVariant.model_id, CarVariant.variant_name)
+            .where(CarVariant.model_id.in_(list(model_ids.values())))
+        )
+    }
+    variant_ids = {}
+    if variants:
+        variant_ids = {
+            (model_id, name): id_
+            for id_, model_id, name in _upsert(
+                db,
+                CarVariant.__table__,
+                [
+                    {
+                        "model_id": model_id,
+                        "variant_name": name,
+                        "fuel_type": variant.fuel_type,
+                        "transmission": variant.transmission,
+                        "price": variant.price,
+                        **variant_numeric_fields(variant.price),
+                    }
+                    for (model_id, name), (_, variant) in variants.items()
+                ],
+                keys=["model_id", "variant_name"],
+                returning=[CarVariant.id, CarVariant.model_id, CarVariant.variant_name],
+            )
+        }
+    for key, (model_key, variant) in variants.items():
+        record("variant", f"{model_key} / {variant.variant_name}", key in existing)
+
+    # Specs
+    specs = {
+        variant_ids[key]: (f"{model_key} / {variant.variant_name}", variant.specs)
+        for key, (model_key, variant) in variants.items()
+        if variant.specs is not None
+    }
+
+    existing = set(db.scalars(select(CarSpec.variant_id).where(CarSpec.variant_id.in_(list(specs)))))
+    if specs:
+        _upsert(
+            db,
+            CarSpec.__table__,
+            [
+                {
+                    "variant_id": variant_id,
+                    **spec.model_dump(),
+                    **spec_numeric_fields(spec.power, spec.torque),
+                }
+                for variant_id, (_, spec) in specs.items()
+            ],
+            keys=["variant_id"],
+            returning=[CarSpec.id],
+        )
+    for variant_id, (variant_key, _) in specs.items():
+        record("spec", variant_key, variant_id in existing)
+
+    # Images: skip known (model_id, image_url) pairs so the summary can report them
+    existing = {
+        tuple(row)
+        for row in db.execute(
+            select(CarImage.model_id, CarImage.image_url)
+            .where(CarImage.model_id.in_(list(model_ids.values())))
+        )
+    }
+    new_images = []
+    for key, (_, car_model) in models.items():
+        model_id = model_ids[key]
+        for image in car_model.images:
+            image_key = (model_id, image.image_url)
+            if image_key in existing:
+                items.append({"kind": "image", "key": image.image_url, "status": "skipped"})
+                continue
+
+            existing.add(image_key)
+            new_images.append({"model_id": model_id, **image.model_dump()})
+            items.append({"kind": "image", "key": image.image_url, "status": "created"})
+
+    for chunk in _chunks(new_images):
+        db.execute(CarImage.__table__.insert(), chunk)
+
+    # Keep full-text search in step with the new rows
+    db.expire_all()
+    index_entities(
+        db,
+        *db.scalars(select(CarBrand).where(CarBrand.id.in_(list(brand_ids.values())))),
+        *db.scalars(
+            select(CarModel)
+            .options(joinedload(CarModel.brand))
+            .where(CarModel.id.in_(list(model_ids.values())))
+        ),
+        *db.scalars(
+            select(CarVariant)
+            .options(joinedload(CarVariant.model).joinedload(CarModel.brand))
+            .where(CarVariant.id.in_(list(variant_ids.values())))
+        ),
+    )
+
+    bump_versions(
+        db,
+        *([BRANDS] if new_brands else []),
+        *([MODELS] if models else []),
+        *([VARIANTS] if variants else []),
+        *([SPECS] if specs else []),
+        *([IMAGES] if new_images else []),
+    )
+
+    return {
+        "created": sum(item["status"] == "created" for item in items),
+        "updated": sum(item["status"] == "updated" for item in items),
+        "skipped": sum(item["status"] == "skipped" for item in items),
+        "items": items,
+    }
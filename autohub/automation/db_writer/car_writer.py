@@ -1,17 +1,29 @@
 from sqlalchemy.orm import Session
 from autohub.database.model import CarBrand, CarModel, CarVariant, CarSpec
+from autohub.database.search_index import index_entities
+from autohub.database.versioning import BRANDS, MODELS, SPECS, VARIANTS, bump_versions
 
-def write_car_payload(payload: dict, db: Session) -> None:
+# Variant columns a payload sets; existing rows keep theirs unless overwritten
+VARIANT_FIELDS = ("fuel_type", "transmission", "price", "price_inr")
+
+
+def write_car_payload(payload: dict, db: Session, overwrite: bool = False) -> None:
     """
     Insert normalized car payload into DB.
-    Safe to re-run
+    Safe to re-run. An existing variant keeps its stored fields and specs
+    only gain values, unless `overwrite` is set: then the payload replaces
+    the variant and spec fields, None included (extraction replay).
     """
 
+    touched = [SPECS]
+
     brand = db.query(CarBrand).filter_by(name=payload["brand"]).first()
     if not brand:
         brand = CarBrand(name=payload["brand"])
         db.add(brand)
         db.flush()
+        index_entities(db, brand)
+        touched.append(BRANDS)
 
     
     model_data = payload["model"]
@@ -29,6 +41,8 @@ def write_car_payload(payload: dict, db: Session) -> None:
         )
         db.add(model)
         db.flush()
+        index_entities(db, model)
+        touched.append(MODELS)
 
     variant_data = payload["variant"]
     variant = (
@@ -42,16 +56,24 @@ def write_car_payload(payload: dict, db: Session) -> None:
             fuel_type=variant_data["fuel_type"],
             transmission=variant_data["transmission"],
             price=variant_data["price"],
+            price_inr=variant_data.get("price_inr"),
         )
         db.add(variant)
         db.flush()
+        index_entities(db, variant)
+        touched.append(VARIANTS)
+    elif overwrite:
+        for key in VARIANT_FIELDS:
+            setattr(variant, key, variant_data.get(key))
+        index_entities(db, variant)
+        touched.append(VARIANTS)
 
 
     spec_data = payload["spec"]
 
     if variant.specs:
         for key, value in spec_data.items():
-            if value is not None:
+            if value is not None or overwrite:
                 setattr(variant.specs, key, value)
     else:
         spec = CarSpec(
@@ -60,4 +82,5 @@ def write_car_payload(payload: dict, db: Session) -> None:
         )
         db.add(spec)
 
+    bump_versions(db, *touched)
     db.commit()
@@ -5,13 +5,14 @@ Dynamically discovers official Mahindra SUV brochure PDFs
 using real browser rendering via Playwright.
 """
 
-import json
 from pathlib import Path
 from typing import List, Dict
 from urllib.parse import urljoin
 
 from playwright.sync_api import sync_playwright
 
+from autohub.automation.brochures.downloader.brochure_downloader import save_discovery_results
+
 BASE_URL = "https://auto.mahindra.com"
 
 CATEGORY_URLS = [
@@ -142,7 +143,6 @@ def discover_mahindra_brochures() -> List[Dict]:
     print("Brochures discovered:", len(discovered))
     return discovered
 
-# SAVE OUTPUT
+# SAVE OUTPUT (pipeline state store; OUTPUT_FILE is only read for the one-off legacy import)
 def save_discovery(data: List[Dict]) -> None:
-    with OUTPUT_FILE.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    save_discovery_results(data)
@@ -0,0 +1,77 @@
+"""
+Streams the full catalog as NDJSON — one JSON document per car model,
+with its brand, variants, specs and images embedded.
+
+Models are read in batches with yield_per and their children with one
+selectin query per batch, so memory stays flat regardless of catalog size.
+
+    python -m autohub.automation.export --output catalog.ndjson
+"""
+
+import argparse
+import sys
+from typing import Callable, Iterator
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from autohub.database.connection import session_local
+from autohub.database.model import CarModel, CarVariant
+from autohub.model.schemas import ModelExport
+
+EXPORT_BATCH_SIZE = 200
+
+
+def iter_catalog_lines(db: Session, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+    stmt = (
+        select(CarModel)
+        .options(
+            joinedload(CarModel.brand),
+            selectinload(CarModel.variants).selectinload(CarVariant.specs),
+            selectinload(CarModel.images),
+        )
+        .order_by(CarModel.brand_id, CarModel.id)
+        .execution_options(yield_per=batch_size)
+    )
+
+    for car_model in db.execute(stmt).scalars():
+        yield ModelExport.model_validate(car_model).model_dump_json().encode() + b"\n"
+
+
+def stream_catalog_ndjson(
+    batch_size: int = EXPORT_BATCH_SIZE,
+    session_factory: Callable[[], Session] = session_local,
+) -> Iterator[bytes]:
+    """
+    Owns its session so it can outlive the request dependency scope
+    while a StreamingResponse is still sending.
+    """
+    db = session_factory()
+    try:
+        yield from iter_catalog_lines(db, batch_size)
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export the AutoHub catalog as NDJSON")
+    parser.add_argument("--output", "-o", help="File to write (default: stdout)")
+    parser.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    count = 0
+
+    try:
+        for line in stream_catalog_ndjson(args.batch_size):
+            out.write(line)
+            count += 1
+    finally:
+        if args.output:
+            out.close()
+
+    print(f"[Export] Wrote {count} models", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
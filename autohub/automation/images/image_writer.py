@@ -1,21 +1,27 @@
 from sqlalchemy.orm import Session
 from autohub.database.model import CarImage
+from autohub.database.versioning import IMAGES, bump_versions
 
 def write_car_images(model_id: int, image_data: dict, db: Session) -> dict:
 
     exterior_count = 0
     interior_count = 0
 
+    # (model_id, image_url) is unique; pending rows aren't flushed yet, so track this batch too
+    seen = set()
+
     for image_type, urls in image_data.items():
 
         for url in urls:
             
-            already_exists = db.query(CarImage).filter(CarImage.model_id == model_id, CarImage.image_url == url).first()
+            already_exists = url in seen or db.query(CarImage).filter(CarImage.model_id == model_id, CarImage.image_url == url).first()
 
             if already_exists:
                 print(f"[ImageWriter] Skipping duplicate image: {url}")
                 continue
 
+            seen.add(url)
+
             image = CarImage(
                 model_id=model_id,
                 image_url=url,
@@ -29,7 +35,10 @@ def write_car_images(model_id: int, image_data: dict, db: Session) -> dict:
             else:
                 interior_count += 1
 
-            
+
+    if exterior_count or interior_count:
+        bump_versions(db, IMAGES)
+
     return {
     "exterior_saved": exterior_count,
     "interior_saved": interior_count,
@@ -0,0 +1,97 @@
+"""
+Recomputes the numeric columns derived at ingest for rows already in the
+database: power_kw / power_rpm / torque_nm / torque_rpm_min / torque_rpm_max
+from the raw spec strings, and price_inr from the variant price.
+
+Rows are read in primary-key batches and only changed rows are written,
+one commit per batch, so it is safe to re-run.
+
+    python -m autohub.automation.normalizer.backfill
+"""
+
+import argparse
+from typing import Callable
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from autohub.automation.normalizer.common import spec_numeric_fields, variant_numeric_fields
+from autohub.database.connection import session_local
+from autohub.database.model import CarSpec, CarVariant
+from autohub.database.versioning import SPECS, VARIANTS, bump_versions
+
+BACKFILL_BATCH_SIZE = 500
+
+
+def _backfill(
+    db: Session,
+    entity,
+    sources: list[str],
+    targets: list[str],
+    derive: Callable[..., dict],
+    version: str,
+    batch_size: int,
+) -> int:
+    """Keyset-scan `entity`, rewriting `targets` = derive(*sources) where they changed."""
+    columns = [getattr(entity, name) for name in ["id", *sources, *targets]]
+    last_id = 0
+    changed = 0
+
+    while True:
+        rows = db.execute(
+            select(*columns).where(entity.id > last_id).order_by(entity.id).limit(batch_size)
+        ).mappings().all()
+        if not rows:
+            return changed
+
+        updates = []
+        for row in rows:
+            derived = derive(*[row[name] for name in sources])
+            if any(row[name] != derived[name] for name in targets):
+                updates.append({"id": row["id"], **derived})
+
+        if updates:
+            db.execute(update(entity), updates)
+            bump_versions(db, version)
+            db.commit()
+            changed += len(updates)
+
+        last_id = rows[-1]["id"]
+
+
+def backfill_numeric_fields(db: Session, batch_size: int = BACKFILL_BATCH_SIZE) -> dict:
+    specs = _backfill(
+        db,
+        CarSpec,
+        sources=["power", "torque"],
+        targets=["power_kw", "power_rpm", "torque_nm", "torque_rpm_min", "torque_rpm_max"],
+        derive=spec_numeric_fields,
+        version=SPECS,
+        batch_size=batch_size,
+    )
+    variants = _backfill(
+        db,
+        CarVariant,
+        sources=["price"],
+        targets=["price_inr"],
+        derive=variant_numeric_fields,
+        version=VARIANTS,
+        batch_size=batch_size,
+    )
+
+    return {"specs": specs, "variants": variants}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill numeric spec and price columns")
+    parser.add_argument("--batch-size", type=int, default=BACKFILL_BATCH_SIZE)
+    args = parser.parse_args()
+
+    with session_local() as db:
+        result = backfill_numeric_fields(db, args.batch_size)
+
+    print(f"[Backfill] Updated {result['specs']} specs, {result['variants']} variants")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 from typing import Dict, Any
-from autohub.automation.normalizer.common import extract_float, clean_text
+from autohub.automation.normalizer.common import extract_float, clean_text, spec_numeric_fields, variant_numeric_fields
 
 def normalize_variant(
     variant: Dict[str, Any],
@@ -28,6 +28,7 @@ def normalize_variant(
             "fuel_type": clean_text(variant.get("fuel_type")),
             "transmission": clean_text(variant.get("transmission")),
             "price": extract_float(variant.get("price")),
+            **variant_numeric_fields(variant.get("price")),
         },
 
         "spec": {
@@ -36,5 +37,6 @@ def normalize_variant(
             "power": clean_text(variant.get("power")),
             "torque": clean_text(variant.get("torque")),
             "mileage": extract_float(variant.get("mileage")),
+            **spec_numeric_fields(variant.get("power"), variant.get("torque")),
         },
     }
\ No newline at end of file
@@ -14,3 +14,95 @@ def clean_text(text: Optional[str]) -> Optional[str]:
         return None
     
     return " ".join(text.strip().split())
+
+
+# Unit factors to the canonical kW / Nm
+POWER_TO_KW = {"kw": 1.0, "ps": 0.73549875, "hp": 0.7457, "bhp": 0.7457}
+TORQUE_TO_NM = {"nm": 1.0, "kgm": 9.80665}
+
+_POWER_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(kw|ps|bhp|hp)\b", re.IGNORECASE)
+_TORQUE_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(nm|kgm)\b", re.IGNORECASE)
+
+def parse_power_kw(text: Optional[str]) -> Optional[float]:
+    """'128.6 kW @ 3500 rpm' -> 128.6, '175 PS' -> 128.71"""
+    if not text:
+        return None
+
+    match = _POWER_RE.search(text.replace(",", ""))
+    if not match:
+        return None
+
+    return round(float(match.group(1)) * POWER_TO_KW[match.group(2).lower()], 2)
+
+def parse_torque_nm(text: Optional[str]) -> Optional[float]:
+    """'400 Nm @ 1750-2750 rpm' -> 400.0"""
+    if not text:
+        return None
+
+    match = _TORQUE_RE.search(text.replace(",", ""))
+    if not match:
+        return None
+
+    return round(float(match.group(1)) * TORQUE_TO_NM[match.group(2).lower()], 2)
+
+_RPM_RE = re.compile(r"(\d+)(?:\s*(?:-|–|~|to)\s*(\d+))?\s*(?:rpm|r/min)\b", re.IGNORECASE)
+
+def parse_rpm_band(text: Optional[str]) -> tuple[Optional[int], Optional[int]]:
+    """'400 Nm @ 1750-2750 rpm' -> (1750, 2750), '@ 3500 rpm' -> (3500, 3500)"""
+    if not text:
+        return None, None
+
+    match = _RPM_RE.search(text.replace(",", ""))
+    if not match:
+        return None, None
+
+    low = int(match.group(1))
+    high = int(match.group(2)) if match.group(2) else low
+    return min(low, high), max(low, high)
+
+
+LAKH = 100_000
+CRORE = 10_000_000
+
+_PRICE_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(lakhs?|lacs?|l|crores?|cr)?\b", re.IGNORECASE)
+
+def parse_price_inr(value: Optional[str | float]) -> Optional[float]:
+    """
+    '₹ 18.90 Lakh*' -> 1890000.0, '1.2 Cr' -> 12000000.0, 'Rs. 18,90,000' -> 1890000.0.
+    Bare figures under 1000 are read as lakh, since no new car costs that
+    little in rupees.
+    """
+    if value is None or value == "":
+        return None
+
+    if isinstance(value, (int, float)):
+        amount, unit = float(value), ""
+    else:
+        match = _PRICE_RE.search(value.replace(",", ""))
+        if not match:
+            return None
+        amount, unit = float(match.group(1)), (match.group(2) or "").lower()
+
+    if unit.startswith("cr"):
+        amount *= CRORE
+    elif unit or amount < 1000:
+        amount *= LAKH
+
+    return round(amount, 2)
+
+def spec_numeric_fields(power: Optional[str], torque: Optional[str]) -> dict:
+    """Numeric columns derived from the raw spec strings."""
+    power_rpm, _ = parse_rpm_band(power)
+    torque_rpm_min, torque_rpm_max = parse_rpm_band(torque)
+
+    return {
+        "power_kw": parse_power_kw(power),
+        "power_rpm": power_rpm,
+        "torque_nm": parse_torque_nm(torque),
+        "torque_rpm_min": torque_rpm_min,
+        "torque_rpm_max": torque_rpm_max,
+    }
+
+def variant_numeric_fields(price: Optional[str | float]) -> dict:
+    """Numeric columns derived from the raw variant price."""
+    return {"price_inr": parse_price_inr(price)}
@@ -1,75 +1,109 @@
 """
 Combined AutoHub pipeline — runs brochure ingestion followed by image fetching.
 This is the single entry point for the full automation pipeline.
+
+Each stage records per-item progress in the pipeline state (automation/state.py),
+so a run that dies halfway is resumed by the next one: finished items are not
+redone, and failed items are retried once their backoff has elapsed.
+
+    python -m autohub.automation.pipeline            # full run
+    python -m autohub.automation.pipeline --replay   # rewrite from cached extractions, no network
 """
 
+import argparse
+
 from autohub.automation.brochures.downloader.brochure_downloader import (
-    run_brochure_downloader,
-    PDF_BASE_DIR,
+    has_discovery,
+    iter_downloads,
+    load_discovery_file,
+    save_download_metadata,
 )
 from autohub.automation.discovery.mahindra import (
     discover_mahindra_brochures,
     save_discovery,
 )
-from autohub.automation.brochures.extractor.sources.pdf_text_llm import (
-    PDFTextLLMExtractor,
-)
-from autohub.automation.normalizer.car_normalizer import normalize_variant
-from autohub.automation.db_writer.car_writer import write_car_payload
-from autohub.automation.brochures.checksum import (
-    calculate_checksum,
-    load_checksums,
-    save_checksums,
-    update_record,
-)
+from autohub.automation.brochures.extraction import empty_counts, replay_extraction, run_extraction
+from autohub.automation.brochures.checksum import load_checksums
 from autohub.automation.brochures.utils import iter_downloaded_pdfs
 from autohub.automation.images.image_fetcher import fetch_car_images
 from autohub.automation.images.image_writer import write_car_images
+from autohub.automation.state import DISCOVER, DOWNLOAD, IMAGES, PipelineState, shared_state, skip_reason
 from autohub.database.connection import session_local
 from autohub.database.model import CarModel, CarBrand
-from pathlib import Path
 from typing import cast
 
 FORCE_REPROCESS = False
 
-def run_full_pipeline():
-    """
-    Runs the complete AutoHub pipeline:
-    1. Discover brochures
-    2. Download PDFs
-    3. Extract specs via Gemini
-    4. Normalize + write to DB
-    5. Fetch car images via SerpApi
-    6. Write images to DB
-    """
+DISCOVERY_SOURCE = "mahindra"
 
-    print("\n" + "="*60)
-    print("AUTOHUB FULL PIPELINE STARTED")
-    print("="*60)
 
-    # Phese 1: Brochure Ingestion Pipeline
-    print("\n[Phase 1] Starting brochure pipeline...")
+def discover_stage(state: PipelineState) -> bool:
+    """Run discovery unless this run already did. Returns whether a discovery file is available."""
+    state.enqueue(DISCOVER, DISCOVERY_SOURCE)
+    item = state.get(DISCOVER, DISCOVERY_SOURCE)
+    assert item is not None
 
-    # STEP 1: Discovery
-    print("\n[Step 1/4] Discovering brochures...")
-    data = discover_mahindra_brochures()
-    save_discovery(data)
-    print(f"Discovered {len(data)} brochures.")
+    if not state.is_due(item):
+        print(f"[Discovery] Skipping — {skip_reason(item)}")
+        return has_discovery()
 
-    # STEP 2: Download
-    print("\n[Step 2/4] Downloading brochures...")
-    run_brochure_downloader()
-    print("Download complete.")
+    try:
+        data = discover_mahindra_brochures()
+        save_discovery(data)
+        state.mark_done(DISCOVER, DISCOVERY_SOURCE, {"count": len(data)})
+        print(f"Discovered {len(data)} brochures.")
+        return True
+    except Exception as e:
+        state.mark_failed(DISCOVER, DISCOVERY_SOURCE, str(e))
+        print(f"[Discovery] Failed: {e}")
+        if has_discovery():
+            print("[Discovery] Using the previous discovery results")
+            return True
+        return False
+
+
+def download_stage(state: PipelineState) -> None:
+    """Download every discovered brochure not yet handled in this run, DOWNLOAD_WORKERS at a time."""
+    results = []
+    due = []
+
+    for entry in load_discovery_file():
+        url = entry.get("brochure_url")
+        if not url:
+            continue
+
+        state.enqueue(DOWNLOAD, url, entry)
+        item = state.get(DOWNLOAD, url)
+        assert item is not None
+
+        if state.is_due(item):
+            due.append(entry)
+        elif isinstance(item.payload, dict) and "status" in item.payload:
+            # Finished earlier in this run, or backing off: keep its last record
+            results.append(item.payload)
+
+    # Transfers run in worker threads; state is only written from this one
+    for entry, record in iter_downloads(due):
+        url = entry["brochure_url"]
+        if record["status"] == "failed":
+            state.mark_failed(DOWNLOAD, url, record.get("reason") or "download failed", record)
+        else:
+            state.mark_done(DOWNLOAD, url, record)
+        results.append(record)
+
+    save_download_metadata(results)
+    print(f"[Download] {state.counts(DOWNLOAD)}")
 
-    # STEP 3 + 4: Extraction + Normalization + DB Write
-    print("\n[Step 3/4] Extracting specs and writing to DB...")
 
+def extract_stage(state: PipelineState, replay: bool = False) -> dict:
+    """
+    Extract and write every downloaded brochure that is not done yet, or
+    with `replay`, rewrite all of them from the extraction cache.
+    """
     checksums = load_checksums()
     db = session_local()
 
-    brochure_success = 0
-    brochure_skipped = 0
-    brochure_failed = 0
+    counts = empty_counts()
 
     try:
         metas = list(iter_downloaded_pdfs())
@@ -78,72 +112,10 @@ def run_full_pipeline():
             print("No downloaded PDFs found.")
         else:
             print(f"Found {len(metas)} PDFs to process.")
-
-            for meta in metas:
-                pdf_path = Path(meta["file_path"])
-
-                if not pdf_path.exists():
-                    print(f"PDF missing on disk: {pdf_path}")
-                    brochure_failed += 1
-                    continue
-
-                pdf_bytes = pdf_path.read_bytes()
-                checksum = calculate_checksum(pdf_bytes)
-                file_key = str(pdf_path.relative_to(PDF_BASE_DIR))
-
-                stored = checksums.get(file_key)
-                stored_hash = stored.get("checksum") if isinstance(stored, dict) else None
-                already_extracted = stored.get("extracted", False) if isinstance(stored, dict) else False
-
-                # Skip if already successfully extracted
-                if not FORCE_REPROCESS and stored_hash == checksum and already_extracted:
-                    print(f"[Brochure] Skipping — already extracted: {pdf_path.name}")
-                    brochure_skipped += 1
-                    continue
-
-                print(f"[Brochure] Processing: {pdf_path.name}")
-
-                extractor = PDFTextLLMExtractor(str(pdf_path))
-                raw_result = extractor.extract()
-
-                variants = raw_result.get("variants", [])
-                car_brand = raw_result.get("car_brand")
-                car_model = raw_result.get("car_model")
-
-                if not variants:
-                    print(f"[Brochure] No variants found: {pdf_path.name}")
-                    update_record(
-                        checksums=checksums,
-                        file_key=file_key,
-                        checksum=checksum,
-                        extracted=False,
-                        model_version="gemini-2.5-flash",
-                    )
-                    save_checksums(checksums)
-                    brochure_failed += 1
-                    continue
-
-                for variant in variants:
-                    normalized = normalize_variant(
-                        variant=variant,
-                        car_brand=car_brand,
-                        car_model=car_model,
-                    )
-                    if normalized:
-                        write_car_payload(normalized, db)
-
-                update_record(
-                    checksums=checksums,
-                    file_key=file_key,
-                    checksum=checksum,
-                    extracted=True,
-                    model_version="gemini-2.5-flash",
-                )
-                save_checksums(checksums)
-                brochure_success += 1
-                print(f"[Brochure] Completed: {pdf_path.name}")
-
-        db.commit()
+            if replay:
+                counts = replay_extraction(metas, db, checksums, state)
+            else:
+                counts = run_extraction(metas, db, checksums, state, force=FORCE_REPROCESS)
 
     except Exception as e:
         db.rollback()
@@ -151,12 +123,11 @@ def run_full_pipeline():
     finally:
         db.close()
 
-    print(f"\n[Phase 1] Done — success: {brochure_success}, skipped: {brochure_skipped}, failed: {brochure_failed}")
+    return counts
 
-    # Phase 2: Image Fetching Pipeline
-
-    print("\n[Phase 2] Starting image pipeline...")
 
+def images_stage(state: PipelineState) -> None:
+    """Fetch and store images for every model not yet handled in this run."""
     db = session_local()
 
     image_total_exterior = 0
@@ -176,6 +147,15 @@ def run_full_pipeline():
                 model_name = cast(str, car_model.name)
                 model_id = cast(int, car_model.id)
 
+                key = str(model_id)
+                state.enqueue(IMAGES, key, {"brand": brand_name, "model": model_name})
+                item = state.get(IMAGES, key)
+                assert item is not None
+
+                if not state.is_due(item):
+                    print(f"[Image] Skipping {brand_name} {model_name} — {skip_reason(item)}")
+                    continue
+
                 print(f"\n[Image] Processing: {brand_name} {model_name}")
 
                 try:
@@ -183,6 +163,7 @@ def run_full_pipeline():
 
                     if not image_data["exterior"] and not image_data["interior"]:
                         print(f"[Image] No images found for {brand_name} {model_name}, skipping.")
+                        state.mark_done(IMAGES, key)
                         continue
 
                     result = write_car_images(
@@ -195,6 +176,7 @@ def run_full_pipeline():
                     interior_saved = result["interior_saved"]
 
                     db.commit()
+                    state.mark_done(IMAGES, key)
 
                     image_total_exterior += exterior_saved
                     image_total_interior += interior_saved
@@ -203,6 +185,7 @@ def run_full_pipeline():
 
                 except Exception as e:
                     db.rollback()
+                    state.mark_failed(IMAGES, key, str(e))
                     image_failed.append(f"{brand_name} {model_name}")
                     print(f"[Image] Failed for {brand_name} {model_name}: {e}")
                     continue
@@ -216,9 +199,95 @@ def run_full_pipeline():
     if image_failed:
         print(f"[Image] Failed models: {', '.join(image_failed)}")
 
+
+def print_extraction_summary(tag: str, counts: dict) -> None:
+    print(f"\n{tag} Done — success: {counts['success']}, skipped: {counts['skipped']}, "
+          f"deferred: {counts['deferred']}, failed: {counts['failed']}")
+    print(f"{tag} Extraction cache — hits: {counts['cache_hit']}, misses: {counts['cache_miss']}")
+
+
+def run_full_pipeline():
+    """
+    Runs the complete AutoHub pipeline:
+    1. Discover brochures
+    2. Download PDFs (DOWNLOAD_WORKERS in parallel, pooled connections)
+    3. Extract specs via Gemini (EXTRACTION_WORKERS in parallel)
+    4. Normalize + write to DB (single writer, as results arrive)
+    5. Fetch car images via SerpApi
+    6. Write images to DB
+    """
+
+    print("\n" + "="*60)
+    print("AUTOHUB FULL PIPELINE STARTED")
+    print("="*60)
+
+    state = shared_state()
+    run_id, resumed = state.begin_run()
+    if resumed:
+        print(f"[Pipeline] Resuming unfinished run #{run_id}")
+
+    # Phese 1: Brochure Ingestion Pipeline
+    print("\n[Phase 1] Starting brochure pipeline...")
+
+    # STEP 1: Discovery
+    print("\n[Step 1/4] Discovering brochures...")
+    if discover_stage(state):
+        # STEP 2: Download
+        print("\n[Step 2/4] Downloading brochures...")
+        download_stage(state)
+        print("Download complete.")
+    else:
+        print("[Discovery] No discovery data — skipping downloads")
+
+    # STEP 3 + 4: Extraction + Normalization + DB Write
+    print("\n[Step 3/4] Extracting specs and writing to DB...")
+    counts = extract_stage(state)
+
+    print_extraction_summary("[Phase 1]", counts)
+
+    # Phase 2: Image Fetching Pipeline
+    print("\n[Phase 2] Starting image pipeline...")
+    images_stage(state)
+
+    state.finish_run(run_id)
+
     print("\n" + "="*60)
     print("AUTOHUB FULL PIPELINE COMPLETED")
     print("="*60)
 
+
+def run_replay():
+    """
+    Normalize and write every downloaded brochure from the extraction cache.
+    No discovery, downloads, Gemini calls or image fetching; use it after a
+    normalizer fix or to rebuild the database.
+    """
+    print("\n" + "="*60)
+    print("AUTOHUB REPLAY STARTED")
+    print("="*60)
+
+    counts = extract_stage(shared_state(), replay=True)
+    print_extraction_summary("[Replay]", counts)
+
+    print("\n" + "="*60)
+    print("AUTOHUB REPLAY COMPLETED")
+    print("="*60)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the AutoHub pipeline")
+    parser.add_argument(
+        "--replay",
+        action="store_true",
+        help="normalize and write from cached extraction results only (no network calls)",
+    )
+    args = parser.parse_args()
+
+    if args.replay:
+        run_replay()
+    else:
+        run_full_pipeline()
+
+
 if __name__ == "__main__":
-    run_full_pipeline()    
\ No newline at end of file
+    main()
@@ -0,0 +1,44 @@
+"""
+Token bucket shared by worker threads that call the same rate-limited API.
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Holds up to `burst` tokens, refilled at `rate` tokens per second.
+
+    acquire() reserves a token even when the bucket is empty and sleeps off
+    the debt outside the lock, so waiting threads are served in arrival order.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, requests: float, burst: int = 1) -> "TokenBucket":
+        return cls(requests / 60.0, burst)
+
+    def acquire(self) -> float:
+        """Take one token, blocking until it is available. Returns seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait:
+            time.sleep(wait)
+        return wait
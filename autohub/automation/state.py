@@ -0,0 +1,357 @@
+"""
+Persistent per-stage state for the automation pipeline.
+
+Each stage (discover, download, extract, write, images) tracks its items
+in a small SQLite file: status (pending / done / failed), attempts, last
+error and when a failed item may be retried. A rerun after a crash only
+picks up what is still pending or due for a retry, and failed items back
+off exponentially across runs instead of being hammered every time.
+
+Runs: begin_run() resumes the last run if it never finished. Otherwise it
+starts a new one and reopens the stages that must be redone every run
+(discovery, downloads, images). Extraction and writes are keyed by file
+and checked against the PDF checksum instead, so unchanged brochures are
+never re-sent to Gemini.
+
+The same file holds the keyed records that used to live in JSON sidecars
+(brochure checksums, download metadata, discovery results), plus the file
+fingerprint cache that lets unchanged PDFs skip rehashing and the
+content-addressed cache of raw extraction results. Each record is
+one row, so updating a brochure is a single-row transaction instead of
+rewriting a whole file. Legacy JSON files are imported on first use and
+renamed to *.imported.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+from autohub.core.config import (
+    PIPELINE_MAX_ATTEMPTS,
+    PIPELINE_RETRY_BASE_SECONDS,
+    PIPELINE_RETRY_MAX_SECONDS,
+)
+
+STATE_FILE = Path(__file__).parent / "pipeline_state.db"
+
+DISCOVER = "discover"
+DOWNLOAD = "download"
+EXTRACT = "extract"
+WRITE = "write"
+IMAGES = "images"
+
+# Redone on every new run; the others are invalidated by content changes
+PER_RUN_STAGES = (DISCOVER, DOWNLOAD, IMAGES)
+
+# Record namespaces
+CHECKSUMS = "checksums"
+DOWNLOADS = "downloads"
+DISCOVERY = "discovery"
+FINGERPRINTS = "fingerprints"
+EXTRACTIONS = "extractions"
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pipeline_runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL,
+    finished_at TEXT
+);
+CREATE TABLE IF NOT EXISTS stage_items (
+    stage TEXT NOT NULL,
+    item_key TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    next_attempt_at REAL,
+    payload TEXT,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (stage, item_key)
+);
+CREATE TABLE IF NOT EXISTS records (
+    namespace TEXT NOT NULL,
+    item_key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (namespace, item_key)
+);
+"""
+
+
+@dataclass(frozen=True)
+class StageItem:
+    stage: str
+    key: str
+    status: str
+    attempts: int
+    last_error: Optional[str]
+    next_attempt_at: Optional[float]
+    payload: Any
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds to wait after the `attempts`-th consecutive failure."""
+    return min(PIPELINE_RETRY_BASE_SECONDS * 2 ** (attempts - 1), PIPELINE_RETRY_MAX_SECONDS)
+
+
+def gave_up(item: StageItem) -> bool:
+    """
+    Failed PIPELINE_MAX_ATTEMPTS times and waiting for its input to change.
+    Per-run stages never give up: discovery, a brochure URL or a model's
+    images have no input that could change, so they keep retrying at the
+    capped backoff instead of staying failed forever.
+    """
+    return (
+        item.status == FAILED
+        and item.stage not in PER_RUN_STAGES
+        and item.attempts >= PIPELINE_MAX_ATTEMPTS
+    )
+
+
+def skip_reason(item: StageItem) -> str:
+    """Why an item that is not due is skipped, for the run log."""
+    if item.status == DONE:
+        return "done in this run"
+    if gave_up(item):
+        return f"gave up after {item.attempts} failures ({item.last_error})"
+    retry_at = datetime.fromtimestamp(item.next_attempt_at or 0, timezone.utc).isoformat(timespec="seconds")
+    return f"failed {item.attempts}x ({item.last_error}), next retry after {retry_at}"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _row_to_item(row: sqlite3.Row) -> StageItem:
+    return StageItem(
+        stage=row["stage"],
+        key=row["item_key"],
+        status=row["status"],
+        attempts=row["attempts"],
+        last_error=row["last_error"],
+        next_attempt_at=row["next_attempt_at"],
+        payload=json.loads(row["payload"]) if row["payload"] is not None else None,
+    )
+
+
+class PipelineState:
+    def __init__(self, path: Path = STATE_FILE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Shared by download worker threads; every use holds the lock
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.RLock()
+        self._imported: set = set()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # Runs
+
+    def begin_run(self, per_run_stages: Iterable[str] = PER_RUN_STAGES) -> tuple[int, bool]:
+        """Return (run_id, resumed). A new run reopens `per_run_stages`."""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT id, finished_at FROM pipeline_runs ORDER BY id DESC LIMIT 1"
+            ).fetchone()
+            if row is not None and row["finished_at"] is None:
+                return row["id"], True
+
+            for stage in per_run_stages:
+                self._conn.execute(
+                    "UPDATE stage_items SET status = ?, updated_at = ? WHERE stage = ? AND status = ?",
+                    (PENDING, _now(), stage, DONE),
+                )
+            cursor = self._conn.execute(
+                "INSERT INTO pipeline_runs (started_at) VALUES (?)", (_now(),)
+            )
+            return int(cursor.lastrowid), False
+
+    def finish_run(self, run_id: int) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE pipeline_runs SET finished_at = ? WHERE id = ?", (_now(), run_id)
+            )
+
+    # Items
+
+    def enqueue(self, stage: str, key: str, payload: Any = None) -> None:
+        """
+        Add a pending item. Existing items keep their status; unfinished ones
+        take the new payload, done ones keep the payload they finished with.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO stage_items (stage, item_key, payload, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (stage, item_key) DO UPDATE SET "
+                "payload = COALESCE(excluded.payload, stage_items.payload) "
+                "WHERE stage_items.status != 'done'",
+                (stage, key, json.dumps(payload) if payload is not None else None, _now()),
+            )
+
+    def get(self, stage: str, key: str) -> Optional[StageItem]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM stage_items WHERE stage = ? AND item_key = ?", (stage, key)
+            ).fetchone()
+        return _row_to_item(row) if row is not None else None
+
+    def items(self, stage: str) -> list[StageItem]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM stage_items WHERE stage = ? ORDER BY item_key", (stage,)
+            ).fetchall()
+        return [_row_to_item(row) for row in rows]
+
+    def is_due(self, item: StageItem, now: Optional[float] = None) -> bool:
+        if item.status == PENDING:
+            return True
+        if item.status == FAILED and not gave_up(item):
+            return item.next_attempt_at is None or item.next_attempt_at <= (now or time.time())
+        return False
+
+    def due(self, stage: str) -> list[StageItem]:
+        """Pending items, plus failed ones whose backoff has elapsed."""
+        now = time.time()
+        return [item for item in self.items(stage) if self.is_due(item, now)]
+
+    def mark_done(self, stage: str, key: str, payload: Any = None) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO stage_items (stage, item_key, status, payload, updated_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (stage, item_key) DO UPDATE SET status = excluded.status, "
+                "attempts = 0, last_error = NULL, next_attempt_at = NULL, "
+                "payload = COALESCE(excluded.payload, stage_items.payload), "
+                "updated_at = excluded.updated_at",
+                (stage, key, DONE, json.dumps(payload) if payload is not None else None, _now()),
+            )
+
+    def mark_failed(self, stage: str, key: str, error: str, payload: Any = None) -> StageItem:
+        with self._lock:
+            item = self.get(stage, key)
+            attempts = (item.attempts if item else 0) + 1
+            next_attempt_at = time.time() + retry_delay(attempts)
+
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO stage_items "
+                    "(stage, item_key, status, attempts, last_error, next_attempt_at, payload, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (stage, item_key) DO UPDATE SET status = excluded.status, "
+                    "attempts = excluded.attempts, last_error = excluded.last_error, "
+                    "next_attempt_at = excluded.next_attempt_at, "
+                    "payload = COALESCE(excluded.payload, stage_items.payload), "
+                    "updated_at = excluded.updated_at",
+                    (stage, key, FAILED, attempts, error, next_attempt_at,
+                     json.dumps(payload) if payload is not None else None, _now()),
+                )
+
+            return self.get(stage, key)  # type: ignore[return-value]
+
+    def reset(self, stage: str, key: str, payload: Any = None) -> None:
+        """Back to a fresh pending item, e.g. when its input changed."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO stage_items (stage, item_key, payload, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (stage, item_key) DO UPDATE SET status = 'pending', attempts = 0, "
+                "last_error = NULL, next_attempt_at = NULL, payload = excluded.payload, "
+                "updated_at = excluded.updated_at",
+                (stage, key, json.dumps(payload) if payload is not None else None, _now()),
+            )
+
+    def counts(self, stage: str) -> dict:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) AS n FROM stage_items WHERE stage = ? GROUP BY status", (stage,)
+            ).fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    # Keyed records
+
+    def get_record(self, namespace: str, key: str) -> Any:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM records WHERE namespace = ? AND item_key = ?", (namespace, key)
+            ).fetchone()
+        return json.loads(row["value"]) if row is not None else None
+
+    def records(self, namespace: str) -> dict:
+        """All records in `namespace`, in the order they were first written."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT item_key, value FROM records WHERE namespace = ? ORDER BY rowid", (namespace,)
+            ).fetchall()
+        return {row["item_key"]: json.loads(row["value"]) for row in rows}
+
+    def put_record(self, namespace: str, key: str, value: Any) -> None:
+        self.put_records(namespace, {key: value})
+
+    def put_records(self, namespace: str, values: dict, replace: bool = False) -> None:
+        """Upsert `values` in one transaction; `replace` drops the namespace's other keys."""
+        now = _now()
+        with self._lock, self._conn:
+            if replace:
+                self._conn.execute("DELETE FROM records WHERE namespace = ?", (namespace,))
+            self._conn.executemany(
+                "INSERT INTO records (namespace, item_key, value, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (namespace, item_key) DO UPDATE SET "
+                "value = excluded.value, updated_at = excluded.updated_at",
+                [(namespace, key, json.dumps(value), now) for key, value in values.items()],
+            )
+
+    def import_json(self, namespace: str, path: Path, to_records: Callable[[Any], dict]) -> int:
+        """
+        One-off import of a legacy JSON file into an empty namespace. The file
+        is renamed to *.imported afterwards; an unreadable one is left alone.
+        """
+        path = Path(path)
+        with self._lock:
+            if (namespace, path) in self._imported:
+                return 0
+            self._imported.add((namespace, path))
+
+            if not path.exists():
+                return 0
+
+            exists = self._conn.execute(
+                "SELECT 1 FROM records WHERE namespace = ? LIMIT 1", (namespace,)
+            ).fetchone()
+            if exists is not None:
+                return 0
+
+            try:
+                values = to_records(json.loads(path.read_text(encoding="utf-8") or "null"))
+            except (ValueError, TypeError, KeyError) as e:
+                print(f"[State] Could not import {path}: {e}")
+                return 0
+
+            self.put_records(namespace, values)
+            path.replace(path.with_name(path.name + ".imported"))
+            print(f"[State] Imported {len(values)} {namespace} records from {path}")
+            return len(values)
+
+
+_shared: Optional[PipelineState] = None
+_shared_lock = threading.Lock()
+
+
+def shared_state() -> PipelineState:
+    """Process-wide store at STATE_FILE, used by the checksum / download / discovery helpers."""
+    global _shared
+    with _shared_lock:
+        if _shared is None or _shared.path != Path(STATE_FILE):
+            _shared = PipelineState(STATE_FILE)
+        return _shared
@@ -0,0 +1,111 @@
+"""
+In-process cache for expensive read responses.
+
+A snapshot is the serialized response body built once per data version,
+kept alongside precompressed gzip / brotli variants. Readers pass the key
+of the data they see (see autohub.database.versioning); a new key rebuilds
+the snapshot, so writes from any process invalidate it.
+"""
+
+import gzip
+import threading
+from dataclasses import dataclass
+from typing import Callable
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    key: str
+    body: bytes
+    gzip_body: bytes
+    brotli_body: bytes | None
+
+    def encoded(self, accept_encoding: str) -> tuple[bytes, str | None]:
+        """Pick the best precompressed body for an Accept-Encoding header."""
+        encoding = preferred_encoding(accept_encoding)
+
+        if encoding == "br" and self.brotli_body is not None:
+            return self.brotli_body, "br"
+        if encoding == "gzip":
+            return self.gzip_body, "gzip"
+
+        return self.body, None
+
+
+def preferred_encoding(accept_encoding: str) -> str | None:
+    """The content coding a snapshot is served in for this Accept-Encoding header."""
+    accepted = _parse_accept_encoding(accept_encoding)
+
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+
+    return None
+
+
+def _parse_accept_encoding(header: str) -> set[str]:
+    accepted = set()
+
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+
+        if q > 0:
+            accepted.add(name.strip().lower())
+
+    return accepted
+
+
+class VersionedSnapshot:
+    """
+    Holds one serialized snapshot and the key it was built for.
+    Concurrent misses build it only once.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot: Snapshot | None = None
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snapshot = None
+
+    def get(self, key: str, build: Callable[[], bytes]) -> Snapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.key == key:
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.key == key:
+                return snapshot
+
+            body = build()
+            snapshot = Snapshot(
+                key=key,
+                body=body,
+                gzip_body=gzip.compress(body, compresslevel=9),
+                brotli_body=brotli.compress(body) if brotli is not None else None,
+            )
+            self._snapshot = snapshot
+
+        return snapshot
+
+
+# Nested /catalog response
+catalog_snapshot = VersionedSnapshot()
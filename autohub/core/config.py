@@ -25,4 +25,57 @@ GEMINI_API_KEY: Final[str] = _gemini_key
 _serpapi_key = os.getenv("SERPAPI_KEY")
 if not _serpapi_key:
     raise RuntimeError("SERPAPI_KEY is not set in .env file")
-SERPAPI_KEY: Final[str] = _serpapi_key
\ No newline at end of file
+SERPAPI_KEY: Final[str] = _serpapi_key
+
+# Opt-in fast path for large read responses: row mappings + orjson encoding
+FAST_JSON_RESPONSES: Final[bool] = os.getenv("FAST_JSON_RESPONSES", "false").lower() in ("1", "true", "yes")
+
+# Cache-Control max-age (seconds) on catalog / news GETs; clients revalidate with ETag after that
+HTTP_CACHE_MAX_AGE: Final[int] = int(os.getenv("HTTP_CACHE_MAX_AGE", "60"))
+
+# Database
+DATABASE_URL: Final[str] = os.getenv("DATABASE_URL", "sqlite:///./autohub.db")
+
+# Connection pool (ignored for in-memory SQLite)
+DB_POOL_SIZE: Final[int] = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW: Final[int] = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_RECYCLE: Final[int] = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+# SQLite tuning, applied on every new connection
+SQLITE_MMAP_SIZE: Final[int] = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE_KB: Final[int] = int(os.getenv("SQLITE_CACHE_SIZE_KB", str(64 * 1024)))
+SQLITE_BUSY_TIMEOUT_MS: Final[int] = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+# Read replicas (comma-separated URLs); reads fall back to DATABASE_URL when empty
+DATABASE_REPLICA_URLS: Final[list[str]] = [
+    url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()
+]
+DB_REPLICA_STRATEGY: Final[str] = os.getenv("DB_REPLICA_STRATEGY", "round_robin")  # or "least_loaded"
+
+# After a write, the same client reads from the primary for this long (replica lag budget)
+READ_YOUR_WRITES_SECONDS: Final[int] = int(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
+# Flag a request as N+1 when one statement shape runs at least this many times
+N_PLUS_ONE_THRESHOLD: Final[int] = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+
+# Brochure extraction: concurrent Gemini round trips, sharing one request budget
+EXTRACTION_WORKERS: Final[int] = int(os.getenv("EXTRACTION_WORKERS", "4"))
+GEMINI_REQUESTS_PER_MINUTE: Final[float] = float(os.getenv("GEMINI_REQUESTS_PER_MINUTE", "10"))
+GEMINI_BURST: Final[int] = int(os.getenv("GEMINI_BURST", "2"))
+
+# Pipeline retries across runs: failed items wait base * 2^(attempts-1) seconds, capped, up to max attempts
+PIPELINE_RETRY_BASE_SECONDS: Final[int] = int(os.getenv("PIPELINE_RETRY_BASE_SECONDS", "900"))
+PIPELINE_RETRY_MAX_SECONDS: Final[int] = int(os.getenv("PIPELINE_RETRY_MAX_SECONDS", "86400"))
+PIPELINE_MAX_ATTEMPTS: Final[int] = int(os.getenv("PIPELINE_MAX_ATTEMPTS", "5"))
+
+# Brochure downloads: concurrent transfers overall, and per host
+DOWNLOAD_WORKERS: Final[int] = int(os.getenv("DOWNLOAD_WORKERS", "8"))
+DOWNLOAD_PER_HOST: Final[int] = int(os.getenv("DOWNLOAD_PER_HOST", "4"))
+
+# Spec-page subsets: upload at most SPEC_PAGES_MAX pages scoring >= SPEC_PAGE_MIN_SCORE, else the last SPEC_PAGES_FALLBACK
+SPEC_PAGES_MAX: Final[int] = int(os.getenv("SPEC_PAGES_MAX", "6"))
+SPEC_PAGES_FALLBACK: Final[int] = int(os.getenv("SPEC_PAGES_FALLBACK", "3"))
+SPEC_PAGE_MIN_SCORE: Final[float] = float(os.getenv("SPEC_PAGE_MIN_SCORE", "12"))
+
+# Local Docling table extraction: share of spec fields it must fill before the Gemini fallback is skipped
+DOCLING_MIN_COVERAGE: Final[float] = float(os.getenv("DOCLING_MIN_COVERAGE", "0.5"))
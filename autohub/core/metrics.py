@@ -0,0 +1,135 @@
+"""
+Minimal Prometheus metrics: labelled counters and histograms rendered in
+the text exposition format (version 0.0.4). Thread-safe; values live in
+process memory, so each worker exposes its own series.
+"""
+
+import threading
+from bisect import bisect_left
+
+# Seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Statements per request
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.label_names = labels
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.label_names, labels)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.label_names = labels
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return series[2] if series else 0
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip((*self.buckets, "+Inf"), counts):
+                    cumulative += bucket_count
+                    le = bound if bound == "+Inf" else _number(bound)
+                    label_text = _labels(self.label_names, labels, f'le="{le}"')
+                    lines.append(f"{self.name}_bucket{label_text} {cumulative}")
+                lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {_number(total)}")
+                lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.register(Counter(
+    "autohub_http_requests_total",
+    "HTTP requests by route and status.",
+    ("method", "route", "status"),
+))
+http_duration = registry.register(Histogram(
+    "autohub_http_request_duration_seconds",
+    "HTTP request latency.",
+    ("method", "route"),
+))
+db_statements = registry.register(Histogram(
+    "autohub_db_statements_per_request",
+    "SQL statements executed per request.",
+    ("method", "route"),
+    buckets=COUNT_BUCKETS,
+))
+db_duration = registry.register(Histogram(
+    "autohub_db_time_per_request_seconds",
+    "Time spent executing SQL per request.",
+    ("method", "route"),
+))
+db_n_plus_one = registry.register(Counter(
+    "autohub_db_n_plus_one_total",
+    "Requests that ran one statement shape at least N_PLUS_ONE_THRESHOLD times.",
+    ("method", "route"),
+))
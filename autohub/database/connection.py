@@ -1,13 +1,101 @@
-from sqlalchemy import create_engine,engine
+from sqlalchemy import create_engine, engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./autohub.db"
+from autohub.core import config
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+SQLALCHEMY_DATABASE_URL = config.DATABASE_URL
+
+# WAL lets API readers keep going while the pipeline writes;
+# NORMAL is durable in WAL mode except for the last commits on power loss.
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    f"mmap_size={config.SQLITE_MMAP_SIZE}",
+    f"cache_size=-{config.SQLITE_CACHE_SIZE_KB}",
+    f"busy_timeout={config.SQLITE_BUSY_TIMEOUT_MS}",
+    "foreign_keys=ON",
+)
+
+# Async drivers for the sync URLs above (both are in requirements.txt).
+# Use postgresql:// URLs; SQLAlchemy 2 rejects the old postgres:// scheme.
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+def to_async_url(url: str) -> str:
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {parsed.drivername}")
+
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def engine_options(url: str) -> dict:
+    """Pool settings for create_engine / create_async_engine."""
+    parsed = make_url(url)
+
+    if is_sqlite(url) and parsed.database in (None, "", ":memory:"):
+        # In-memory databases use a single shared connection
+        return {}
+
+    options = {
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+    }
+    if not is_sqlite(url):
+        options["pool_pre_ping"] = True
+
+    return options
+
+
+def apply_sqlite_pragmas(target: Engine, pragmas: tuple[str, ...] = SQLITE_PRAGMAS) -> None:
+    """Run `pragmas` on every new DBAPI connection of a SQLite engine."""
+
+    @event.listens_for(target, "connect")
+    def _set_pragmas(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
+
+
+def create_engines(url: str):
+    """Sync + async engine pair for one database URL."""
+    sync_engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False} if is_sqlite(url) else {},
+        **engine_options(url),
+    )
+    async_engine = create_async_engine(to_async_url(url), **engine_options(url))
+
+    if is_sqlite(url):
+        apply_sqlite_pragmas(sync_engine)
+        apply_sqlite_pragmas(async_engine.sync_engine)
+
+    return sync_engine, async_engine
+
+
+engine, async_engine = create_engines(SQLALCHEMY_DATABASE_URL)
 
 session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_session_local = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 Base = declarative_base()
 
 def get_db():
@@ -16,3 +104,7 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with async_session_local() as db:
+        yield db
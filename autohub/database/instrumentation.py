@@ -0,0 +1,76 @@
+"""
+Per-request SQL statistics.
+
+Engine-level cursor events record every statement into the RequestStats
+bound to the current context, so sync routes (threadpool), async routes
+(greenlet bridge) and streaming generators all report into the request
+that ran them. Outside a request nothing is recorded.
+"""
+
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Expanded IN lists / VALUES rows collapse so they count as one shape
+_PLACEHOLDER_LIST_RE = re.compile(r"\(\s*(?:\?|%\(\w+\)s|\$\d+)(?:\s*,\s*(?:\?|%\(\w+\)s|\$\d+))*\s*\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    return _PLACEHOLDER_LIST_RE.sub("(?)", _WHITESPACE_RE.sub(" ", statement).strip())
+
+
+@dataclass
+class RequestStats:
+    statements: int = 0
+    seconds: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """SELECT shapes run at least `threshold` times, most frequent first."""
+        return [
+            (shape, count)
+            for shape, count in self.shapes.most_common()
+            if count >= threshold and shape.upper().startswith("SELECT")
+        ]
+
+
+current_stats: ContextVar[RequestStats | None] = ContextVar("current_sql_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_stats.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_stats.get()
+    if stats is None:
+        return
+
+    starts = conn.info.get("query_start")
+    if starts:
+        stats.seconds += time.perf_counter() - starts.pop()
+
+    stats.statements += 1
+    stats.shapes[statement_shape(statement)] += 1
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_start"):
+        connection.info["query_start"].pop()
+
+
+def install_sql_instrumentation() -> None:
+    """Hook every Engine (sync, async, replicas); safe to call more than once."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
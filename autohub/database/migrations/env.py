@@ -0,0 +1,64 @@
+"""
+Alembic environment.
+
+Runs against the app's engine (DATABASE_URL + SQLite pragmas) unless a
+connection is handed in through `config.attributes["connection"]`, which
+is how tests migrate a scratch database.
+"""
+
+from logging.config import fileConfig
+
+from alembic import context
+
+from autohub.core import config as app_config
+from autohub.database import model  # noqa: F401  (registers tables on Base.metadata)
+from autohub.database.connection import Base, engine
+from autohub.database.migrations import include_object
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=app_config.DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        render_as_batch=app_config.DATABASE_URL.startswith("sqlite"),
+        include_object=include_object,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def _run(connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=connection.dialect.name == "sqlite",
+        include_object=include_object,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run(connection)
+        return
+
+    with engine.connect() as connection:
+        _run(connection)
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
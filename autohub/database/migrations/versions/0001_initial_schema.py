@@ -0,0 +1,200 @@
+"""Initial schema, index plan and car_images uniqueness
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+Databases created before migrations existed (via create_all at import) are
+upgraded in place: only missing tables, columns and indexes are created, so
+this revision is safe to run on both empty and existing databases.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FTS_TABLE = "catalog_fts"
+
+TABLES = {
+    "users": lambda: op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("name", sa.String(50), nullable=False),
+        sa.Column("email", sa.String(256), nullable=False),
+        sa.Column("gender", sa.String(10)),
+        sa.Column("location", sa.String(60)),
+        sa.Column("hashed_password", sa.String(200), nullable=False),
+    ),
+    "car_brands": lambda: op.create_table(
+        "car_brands",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("name", sa.String(100), nullable=False, unique=True),
+    ),
+    "car_models": lambda: op.create_table(
+        "car_models",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("brand_id", sa.Integer(), sa.ForeignKey("car_brands.id"), nullable=False),
+        sa.Column("body_type", sa.String(50)),
+        sa.Column("launch_date", sa.String(20)),
+        sa.Column("description", sa.String(500)),
+        sa.UniqueConstraint("name", "brand_id", name="uq_model_brand"),
+    ),
+    "car_variants": lambda: op.create_table(
+        "car_variants",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("model_id", sa.Integer(), sa.ForeignKey("car_models.id"), nullable=False),
+        sa.Column("variant_name", sa.String(120), nullable=False),
+        sa.Column("fuel_type", sa.String(50)),
+        sa.Column("transmission", sa.String(120)),
+        sa.Column("price", sa.Float()),
+        sa.Column("fuel_type_id", sa.Integer()),
+        sa.Column("transmission_id", sa.Integer()),
+        sa.UniqueConstraint("model_id", "variant_name", name="uq_model_variant"),
+    ),
+    "car_specs": lambda: op.create_table(
+        "car_specs",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("variant_id", sa.Integer(), sa.ForeignKey("car_variants.id"), nullable=False, unique=True),
+        sa.Column("engine", sa.String(100)),
+        sa.Column("engine_capacity", sa.Float()),
+        sa.Column("power", sa.String(50)),
+        sa.Column("torque", sa.String(50)),
+        sa.Column("mileage", sa.Float()),
+        sa.Column("power_kw", sa.Float()),
+        sa.Column("torque_nm", sa.Float()),
+    ),
+    "car_images": lambda: op.create_table(
+        "car_images",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("image_url", sa.String(300), nullable=False),
+        sa.Column("model_id", sa.Integer(), sa.ForeignKey("car_models.id"), nullable=False),
+        sa.Column("image_type", sa.String(20)),
+    ),
+    "news": lambda: op.create_table(
+        "news",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("title", sa.String(200), nullable=False),
+        sa.Column("content", sa.String(2000), nullable=False),
+        sa.Column("published_at", sa.String(30), nullable=False),
+    ),
+    "news_images": lambda: op.create_table(
+        "news_images",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("image_url", sa.String(300), nullable=False),
+        sa.Column("news_id", sa.Integer(), sa.ForeignKey("news.id"), nullable=False),
+    ),
+    "data_versions": lambda: op.create_table(
+        "data_versions",
+        sa.Column("entity", sa.String(30), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    ),
+}
+
+# Columns added to existing tables after they were first created
+LATE_COLUMNS = {
+    "car_images": [sa.Column("image_type", sa.String(20))],
+    "car_specs": [sa.Column("power_kw", sa.Float()), sa.Column("torque_nm", sa.Float())],
+}
+
+# (name, table, columns, unique)
+INDEXES = [
+    ("ix_users_id", "users", ["id"], False),
+    ("ix_users_email", "users", ["email"], True),
+    ("ix_car_models_brand_id", "car_models", ["brand_id"], False),
+    ("ix_car_variants_model_id", "car_variants", ["model_id"], False),
+    ("ix_car_variants_fuel_type_price", "car_variants", ["fuel_type", "price"], False),
+    ("ix_car_variants_transmission_price", "car_variants", ["transmission", "price"], False),
+    ("ix_car_variants_price", "car_variants", ["price"], False),
+    ("ix_car_specs_engine_capacity", "car_specs", ["engine_capacity", "variant_id"], False),
+    ("ix_car_specs_mileage", "car_specs", ["mileage", "variant_id"], False),
+    ("ix_car_images_image_type", "car_images", ["image_type"], False),
+    ("uq_car_images_model_id_image_url", "car_images", ["model_id", "image_url"], True),
+    ("ix_news_images_news_id", "news_images", ["news_id"], False),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+
+    for name, create in TABLES.items():
+        if name not in existing_tables:
+            create()
+
+    for table, columns in LATE_COLUMNS.items():
+        if table not in existing_tables:
+            continue
+        present = {column["name"] for column in inspector.get_columns(table)}
+        for column in columns:
+            if column.name not in present:
+                op.add_column(table, column)
+
+    # write_car_images used to insert repeated URLs from one batch
+    op.execute(
+        "DELETE FROM car_images WHERE id NOT IN "
+        "(SELECT keep_id FROM (SELECT MIN(id) AS keep_id FROM car_images GROUP BY model_id, image_url) AS keep)"
+    )
+
+    inspector = sa.inspect(bind)
+    for name, table, columns, unique in INDEXES:
+        present = {index["name"] for index in inspector.get_indexes(table)}
+        if name not in present:
+            op.create_index(name, table, columns, unique=unique)
+
+    # Superseded by uq_car_images_model_id_image_url (model_id is its leading column)
+    if "ix_car_images_model_id" in {index["name"] for index in inspector.get_indexes("car_images")}:
+        op.drop_index("ix_car_images_model_id", table_name="car_images")
+
+    if bind.dialect.name == "sqlite":
+        _create_search_index(bind)
+
+
+def _create_search_index(bind) -> None:
+    """Same layout as autohub.database.search_index: rowid = id * 4 + kind."""
+    exists = bind.execute(
+        sa.text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": FTS_TABLE},
+    ).first()
+    if exists:
+        return
+
+    op.execute(
+        f"CREATE VIRTUAL TABLE {FTS_TABLE} "
+        "USING fts5(name, context, description, tokenize='trigram')"
+    )
+    op.execute(
+        f"INSERT INTO {FTS_TABLE} (rowid, name, context, description) "
+        "SELECT id * 4 + 1, name, '', '' FROM car_brands"
+    )
+    op.execute(
+        f"INSERT INTO {FTS_TABLE} (rowid, name, context, description) "
+        "SELECT m.id * 4 + 2, m.name, b.name, COALESCE(m.description, '') "
+        "FROM car_models m JOIN car_brands b ON b.id = m.brand_id"
+    )
+    op.execute(
+        f"INSERT INTO {FTS_TABLE} (rowid, name, context, description) "
+        "SELECT v.id * 4 + 3, v.variant_name, b.name || ' ' || m.name, '' "
+        "FROM car_variants v "
+        "JOIN car_models m ON m.id = v.model_id "
+        "JOIN car_brands b ON b.id = m.brand_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+    for name in reversed(list(TABLES)):
+        op.drop_table(name)
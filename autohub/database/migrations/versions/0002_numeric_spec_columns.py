@@ -0,0 +1,63 @@
+"""Numeric power / torque rpm and canonical price columns
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+Existing rows stay NULL until `python -m autohub.automation.normalizer.backfill`
+runs. Search now filters and sorts on price_inr, so the raw-price indexes are
+replaced.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("car_specs") as batch:
+        batch.add_column(sa.Column("power_rpm", sa.Integer()))
+        batch.add_column(sa.Column("torque_rpm_min", sa.Integer()))
+        batch.add_column(sa.Column("torque_rpm_max", sa.Integer()))
+
+    with op.batch_alter_table("car_variants") as batch:
+        batch.add_column(sa.Column("price_inr", sa.Float()))
+
+    op.drop_index("ix_car_variants_fuel_type_price", table_name="car_variants")
+    op.drop_index("ix_car_variants_transmission_price", table_name="car_variants")
+    op.drop_index("ix_car_variants_price", table_name="car_variants")
+
+    op.create_index("ix_car_variants_fuel_type_price_inr", "car_variants", ["fuel_type", "price_inr"])
+    op.create_index("ix_car_variants_transmission_price_inr", "car_variants", ["transmission", "price_inr"])
+    op.create_index("ix_car_variants_price_inr", "car_variants", ["price_inr"])
+    op.create_index("ix_car_specs_power_kw", "car_specs", ["power_kw", "variant_id"])
+    op.create_index("ix_car_specs_torque_nm", "car_specs", ["torque_nm", "variant_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_car_specs_torque_nm", table_name="car_specs")
+    op.drop_index("ix_car_specs_power_kw", table_name="car_specs")
+    op.drop_index("ix_car_variants_price_inr", table_name="car_variants")
+    op.drop_index("ix_car_variants_transmission_price_inr", table_name="car_variants")
+    op.drop_index("ix_car_variants_fuel_type_price_inr", table_name="car_variants")
+
+    op.create_index("ix_car_variants_price", "car_variants", ["price"])
+    op.create_index("ix_car_variants_transmission_price", "car_variants", ["transmission", "price"])
+    op.create_index("ix_car_variants_fuel_type_price", "car_variants", ["fuel_type", "price"])
+
+    with op.batch_alter_table("car_variants") as batch:
+        batch.drop_column("price_inr")
+
+    with op.batch_alter_table("car_specs") as batch:
+        batch.drop_column("torque_rpm_max")
+        batch.drop_column("torque_rpm_min")
+        batch.drop_column("power_rpm")
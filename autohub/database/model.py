@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Float, Integer, String, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, DateTime, Float, Index, Integer, String, ForeignKey, UniqueConstraint
 from autohub.database.connection import Base
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
@@ -39,7 +39,7 @@ class CarModel(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
 
     name = Column(String(100), nullable=False)
-    brand_id = Column(Integer, ForeignKey("car_brands.id"), nullable=False)
+    brand_id = Column(Integer, ForeignKey("car_brands.id"), nullable=False, index=True)
 
     body_type = Column(String(50))
     launch_date = Column(String(20))
@@ -69,7 +69,7 @@ class CarVariant(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
 
-    model_id = Column(Integer, ForeignKey("car_models.id"), nullable=False)
+    model_id = Column(Integer, ForeignKey("car_models.id"), nullable=False, index=True)
 
     variant_name = Column(String(120), nullable=False)
 
@@ -78,6 +78,9 @@ class CarVariant(Base):
     transmission = Column(String(120))
     price = Column(Float)
 
+    # Canonical rupee price parsed at ingest (lakh / crore resolved)
+    price_inr = Column(Float)
+
     # Future lookup tables (not used yet)
     fuel_type_id = Column(Integer, nullable=True)
     transmission_id = Column(Integer, nullable=True)
@@ -93,6 +96,10 @@ class CarVariant(Base):
 
     __table_args__ = (
         UniqueConstraint("model_id", "variant_name", name="uq_model_variant"),
+        # Faceted search: equality on the category, range/sort on price
+        Index("ix_car_variants_fuel_type_price_inr", "fuel_type", "price_inr"),
+        Index("ix_car_variants_transmission_price_inr", "transmission", "price_inr"),
+        Index("ix_car_variants_price_inr", "price_inr"),
     )
 
 
@@ -114,8 +121,22 @@ class CarSpec(Base):
     torque = Column(String(50))
     mileage = Column(Float)
 
+    # Parsed from power / torque at ingest
+    power_kw = Column(Float)
+    power_rpm = Column(Integer)
+    torque_nm = Column(Float)
+    torque_rpm_min = Column(Integer)
+    torque_rpm_max = Column(Integer)
+
     variant = relationship("CarVariant", back_populates="specs")
 
+    __table_args__ = (
+        Index("ix_car_specs_engine_capacity", "engine_capacity", "variant_id"),
+        Index("ix_car_specs_mileage", "mileage", "variant_id"),
+        Index("ix_car_specs_power_kw", "power_kw", "variant_id"),
+        Index("ix_car_specs_torque_nm", "torque_nm", "variant_id"),
+    )
+
 
 class CarImage(Base):
     __tablename__ = "car_images"
@@ -124,10 +145,15 @@ class CarImage(Base):
 
     image_url = Column(String(300), nullable=False)
     model_id = Column(Integer, ForeignKey("car_models.id"), nullable=False)
-    image_type = Column(String(20), nullable=True)
+    image_type = Column(String(20), nullable=True, index=True)
 
     model = relationship("CarModel", back_populates="images")
 
+    __table_args__ = (
+        # Also serves lookups by model_id alone
+        Index("uq_car_images_model_id_image_url", "model_id", "image_url", unique=True),
+    )
+
 
 class News(Base):
     __tablename__ = "news"
@@ -149,6 +175,15 @@ class NewsImage(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     image_url = Column(String(300), nullable=False)
-    news_id = Column(Integer, ForeignKey("news.id"), nullable=False)
+    news_id = Column(Integer, ForeignKey("news.id"), nullable=False, index=True)
 
     news = relationship("News", back_populates="news_images")
+
+
+class DataVersion(Base):
+    """One row per entity type, bumped in the same transaction as every write."""
+    __tablename__ = "data_versions"
+
+    entity = Column(String(30), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False)
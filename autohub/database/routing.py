@@ -0,0 +1,142 @@
+"""
+Read / write session routing.
+
+Mutations and the pipeline use the primary (get_write_db). Reads go to a
+read replica from DATABASE_REPLICA_URLS (get_read_db), chosen round-robin
+or by fewest checked-out connections. With no replicas configured, reads
+use the primary.
+
+Each request reads from one replica: it is picked on first use and kept
+on request.state, so the validator query (data_versions) and the rows of
+the body come from the same replica and a lagging one cannot pair new
+versions with old rows.
+
+Read-your-writes: once a write session commits, the rest of that request
+reads from the primary, and so does the same client for
+READ_YOUR_WRITES_SECONDS afterwards, tracked with a cookie.
+"""
+
+import itertools
+import math
+import time
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from autohub.core import config
+from autohub.database.connection import (async_session_local, create_engines,
+                                         session_local)
+
+STICKY_COOKIE = "autohub_primary_until"
+
+
+class ReplicaPool:
+    """Engine pairs for the read replicas and the strategy to pick one."""
+
+    def __init__(self, engines: list, strategy: str = "round_robin"):
+        if strategy not in ("round_robin", "least_loaded"):
+            raise ValueError(f"Unknown replica strategy: {strategy}")
+
+        self.engines = engines
+        self.strategy = strategy
+        self._counter = itertools.count()
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def pick(self) -> tuple:
+        """(sync_engine, async_engine) of one replica."""
+        if self.strategy == "least_loaded":
+            return min(self.engines, key=lambda pair: sum(_checked_out(engine) for engine in pair))
+        return self.engines[next(self._counter) % len(self.engines)]
+
+
+def _checked_out(target) -> int:
+    if target is None:
+        return 0
+    pool = getattr(target, "sync_engine", target).pool
+    checkedout = getattr(pool, "checkedout", None)
+    return checkedout() if checkedout else 0
+
+
+replicas = ReplicaPool(
+    [create_engines(url) for url in config.DATABASE_REPLICA_URLS],
+    config.DB_REPLICA_STRATEGY,
+)
+
+
+# Stickiness
+
+def reads_primary(request: Request) -> bool:
+    if getattr(request.state, "wrote", False):
+        return True
+
+    try:
+        return float(request.cookies.get(STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def _mark_written(request: Request, response: Response) -> None:
+    request.state.wrote = True
+
+    if replicas:
+        seconds = config.READ_YOUR_WRITES_SECONDS
+        response.set_cookie(
+            STICKY_COOKIE,
+            f"{time.time() + seconds:.3f}",
+            max_age=math.ceil(seconds),
+            httponly=True,
+            samesite="lax",
+        )
+
+
+# Sessions
+
+def request_replica(request: Request):
+    """This request's replica engine pair, or None to read the primary."""
+    if not replicas or reads_primary(request):
+        return None
+
+    replica = getattr(request.state, "replica", None)
+    if replica is None:
+        replica = request.state.replica = replicas.pick()
+    return replica
+
+
+def read_session(request: Request) -> Session:
+    """New sync session for reads; the caller closes it."""
+    replica = request_replica(request)
+    if replica is None:
+        return session_local()
+    return session_local(bind=replica[0])
+
+
+def get_read_db(request: Request):
+    db = read_session(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_write_db(request: Request, response: Response):
+    db = session_local()
+    event.listen(db, "after_commit", lambda _: _mark_written(request, response))
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request):
+    replica = request_replica(request)
+    if replica is None:
+        session = async_session_local()
+    else:
+        session = async_session_local(bind=replica[1])
+
+    async with session as db:
+        yield db
+
@@ -0,0 +1,197 @@
+"""
+Full-text catalog search backed by an SQLite FTS5 table.
+
+Brands, models and variants are indexed into one trigram-tokenized table.
+Each row's rowid encodes (entity id, kind), so keeping the index in sync is
+a primary-key delete + insert. Typo tolerance comes from OR-ing the query's
+trigrams and re-scoring candidates by trigram overlap.
+
+The table is created by migration 0001. Searches only query it, so they
+also work on read replicas and read-only connections; without the table
+(an unmigrated database) they fall back to ILIKE lookups, as do other
+databases.
+"""
+
+from sqlalchemy import or_, text
+from sqlalchemy.orm import Session
+
+from autohub.database.model import CarBrand, CarModel, CarVariant
+
+FTS_TABLE = "catalog_fts"
+
+KIND_CODES = {"brand": 1, "model": 2, "variant": 3}
+KIND_NAMES = {code: kind for kind, code in KIND_CODES.items()}
+
+CANDIDATE_LIMIT = 200
+MIN_SIMILARITY = 0.4
+
+
+def _is_sqlite(bind) -> bool:
+    return bind.dialect.name == "sqlite"
+
+
+def _rowid(kind: str, ref_id: int) -> int:
+    return ref_id * 4 + KIND_CODES[kind]
+
+
+def trigrams(value: str) -> set[str]:
+    value = value.lower()
+    return {value[i:i + 3] for i in range(len(value) - 2)}
+
+
+def has_search_index(db: Session) -> bool:
+    return db.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": FTS_TABLE},
+    ).first() is not None
+
+
+def ensure_search_index(db: Session) -> None:
+    """
+    Create the FTS table if missing and fill it from existing rows.
+    Write path only (the primary); runs inside the caller's transaction.
+    """
+    if not _is_sqlite(db.get_bind()) or has_search_index(db):
+        return
+
+    db.execute(text(
+        f"CREATE VIRTUAL TABLE {FTS_TABLE} "
+        "USING fts5(name, context, description, tokenize='trigram')"
+    ))
+    rebuild_search_index(db)
+
+
+def _documents(entity) -> tuple[str, int, dict]:
+    if isinstance(entity, CarBrand):
+        return "brand", entity.id, {"name": entity.name, "context": "", "description": ""}
+
+    if isinstance(entity, CarModel):
+        return "model", entity.id, {
+            "name": entity.name,
+            "context": entity.brand.name,
+            "description": entity.description or "",
+        }
+
+    if isinstance(entity, CarVariant):
+        car_model = entity.model
+        return "variant", entity.id, {
+            "name": entity.variant_name,
+            "context": f"{car_model.brand.name} {car_model.name}",
+            "description": "",
+        }
+
+    raise TypeError(f"Cannot index {type(entity).__name__}")
+
+
+def index_entities(db: Session, *entities) -> None:
+    """
+    Upsert brands / models / variants into the index inside the caller's
+    transaction. Entities must already be flushed so they have ids.
+    """
+    if not _is_sqlite(db.get_bind()):
+        return
+
+    ensure_search_index(db)
+
+    for entity in entities:
+        kind, ref_id, doc = _documents(entity)
+        rowid = _rowid(kind, ref_id)
+
+        db.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :rowid"), {"rowid": rowid})
+        db.execute(
+            text(
+                f"INSERT INTO {FTS_TABLE} (rowid, name, context, description) "
+                "VALUES (:rowid, :name, :context, :description)"
+            ),
+            {"rowid": rowid, **doc},
+        )
+
+
+def rebuild_search_index(db: Session) -> None:
+    db.execute(text(f"DELETE FROM {FTS_TABLE}"))
+
+    for entity_cls in (CarBrand, CarModel, CarVariant):
+        for entity in db.query(entity_cls).yield_per(500):
+            kind, ref_id, doc = _documents(entity)
+            db.execute(
+                text(
+                    f"INSERT INTO {FTS_TABLE} (rowid, name, context, description) "
+                    "VALUES (:rowid, :name, :context, :description)"
+                ),
+                {"rowid": _rowid(kind, ref_id), **doc},
+            )
+
+
+def _similarity(query_grams: set[str], *fields: str) -> float:
+    best = 0.0
+    for field in fields:
+        if field:
+            best = max(best, len(query_grams & trigrams(field)) / len(query_grams))
+    return best
+
+
+def search_catalog(db: Session, q: str, limit: int = 20) -> list[dict]:
+    q = " ".join(q.split())
+    query_grams = trigrams(q)
+
+    # Read path: never create the index here, it may be a replica or read-only
+    if not _is_sqlite(db.get_bind()) or not query_grams or not has_search_index(db):
+        return _like_search(db, q, limit)
+
+    match = " OR ".join('"' + gram.replace('"', '""') + '"' for gram in sorted(query_grams))
+    rows = db.execute(
+        text(
+            f"SELECT rowid, name, context, description FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH :match ORDER BY bm25({FTS_TABLE}) LIMIT :limit"
+        ),
+        {"match": match, "limit": CANDIDATE_LIMIT},
+    ).all()
+
+    hits = []
+    for rowid, name, context, description in rows:
+        score = _similarity(query_grams, name, f"{context} {name}", description)
+        if score < MIN_SIMILARITY:
+            continue
+
+        hits.append({
+            "kind": KIND_NAMES[rowid % 4],
+            "id": rowid // 4,
+            "name": name,
+            "context": context or None,
+            "score": round(score, 3),
+        })
+
+    hits.sort(key=lambda hit: -hit["score"])
+    return hits[:limit]
+
+
+def _like_search(db: Session, q: str, limit: int) -> list[dict]:
+    pattern = f"%{q}%"
+    hits = []
+
+    for brand in db.query(CarBrand).filter(CarBrand.name.ilike(pattern)).limit(limit):
+        hits.append({"kind": "brand", "id": brand.id, "name": brand.name, "context": None, "score": 1.0})
+
+    for car_model in (
+        db.query(CarModel)
+        .filter(or_(CarModel.name.ilike(pattern), CarModel.description.ilike(pattern)))
+        .limit(limit)
+    ):
+        hits.append({
+            "kind": "model",
+            "id": car_model.id,
+            "name": car_model.name,
+            "context": car_model.brand.name,
+            "score": 1.0,
+        })
+
+    for variant in db.query(CarVariant).filter(CarVariant.variant_name.ilike(pattern)).limit(limit):
+        hits.append({
+            "kind": "variant",
+            "id": variant.id,
+            "name": variant.variant_name,
+            "context": f"{variant.model.brand.name} {variant.model.name}",
+            "score": 1.0,
+        })
+
+    return hits[:limit]
@@ -0,0 +1,73 @@
+import tempfile
+from pathlib import Path
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, inspect, text
+
+from autohub.database.connection import Base
+from autohub.database.migrations import include_object
+
+ALEMBIC_INI = Path(__file__).resolve().parents[3] / "alembic.ini"
+
+# Schema as create_all left it before migrations existed
+LEGACY_SCHEMA = [
+    "CREATE TABLE car_brands (id INTEGER NOT NULL PRIMARY KEY, name VARCHAR(100) NOT NULL, UNIQUE (name))",
+    "CREATE TABLE car_models (id INTEGER NOT NULL PRIMARY KEY, name VARCHAR(100) NOT NULL, "
+    "brand_id INTEGER NOT NULL REFERENCES car_brands(id), body_type VARCHAR(50), launch_date VARCHAR(20), "
+    "description VARCHAR(500), CONSTRAINT uq_model_brand UNIQUE (name, brand_id))",
+    "CREATE TABLE car_variants (id INTEGER NOT NULL PRIMARY KEY, model_id INTEGER NOT NULL REFERENCES car_models(id), "
+    "variant_name VARCHAR(120) NOT NULL, fuel_type VARCHAR(50), transmission VARCHAR(120), price FLOAT, "
+    "fuel_type_id INTEGER, transmission_id INTEGER, CONSTRAINT uq_model_variant UNIQUE (model_id, variant_name))",
+    "CREATE TABLE car_specs (id INTEGER NOT NULL PRIMARY KEY, variant_id INTEGER NOT NULL REFERENCES car_variants(id), "
+    "engine VARCHAR(100), engine_capacity FLOAT, power VARCHAR(50), torque VARCHAR(50), mileage FLOAT, UNIQUE (variant_id))",
+    "CREATE TABLE car_images (id INTEGER NOT NULL PRIMARY KEY, image_url VARCHAR(300) NOT NULL, "
+    "model_id INTEGER NOT NULL REFERENCES car_models(id))",
+    "INSERT INTO car_brands VALUES (1, 'Mahindra')",
+    "INSERT INTO car_models VALUES (1, 'Thar Roxx', 1, 'SUV', NULL, NULL)",
+    "INSERT INTO car_variants VALUES (1, 1, 'MX5', 'Diesel', NULL, 1890000, NULL, NULL)",
+    "INSERT INTO car_images VALUES (1, 'https://img/a.jpg', 1), (2, 'https://img/a.jpg', 1), (3, 'https://img/b.jpg', 1)",
+]
+
+
+def upgrade(db_path: Path) -> None:
+    engine = create_engine(f"sqlite:///{db_path}")
+
+    with engine.begin() as connection:
+        config = Config(str(ALEMBIC_INI))
+        config.attributes["connection"] = connection
+        config.attributes["configure_logger"] = False
+        command.upgrade(config, "head")
+
+    with engine.connect() as connection:
+        context = MigrationContext.configure(connection, opts={"include_object": include_object})
+        assert compare_metadata(context, Base.metadata) == []
+
+    engine.dispose()
+
+
+def test_upgrade_empty_database_matches_models():
+    upgrade(Path(tempfile.mkdtemp()) / "empty.db")
+
+
+def test_upgrade_legacy_database_in_place():
+    db_path = Path(tempfile.mkdtemp()) / "legacy.db"
+    engine = create_engine(f"sqlite:///{db_path}")
+    with engine.begin() as connection:
+        for statement in LEGACY_SCHEMA:
+            connection.execute(text(statement))
+
+    upgrade(db_path)
+
+    with engine.connect() as connection:
+        urls = connection.execute(text("SELECT id, image_url FROM car_images ORDER BY id")).all()
+        assert urls == [(1, "https://img/a.jpg"), (3, "https://img/b.jpg")]
+
+        hits = connection.execute(text("SELECT rowid FROM catalog_fts WHERE catalog_fts MATCH 'Thar'")).all()
+        assert [rowid for rowid, in hits] == [1 * 4 + 2, 1 * 4 + 3]
+
+    indexes = {index["name"] for index in inspect(engine).get_indexes("car_images")}
+    assert "uq_car_images_model_id_image_url" in indexes
+    engine.dispose()
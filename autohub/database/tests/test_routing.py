@@ -0,0 +1,89 @@
+import tempfile
+from pathlib import Path
+
+from fastapi import Depends, FastAPI, Request
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from autohub.database import routing
+from autohub.database.connection import Base
+from autohub.database.model import CarBrand
+from autohub.database.routing import ReplicaPool, get_read_db, get_write_db
+
+app = FastAPI()
+
+
+@app.get("/brands/count")
+def count_brands(db: Session = Depends(get_read_db)):
+    return db.scalar(select(func.count()).select_from(CarBrand))
+
+
+@app.post("/brands")
+def add_brand(db: Session = Depends(get_write_db)):
+    db.add(CarBrand(name="Tata"))
+    db.commit()
+    return db.scalar(select(func.count()).select_from(CarBrand))
+
+
+@app.get("/brands/replicas")
+def replicas_used(request: Request, first: Session = Depends(get_read_db)):
+    second = routing.read_session(request)
+    try:
+        return [first.get_bind().url.database == second.get_bind().url.database]
+    finally:
+        second.close()
+
+
+def make_engine(name: str):
+    engine = create_engine(f"sqlite:///{Path(tempfile.mkdtemp()) / name}")
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def test_reads_use_replica_until_client_writes(monkeypatch):
+    primary = make_engine("primary.db")
+    # Never receives the write, like a replica that has not caught up yet
+    replica = make_engine("replica.db")
+
+    monkeypatch.setattr(routing, "session_local", sessionmaker(bind=primary, autoflush=False))
+    monkeypatch.setattr(routing, "replicas", ReplicaPool([(replica, None)]))
+
+    writer = TestClient(app)
+    other = TestClient(app)
+
+    assert writer.post("/brands").json() == 1
+    assert routing.STICKY_COOKIE in writer.cookies
+
+    # The writing client reads its own write; everyone else reads the replica
+    assert writer.get("/brands/count").json() == 1
+    assert other.get("/brands/count").json() == 0
+
+    primary.dispose()
+    replica.dispose()
+
+
+def test_one_replica_per_request(monkeypatch):
+    first, second = make_engine("first.db"), make_engine("second.db")
+    monkeypatch.setattr(routing, "replicas", ReplicaPool([(first, None), (second, None)]))
+
+    client = TestClient(app)
+    # Round-robin would alternate between the two sessions of one request
+    assert [client.get("/brands/replicas").json() for _ in range(2)] == [[True], [True]]
+
+    first.dispose()
+    second.dispose()
+
+
+def test_replica_strategies():
+    first, second = make_engine("first.db"), make_engine("second.db")
+
+    round_robin = ReplicaPool([(first, None), (second, None)])
+    assert [round_robin.pick() for _ in range(3)] == [(first, None), (second, None), (first, None)]
+
+    least_loaded = ReplicaPool([(first, None), (second, None)], strategy="least_loaded")
+    with first.connect():
+        assert least_loaded.pick() == (second, None)
+
+    first.dispose()
+    second.dispose()
@@ -0,0 +1,70 @@
+"""
+Per-entity data versions.
+
+Every write path calls bump_versions() inside its own transaction, so a
+version only becomes visible together with the rows it describes. Readers
+use the versions as HTTP validators and as cache keys, which also works
+when the writer is another process (e.g. the monthly pipeline).
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from autohub.database.model import DataVersion
+
+BRANDS = "brands"
+MODELS = "models"
+VARIANTS = "variants"
+SPECS = "specs"
+IMAGES = "images"
+NEWS = "news"
+
+CATALOG_ENTITIES = (BRANDS, MODELS, VARIANTS, SPECS, IMAGES)
+
+
+def _utcnow() -> datetime:
+    # Stored naive; SQLite has no timezone support
+    return datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+
+def bump_versions(db: Session, *entities: str) -> None:
+    """Increment the version of each entity type in the caller's transaction."""
+    entities = tuple(dict.fromkeys(entities))
+    if not entities:
+        return
+
+    now = _utcnow()
+    result = db.execute(
+        update(DataVersion)
+        .where(DataVersion.entity.in_(entities))
+        .values(version=DataVersion.version + 1, updated_at=now)
+        .execution_options(synchronize_session=False)
+    )
+
+    if result.rowcount < len(entities):
+        known = set(db.scalars(select(DataVersion.entity).where(DataVersion.entity.in_(entities))))
+        db.add_all(
+            DataVersion(entity=entity, version=1, updated_at=now)
+            for entity in entities
+            if entity not in known
+        )
+        db.flush()
+
+
+def _versions_stmt(entities: tuple[str, ...]):
+    return (
+        select(DataVersion.entity, DataVersion.version, DataVersion.updated_at)
+        .where(DataVersion.entity.in_(entities))
+        .order_by(DataVersion.entity)
+    )
+
+
+def get_versions(db: Session, entities: tuple[str, ...]) -> list[tuple[str, int, datetime]]:
+    return [tuple(row) for row in db.execute(_versions_stmt(entities))]
+
+
+async def get_versions_async(db: AsyncSession, entities: tuple[str, ...]) -> list[tuple[str, int, datetime]]:
+    return [tuple(row) for row in await db.execute(_versions_stmt(entities))]
@@ -1,11 +1,11 @@
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
-from autohub.api import catalog, login, news
+from autohub.api import catalog, login, metrics, news, search
+from autohub.api.metrics import MetricsMiddleware
 from autohub.api.users import router as users_router
 from autohub.api.routes import router
-from autohub.database.model import Base
-from autohub.database.connection import engine
 from autohub.automation.scheduler import start_scheduler, stop_scheduler
+from autohub.database.instrumentation import install_sql_instrumentation
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -17,7 +17,8 @@ async def lifespan(app: FastAPI):
 
 app = FastAPI(title="AutoHub API", lifespan=lifespan)
 
-Base.metadata.create_all(bind=engine)
+install_sql_instrumentation()
+app.add_middleware(MetricsMiddleware)
 
 @app.get("/")
 def home():
@@ -27,4 +28,6 @@ app.include_router(login.router)
 app.include_router(router)
 app.include_router(users_router)
 app.include_router(catalog.router)
-app.include_router(news.router)
\ No newline at end of file
+app.include_router(search.router)
+app.include_router(news.router)
+app.include_router(metrics.router)
\ No newline at end of file
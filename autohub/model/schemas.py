@@ -1,5 +1,7 @@
-from pydantic import BaseModel, Field
-from typing import Optional, List, Literal
+from pydantic import BaseModel, Field, field_validator
+from typing import Generic, Optional, List, Literal, TypeVar
+
+T = TypeVar("T")
 
 class User(BaseModel):
     id: int
@@ -80,6 +82,7 @@ class VariantCreate(VariantBase):
 
 class VariantRead(VariantBase):
     id: int
+    price_inr: Optional[float] = None
 
     model_config = {"from_attributes": True}
 
@@ -99,6 +102,11 @@ class SpecCreate(SpecBase):
 
 class SpecRead(SpecBase):
     id: int
+    power_kw: Optional[float] = None
+    power_rpm: Optional[int] = None
+    torque_nm: Optional[float] = None
+    torque_rpm_min: Optional[int] = None
+    torque_rpm_max: Optional[int] = None
 
     model_config = {"from_attributes": True}
 
@@ -117,6 +125,11 @@ class ImageRead(ImageBase):
 
     model_config = {"from_attributes": True}
 
+# Paginated Response
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[int] = None
+
 # Foe Nested Response
 class SpecNested(BaseModel):
     engine: Optional[str]
@@ -124,6 +137,11 @@ class SpecNested(BaseModel):
     power: Optional[str]
     torque: Optional[str]
     mileage: Optional[float]
+    power_kw: Optional[float] = None
+    power_rpm: Optional[int] = None
+    torque_nm: Optional[float] = None
+    torque_rpm_min: Optional[int] = None
+    torque_rpm_max: Optional[int] = None
 
     model_config = {"from_attributes": True}
 
@@ -134,6 +152,7 @@ class VariantNested(BaseModel):
     fuel_type: Optional[str]
     transmission: Optional[str]
     price: Optional[float]
+    price_inr: Optional[float] = None
     specs: Optional[SpecNested]
 
     model_config = {"from_attributes": True}
@@ -151,6 +170,10 @@ class ModelNested(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class ModelExport(ModelNested):
+    brand: BrandRead
+
+
 class BrandNested(BaseModel):
     id: int
     name: str
@@ -158,6 +181,140 @@ class BrandNested(BaseModel):
 
     model_config = {"from_attributes": True}
 
+# Bulk Ingestion Schemas
+class BulkSpec(BaseModel):
+    engine: Optional[str] = None
+    engine_capacity: Optional[float] = Field(None, ge=0)
+    power: Optional[str] = None
+    torque: Optional[str] = None
+    mileage: Optional[float] = Field(None, ge=0)
+
+
+class BulkVariant(BaseModel):
+    variant_name: str = Field(..., max_length=120)
+    fuel_type: Optional[str] = None
+    transmission: Optional[str] = None
+    price: Optional[float] = Field(None, ge=0)
+    specs: Optional[BulkSpec] = None
+
+
+class BulkImage(BaseModel):
+    image_url: str = Field(..., max_length=300)
+    image_type: Optional[Literal["exterior", "interior"]] = None
+
+
+class BulkModel(BaseModel):
+    name: str = Field(..., max_length=100)
+    body_type: Optional[str] = None
+    launch_date: Optional[str] = None
+    description: Optional[str] = Field(None, max_length=500)
+    variants: List[BulkVariant] = []
+    images: List[BulkImage] = []
+
+
+class BulkBrand(BaseModel):
+    name: str = Field(..., max_length=100)
+    models: List[BulkModel] = []
+
+
+class BulkCatalog(BaseModel):
+    brands: List[BulkBrand]
+
+    @field_validator("brands")
+    @classmethod
+    def unique_brand_names(cls, brands: List[BulkBrand]) -> List[BulkBrand]:
+        # A repeated brand would silently replace the earlier one's models
+        seen = set()
+        for brand in brands:
+            if brand.name in seen:
+                raise ValueError(f"Duplicate brand in payload: {brand.name}")
+            seen.add(brand.name)
+        return brands
+
+
+class BulkItemResult(BaseModel):
+    kind: Literal["brand", "model", "variant", "spec", "image"]
+    key: str
+    status: Literal["created", "updated", "skipped"]
+
+
+class BulkResult(BaseModel):
+    created: int
+    updated: int
+    skipped: int
+    items: List[BulkItemResult]
+
+# Comparison Schemas
+class CompareVariant(BaseModel):
+    id: int
+    variant_name: str
+    model_name: str
+    brand_name: str
+    fuel_type: Optional[str]
+    transmission: Optional[str]
+
+
+class CompareRow(BaseModel):
+    field: str
+    unit: Optional[str] = None
+    values: List[Optional[float | str]]
+    # Difference from the first variant, numeric rows only
+    deltas: Optional[List[Optional[float]]] = None
+
+
+class CompareResponse(BaseModel):
+    variants: List[CompareVariant]
+    rows: List[CompareRow]
+
+# Search Schemas
+class SearchVariant(BaseModel):
+    id: int
+    model_id: int
+    variant_name: str
+    fuel_type: Optional[str]
+    transmission: Optional[str]
+    price: Optional[float]
+    price_inr: Optional[float]
+    engine_capacity: Optional[float]
+    mileage: Optional[float]
+    power_kw: Optional[float]
+    torque_nm: Optional[float]
+
+
+class FacetCount(BaseModel):
+    value: Optional[str]
+    count: int
+
+
+class RangeFacet(BaseModel):
+    min: Optional[float]
+    max: Optional[float]
+    count: int
+
+
+class SearchFacets(BaseModel):
+    fuel_type: List[FacetCount]
+    transmission: List[FacetCount]
+    price: RangeFacet
+    engine_capacity: RangeFacet
+    mileage: RangeFacet
+    power_kw: RangeFacet
+    torque_nm: RangeFacet
+
+
+class SearchResponse(BaseModel):
+    total: int
+    items: List[SearchVariant]
+    facets: SearchFacets
+
+
+class TextSearchHit(BaseModel):
+    kind: Literal["brand", "model", "variant"]
+    id: int
+    name: str
+    context: Optional[str]
+    score: float
+
 # News Schemas
 class NewsImage(BaseModel):
     image_url: str
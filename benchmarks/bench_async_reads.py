@@ -0,0 +1,183 @@
+"""
+Concurrency benchmark: sync (threadpool) vs async catalog read routes.
+
+Both apps serve GET /catalog/variants from the same SQLite file. Every SQL
+statement sleeps `--latency-ms` inside the thread that runs it, standing in
+for a network database round trip: the sync route holds a threadpool slot
+for that time, the async route only holds a connection.
+
+    python -m benchmarks.bench_async_reads --requests 2000 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import aiosqlite
+import httpx
+from fastapi import Depends, FastAPI, Query
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from autohub.api import catalog
+from autohub.database import model
+from autohub.database.connection import Base, get_async_db
+from autohub.model.schemas import Page, VariantRead
+
+
+def seed(db_path: Path, variants: int) -> None:
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine)
+
+    with Session(engine) as db:
+        brand = model.CarBrand(name="Mahindra")
+        db.add(brand)
+        db.flush()
+
+        car_model = model.CarModel(name="Thar Roxx", brand_id=brand.id)
+        db.add(car_model)
+        db.flush()
+
+        db.add_all(
+            model.CarVariant(model_id=car_model.id, variant_name=f"V{i}", fuel_type="Diesel", price=1000000 + i)
+            for i in range(variants)
+        )
+        db.commit()
+
+    engine.dispose()
+
+
+def build_sync_app(db_path: Path, latency: float, pool_size: int) -> FastAPI:
+    def connect():
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+        conn.set_trace_callback(lambda _: time.sleep(latency))
+        return conn
+
+    engine = create_engine(
+        "sqlite://", creator=connect, poolclass=QueuePool, pool_size=pool_size, max_overflow=0
+    )
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+
+    def get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.state.engine = engine
+
+    # Pre-async implementation of the same route
+    @app.get("/catalog/variants", response_model=Page[VariantRead])
+    def get_variants(
+        cursor: int | None = None,
+        limit: int = Query(catalog.DEFAULT_PAGE_SIZE, ge=1, le=catalog.MAX_PAGE_SIZE),
+        db: Session = Depends(get_db),
+    ):
+        query = db.query(model.CarVariant)
+        if cursor is not None:
+            query = query.filter(model.CarVariant.id > cursor)
+
+        rows = query.order_by(model.CarVariant.id).limit(limit + 1).all()
+        next_cursor = rows[limit - 1].id if len(rows) > limit else None
+        return {"items": rows[:limit], "next_cursor": next_cursor}
+
+    return app
+
+
+def build_async_app(db_path: Path, latency: float, pool_size: int) -> FastAPI:
+    async def connect():
+        conn = await aiosqlite.connect(db_path)
+        await conn.set_trace_callback(lambda _: time.sleep(latency))
+        return conn
+
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        async_creator=connect,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=pool_size,
+        max_overflow=0,
+    )
+    session_factory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.state.engine = engine
+    app.include_router(catalog.router)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    return app
+
+
+async def run_load(app: FastAPI, requests: int, concurrency: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def one(i: int) -> None:
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get("/catalog/variants", params={"cursor": i % 1000, "limit": 50})
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        await one(0)  # warm up pools
+        latencies.clear()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    engine = app.state.engine
+    if isinstance(engine, AsyncEngine):
+        await engine.dispose()
+    else:
+        engine.dispose()
+
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--pool-size", type=int, default=100)
+    parser.add_argument("--variants", type=int, default=5000)
+    args = parser.parse_args()
+
+    db_path = Path(tempfile.mkdtemp()) / "bench_async.db"
+    seed(db_path, args.variants)
+    latency = args.latency_ms / 1000
+
+    print(
+        f"requests={args.requests} concurrency={args.concurrency} "
+        f"latency={args.latency_ms}ms pool_size={args.pool_size}"
+    )
+
+    for label, build in (("sync  (before)", build_sync_app), ("async (after) ", build_async_app)):
+        result = asyncio.run(run_load(build(db_path, latency, args.pool_size), args.requests, args.concurrency))
+        print(
+            f"{label}: {result['rps']:8.1f} req/s   "
+            f"p50 {result['p50_ms']:7.1f} ms   p99 {result['p99_ms']:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
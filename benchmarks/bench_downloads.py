@@ -0,0 +1,130 @@
+"""
+Brochure download throughput against a local HTTP stand-in.
+
+A ThreadingHTTPServer on 127.0.0.1 serves synthetic PDFs. Each response
+waits --latency seconds first, standing in for a CDN round trip. URLs
+alternate between "127.0.0.1" and "localhost", so the per-host limit
+applies to two hosts. Three modes each download every brochure into a
+fresh directory:
+
+  baseline   one at a time, a new connection per request (module-level requests.get)
+  pooled     one at a time over a keep-alive session
+  parallel   iter_downloads with --workers threads, DOWNLOAD_PER_HOST per host
+
+    python -m benchmarks.bench_downloads --brochures 100 --size-kb 512 --latency 0.05
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+from autohub.automation import state
+from autohub.automation.brochures import checksum
+from autohub.automation.brochures.downloader import brochure_downloader
+
+
+def start_server(size_kb: int, latency: float) -> tuple[ThreadingHTTPServer, dict]:
+    body = b"%PDF-1.7\n" + bytes(size_kb * 1024 - 9)
+    stats = {"connections": 0, "requests": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def setup(self):
+            super().setup()
+            with lock:
+                stats["connections"] += 1
+
+        def do_GET(self):
+            with lock:
+                stats["requests"] += 1
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/pdf")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, stats
+
+
+def items(port: int, count: int) -> list[dict]:
+    return [
+        {
+            "brand": "Bench",
+            "model": f"Model {i}",
+            "year": 2026,
+            "brochure_url": f"http://{'127.0.0.1' if i % 2 else 'localhost'}:{port}/brochures/{i}.pdf",
+        }
+        for i in range(count)
+    ]
+
+
+def run(mode: str, brochures: list[dict], workers: int) -> tuple[float, int]:
+    workdir = Path(tempfile.mkdtemp())
+    state.STATE_FILE = workdir / "pipeline_state.db"
+    checksum.CHECKSUM_FILE = workdir / "checksums.json"
+    brochure_downloader.PDF_BASE_DIR = workdir / "pdfs"
+    brochure_downloader._local = threading.local()
+
+    original_get_session = brochure_downloader.get_session
+    if mode == "baseline":
+        # requests.get / requests.head open a fresh connection every call
+        brochure_downloader.get_session = lambda: requests
+
+    start = time.perf_counter()
+    try:
+        if mode == "parallel":
+            records = [record for _, record in brochure_downloader.iter_downloads(brochures, workers)]
+        else:
+            records = [brochure_downloader.download_item(item) for item in brochures]
+    finally:
+        brochure_downloader.get_session = original_get_session
+    elapsed = time.perf_counter() - start
+
+    failed = sum(record["status"] != "success" for record in records)
+    return elapsed, failed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--brochures", type=int, default=100)
+    parser.add_argument("--size-kb", type=int, default=512)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, default=brochure_downloader.DOWNLOAD_WORKERS)
+    args = parser.parse_args()
+
+    server, stats = start_server(args.size_kb, args.latency)
+    brochures = items(server.server_address[1], args.brochures)
+
+    print(
+        f"brochures={args.brochures} size={args.size_kb} KiB latency={args.latency * 1000:.0f} ms "
+        f"workers={args.workers} per_host={brochure_downloader.DOWNLOAD_PER_HOST}"
+    )
+
+    for mode in ("baseline", "pooled", "parallel"):
+        stats["connections"] = stats["requests"] = 0
+        elapsed, failed = run(mode, brochures, args.workers)
+        megabytes = args.brochures * args.size_kb / 1024
+        print(
+            f"{mode:9}: {elapsed:6.2f} s   {args.brochures / elapsed:7.1f} brochures/s   "
+            f"{megabytes / elapsed:7.1f} MiB/s   connections {stats['connections']:4d}   failed {failed}"
+        )
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Cost of deciding that downloaded brochures are unchanged.
+
+Writes --brochures synthetic PDFs of --size-kb each to a temp directory.
+Then it times three ways of getting every file's SHA-256:
+
+  read_bytes   whole file into memory, then hashed (the old plan_jobs)
+  streamed     hash_file, read in chunks with no fingerprint cache
+  cached       file_checksum with a warm (size, mtime_ns, inode) cache
+
+The page cache is warm for every mode, so this is a lower bound for the
+first two; on a cold disk the gap widens.
+
+    python -m benchmarks.bench_fingerprints --brochures 300 --size-kb 8192
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from autohub.automation import state
+from autohub.automation.brochures import checksum
+
+
+def make_pdfs(workdir: Path, count: int, size_kb: int) -> list[Path]:
+    paths = []
+    for i in range(count):
+        path = workdir / f"{i}.pdf"
+        path.write_bytes(b"%PDF-1.7\n" + os.urandom(size_kb * 1024 - 9))
+        paths.append(path)
+    return paths
+
+
+def timed(hash_all) -> tuple[float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    hash_all()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--brochures", type=int, default=300)
+    parser.add_argument("--size-kb", type=int, default=8192)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        state.STATE_FILE = workdir / "pipeline_state.db"
+        pdfs = make_pdfs(workdir, args.brochures, args.size_kb)
+
+        def cached():
+            # What plan_jobs does: one query for the cache, then a stat() per file
+            fingerprints = checksum.load_fingerprints()
+            return [checksum.file_checksum(pdf, fingerprints) for pdf in pdfs]
+
+        # Warm the fingerprint cache, as a previous run would have
+        cached()
+
+        modes = {
+            "read_bytes": lambda: [checksum.calculate_checksum(pdf.read_bytes()) for pdf in pdfs],
+            "streamed": lambda: [checksum.hash_file(pdf) for pdf in pdfs],
+            "cached": cached,
+        }
+
+        print(f"brochures={args.brochures} size={args.size_kb} KiB")
+        for mode, hash_all in modes.items():
+            elapsed, peak_mib = timed(hash_all)
+            print(f"{mode:10}: {elapsed * 1000:9.1f} ms   {elapsed / args.brochures * 1e6:9.1f} µs/brochure   "
+                  f"peak {peak_mib:7.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
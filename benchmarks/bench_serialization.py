@@ -0,0 +1,106 @@
+"""
+Micro-benchmark: default vs fast serialization of large read responses.
+
+default: ORM instances -> response_model validation -> jsonable_encoder -> json.dumps
+fast:    column mappings / prebuilt TypeAdapter -> orjson / pydantic-core bytes
+
+    python -m benchmarks.bench_serialization --variants 20000
+"""
+
+import argparse
+import json
+import timeit
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from autohub.api.catalog import MAX_PAGE_SIZE, build_catalog_json, load_catalog
+from autohub.api.serialization import FastJSONResponse, schema_columns
+from autohub.database import model
+from autohub.database.connection import Base
+from autohub.model.schemas import BrandNested, Page, VariantRead
+
+
+def seed(db: Session, variants: int, per_model: int = 20) -> None:
+    brand = model.CarBrand(name="Mahindra")
+    db.add(brand)
+    db.flush()
+
+    for m in range(max(1, variants // per_model)):
+        car_model = model.CarModel(name=f"Model {m}", brand_id=brand.id, body_type="SUV")
+        db.add(car_model)
+        db.flush()
+
+        for v in range(per_model):
+            variant = model.CarVariant(
+                model_id=car_model.id,
+                variant_name=f"V{v}",
+                fuel_type="Diesel",
+                transmission="6-Speed Automatic",
+                price=1500000 + v,
+            )
+            variant.specs = model.CarSpec(engine="mHawk", engine_capacity=2.2, power="128.6 kW", mileage=15)
+            db.add(variant)
+
+        for i in range(5):
+            db.add(model.CarImage(model_id=car_model.id, image_url=f"https://img/{m}/{i}.jpg", image_type="exterior"))
+
+    db.commit()
+
+
+def variants_default(db: Session) -> bytes:
+    rows = db.scalars(select(model.CarVariant).order_by(model.CarVariant.id).limit(MAX_PAGE_SIZE)).all()
+    page = Page[VariantRead].model_validate({"items": rows, "next_cursor": None})
+    return json.dumps(jsonable_encoder(page)).encode()
+
+
+def variants_fast(db: Session) -> bytes:
+    stmt = (
+        select(*schema_columns(model.CarVariant, VariantRead))
+        .order_by(model.CarVariant.id)
+        .limit(MAX_PAGE_SIZE)
+    )
+    rows = [dict(row) for row in db.execute(stmt).mappings()]
+    return FastJSONResponse({"items": rows, "next_cursor": None}).body
+
+
+def catalog_default(db: Session) -> bytes:
+    brands = load_catalog(db)
+    return json.dumps(jsonable_encoder([BrandNested.model_validate(b) for b in brands])).encode()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--variants", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+
+    with Session(engine) as db:
+        seed(db, args.variants)
+
+    cases = [
+        (f"variants page ({MAX_PAGE_SIZE} rows)", variants_default, variants_fast),
+        (f"nested catalog ({args.variants} variants)", catalog_default, build_catalog_json),
+    ]
+
+    for label, default, fast in cases:
+        timings = {}
+        for name, fn in (("default", default), ("fast", fast)):
+            def run():
+                with Session(engine) as db:
+                    fn(db)
+
+            timings[name] = min(timeit.repeat(run, number=1, repeat=args.repeat)) * 1000
+
+        print(
+            f"{label:40s} default {timings['default']:8.1f} ms   "
+            f"fast {timings['fast']:8.1f} ms   x{timings['default'] / timings['fast']:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
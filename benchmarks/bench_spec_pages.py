@@ -0,0 +1,77 @@
+"""
+Upload size of a full brochure vs its spec-page subset.
+
+Builds a synthetic brochure: --pages full-bleed photo pages (random-noise
+images, which do not compress, like real photography), followed by two
+spec-table pages and a disclaimer page. It then times spec_subset() and
+compares what would be uploaded. Gemini bills each PDF page as a fixed
+number of input tokens (TOKENS_PER_PAGE), so tokens scale with pages.
+
+    python -m benchmarks.bench_spec_pages --pages 32 --image-px 900
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import pymupdf
+
+from autohub.automation.brochures.spec_pages import spec_subset
+
+TOKENS_PER_PAGE = 258
+
+SPECS = """Technical Specifications
+Engine: 2.2 L mHawk Diesel, Displacement 2184 cc
+Power 128.6 kW @ 3500 rpm   Torque 450 Nm @ 1750-2800 rpm
+Transmission: 6MT / 6AT   Fuel: Diesel   Mileage 16.5 kmpl
+Wheelbase 2750 mm   Kerb weight 1850 kg
+Variants: AX3, AX5, AX7, AX7 L   Ex-showroom from 18.9 Lakh"""
+
+
+def make_brochure(path: Path, photo_pages: int, image_px: int) -> None:
+    doc = pymupdf.open()
+    for i in range(photo_pages):
+        page = doc.new_page()
+        width, height = image_px, image_px * 2 // 3
+        photo = pymupdf.Pixmap(pymupdf.csRGB, width, height, os.urandom(width * height * 3), False)
+        page.insert_image(page.rect, pixmap=photo)
+        page.insert_text((72, 72), f"Chapter {i + 1}: Command every road.")
+    for _ in range(2):
+        doc.new_page().insert_text((72, 72), SPECS)
+    doc.new_page().insert_text((72, 72), "Images are for illustration only. Accessories not part of standard fitment.")
+    doc.save(path, deflate=True)
+    doc.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=32)
+    parser.add_argument("--image-px", type=int, default=900)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        brochure = Path(tmp) / "brochure.pdf"
+        make_brochure(brochure, args.pages, args.image_px)
+
+        with pymupdf.open(brochure) as doc:
+            full_pages = doc.page_count
+        full_bytes = brochure.stat().st_size
+
+        start = time.perf_counter()
+        with spec_subset(str(brochure)) as upload_path:
+            elapsed = time.perf_counter() - start
+            with pymupdf.open(upload_path) as subset:
+                subset_pages = subset.page_count
+            subset_bytes = os.path.getsize(upload_path)
+
+    print(f"brochure: {full_pages} pages")
+    print(f"full     : {full_bytes / 1024:9.0f} KB   {full_pages:3d} pages   ~{full_pages * TOKENS_PER_PAGE:6d} input tokens")
+    print(f"subset   : {subset_bytes / 1024:9.0f} KB   {subset_pages:3d} pages   ~{subset_pages * TOKENS_PER_PAGE:6d} input tokens")
+    print(f"reduction: {full_bytes / subset_bytes:8.0f}x bytes, {full_pages / subset_pages:.0f}x pages; "
+          f"subset built in {elapsed * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
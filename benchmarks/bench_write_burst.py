@@ -0,0 +1,162 @@
+"""
+Read throughput while the pipeline writes: default SQLite settings vs the
+tuned pragmas from autohub.database.connection (WAL, synchronous=NORMAL,
+mmap, cache, busy_timeout).
+
+Reader threads page through car_variants while one writer thread runs
+write_car_payload in a loop, committing once per variant as the monthly
+pipeline does. Each mode gets a fresh database file.
+
+    python -m benchmarks.bench_write_burst --readers 8 --seconds 5
+"""
+
+import argparse
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, sessionmaker
+
+from autohub.automation.db_writer.car_writer import write_car_payload
+from autohub.database import model
+from autohub.database.connection import Base, apply_sqlite_pragmas
+from autohub.database.search_index import ensure_search_index
+
+
+def seed(db_path: Path, variants: int) -> None:
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine)
+
+    with Session(engine) as db:
+        brand = model.CarBrand(name="Mahindra")
+        db.add(brand)
+        db.flush()
+
+        car_model = model.CarModel(name="Thar Roxx", brand_id=brand.id)
+        db.add(car_model)
+        db.flush()
+
+        db.add_all(
+            model.CarVariant(model_id=car_model.id, variant_name=f"V{i}", fuel_type="Diesel", price=1000000 + i)
+            for i in range(variants)
+        )
+        db.commit()
+
+        # Build the FTS index up front so the burst measures steady-state writes
+        ensure_search_index(db)
+        db.commit()
+
+    engine.dispose()
+
+
+def payload(i: int) -> dict:
+    return {
+        "brand": "Mahindra",
+        "model": {"name": "XUV 3XO", "body_type": "SUV", "launch_date": None, "description": None},
+        "variant": {"name": f"Burst {i}", "fuel_type": "Petrol", "transmission": "Manual", "price": 900000 + i},
+        "spec": {"engine": "1.2L", "engine_capacity": 1.2, "power": "82 kW", "torque": "200 Nm", "mileage": 18.0},
+    }
+
+
+def run(db_path: Path, tuned: bool, readers: int, seconds: float) -> dict:
+    engine = create_engine(
+        f"sqlite:///{db_path}",
+        connect_args={"check_same_thread": False},
+        pool_size=readers + 1,
+        max_overflow=0,
+    )
+    if tuned:
+        apply_sqlite_pragmas(engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+
+    stop = threading.Event()
+    latencies: list[float] = []
+    errors = 0
+    writes = 0
+    lock = threading.Lock()
+
+    def reader(offset: int) -> None:
+        nonlocal errors
+        local: list[float] = []
+        cursor = offset
+
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                with session_factory() as db:
+                    rows = db.scalars(
+                        select(model.CarVariant)
+                        .where(model.CarVariant.id > cursor)
+                        .order_by(model.CarVariant.id)
+                        .limit(50)
+                    ).all()
+            except OperationalError:
+                with lock:
+                    errors += 1
+                continue
+
+            local.append(time.perf_counter() - start)
+            cursor = rows[-1].id if rows else 0
+
+        with lock:
+            latencies.extend(local)
+
+    def writer() -> None:
+        nonlocal writes
+        i = 0
+        while not stop.is_set():
+            with session_factory() as db:
+                write_car_payload(payload(i), db)
+            i += 1
+        writes = i
+
+    threads = [threading.Thread(target=reader, args=(i * 97,)) for i in range(readers)]
+    threads.append(threading.Thread(target=writer))
+
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    engine.dispose()
+
+    latencies.sort()
+    return {
+        "reads_per_s": len(latencies) / seconds,
+        "writes_per_s": writes / seconds,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p99_ms": latencies[max(int(len(latencies) * 0.99) - 1, 0)] * 1000 if latencies else 0.0,
+        "errors": errors,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--variants", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"readers={args.readers} seconds={args.seconds} variants={args.variants}")
+
+    for label, tuned in (("default", False), ("tuned  ", True)):
+        db_path = Path(tempfile.mkdtemp()) / "bench_write_burst.db"
+        seed(db_path, args.variants)
+
+        result = run(db_path, tuned, args.readers, args.seconds)
+        print(
+            f"{label}: {result['reads_per_s']:8.1f} reads/s   "
+            f"{result['writes_per_s']:6.1f} writes/s   "
+            f"p50 {result['p50_ms']:6.2f} ms   p99 {result['p99_ms']:7.2f} ms   "
+            f"errors {result['errors']}"
+        )
+
+
+if __name__ == "__main__":
+    main()